@@ -0,0 +1,105 @@
+"""
+Calendar alignment for mixed-frequency series (crypto 7d, US/HK sessions, FRED daily/monthly).
+Dates are integer epoch days (days since 1970-01-01) from the providers onward; as-of joins
+(last observation carried forward) and "value N days ago" lookups are searchsorted calls.
+Strings only appear at serialization (day_str).
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from typing import Any, Iterable
+
+import numpy as np
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+MS_PER_DAY = 86_400_000
+
+
+def parse_day(s: str) -> int:
+    """"YYYY-MM-DD" (extra time suffix ignored) -> epoch day."""
+    return date.fromisoformat(s[:10]).toordinal() - EPOCH_ORDINAL
+
+
+def day_str(day: int | None) -> str | None:
+    """Epoch day -> "YYYY-MM-DD"; only used when serializing."""
+    if day is None:
+        return None
+    return date.fromordinal(int(day) + EPOCH_ORDINAL).isoformat()
+
+
+def day_from_ms(ts_ms: int | float) -> int:
+    """Unix milliseconds (exchange kline open time) -> UTC epoch day."""
+    return int(ts_ms) // MS_PER_DAY
+
+
+def index_days(index: Any) -> np.ndarray:
+    """pandas DatetimeIndex (tz-aware or naive) -> epoch days of the local calendar date."""
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_localize(None)
+    return np.asarray(index.values).astype("datetime64[D]").astype(np.int64)
+
+
+def to_days(dates: Iterable[Any]) -> np.ndarray:
+    """Vectorized epoch days from ints (no-op) or "YYYY-MM-DD" strings."""
+    arr = np.asarray(list(dates) if not isinstance(dates, np.ndarray) else dates)
+    if arr.size == 0:
+        return np.array([], dtype=np.int64)
+    if arr.dtype.kind in "iu":
+        return arr.astype(np.int64)
+    return arr.astype("datetime64[D]").astype(np.int64)
+
+
+def series_arrays(rows: list[dict[str, Any]], field: str) -> tuple[np.ndarray, np.ndarray]:
+    """(days, values) sorted by day, rows with a missing field dropped; last row wins on duplicate days."""
+    pts = [(r["date"], r[field]) for r in rows if r.get(field) is not None]
+    if not pts:
+        return np.array([], dtype=np.int64), np.array([], dtype=float)
+    days = to_days([d for d, _ in pts])
+    vals = np.array([v for _, v in pts], dtype=float)
+    order = np.argsort(days, kind="stable")
+    days, vals = days[order], vals[order]
+    keep = np.append(days[1:] != days[:-1], True)
+    return days[keep], vals[keep]
+
+
+def is_weekday(days: np.ndarray) -> np.ndarray:
+    return (days + 3) % 7 < 5  # day 0 (1970-01-01) was a Thursday
+
+
+def union_calendar(day_arrays: Iterable[np.ndarray], weekdays_only: bool = False) -> np.ndarray:
+    """Sorted union of observed days; weekdays_only folds weekend observations into the next session."""
+    arrs = [a for a in day_arrays if len(a)]
+    if not arrs:
+        return np.array([], dtype=np.int64)
+    cal = np.unique(np.concatenate(arrs))
+    return cal[is_weekday(cal)] if weekdays_only else cal
+
+
+def asof_index(src_days: np.ndarray, target_days: np.ndarray | int) -> np.ndarray:
+    """Position of the last src day <= each target day; -1 when none."""
+    return np.searchsorted(src_days, target_days, side="right") - 1
+
+
+def asof_join(target_days: np.ndarray, src_days: np.ndarray, src_vals: np.ndarray) -> np.ndarray:
+    """src values carried forward onto target_days; NaN before the source starts."""
+    out = np.full(len(target_days), np.nan)
+    if not len(src_days):
+        return out
+    idx = asof_index(src_days, target_days)
+    ok = idx >= 0
+    out[ok] = src_vals[idx[ok]]
+    return out
+
+
+def lookback(days: np.ndarray, vals: np.ndarray, lags: Iterable[int]) -> list[float | None]:
+    """For the last observation: the value as of (last day - lag) for each lag, None if no such observation."""
+    lags = list(lags)
+    if len(days) < 2:
+        return [None] * len(lags)
+    idx = asof_index(days[:-1], days[-1] - np.asarray(lags, dtype=np.int64))
+    return [float(vals[i]) if i >= 0 else None for i in idx]
+
+
+def today_day() -> int:
+    """Current UTC date as a day index."""
+    return datetime.now(timezone.utc).date().toordinal() - EPOCH_ORDINAL
@@ -0,0 +1,146 @@
+"""
+RiskScore attribution for the current build: weighted component points, partial sensitivities
+(central finite differences, all bumps evaluated in one batched scenario call) and the distance of
+each regime() input to its rule thresholds, plus the smallest single-input move that flips the regime.
+Results are cached on the scenario inputs, so unchanged macro data is not re-evaluated.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+import numpy as np
+
+from .params import DEFAULT_PARAMS, RuleParams
+from .regime import regime_array
+from .scenario import FIELDS, PCT_FIELDS, ScenarioInputs, scenario_grid, scenario_percentiles
+from .scoring import risk_components_array
+
+# Typical move per field: finite-difference bump and unit of the regime-flip search
+STEP = {
+    "HY": 0.25,
+    "HY_chg": 0.1,
+    "REAL10Y": 0.1,
+    "REAL10Y_chg": 0.05,
+    "DXY": 1.0,
+    "DXY_chg": 0.5,
+    "PMI": 1.0,
+    "CORE_CPI": 0.1,
+}
+# Regime-flip search: shifts of +-1..FLIP_STEPS steps per field
+FLIP_STEPS = 40
+
+_CACHE: dict[str, dict[str, Any]] = {}
+
+
+def _thresholds(params: RuleParams) -> list[tuple[str, str, str, float]]:
+    """(rule, input, comparison, threshold) for every condition in regime.regime."""
+    p = params
+    return [
+        ("riskScoreA", "riskScore", "<", p.risk_score_a),
+        ("hyElevated", "HY", ">", p.hy_elevated),
+        ("hyStress", "HY", ">", p.hy_stress),
+        ("hyPeakChange", "HY_chg", "<", p.hy_peak_change),
+        ("realRateEasing", "REAL10Y_chg", "<", p.real_rate_easing),
+        ("realRateTight", "REAL10Y", ">", p.real_rate_tight),
+        ("pmiWeak", "PMI", "<", p.pmi_weak),
+        ("pmiOk", "PMI", ">=", p.pmi_ok),
+        ("coreInflHigh", "CORE_CPI", ">", p.core_infl_high),
+    ]
+
+
+def _cache_key(inputs: ScenarioInputs, params: RuleParams) -> str:
+    blob = json.dumps([inputs.macro, inputs.windows, params.to_dict()], sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def _evaluate(inputs: ScenarioInputs, rows: list[dict[str, float]], params: RuleParams) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray]:
+    """(components, unrounded score, regime letters) for shift scenarios; levels keep their 1m change."""
+    pinned = [{**r, **{f + "_chg": r.get(f + "_chg", 0.0) for f in ("HY", "REAL10Y", "DXY") if f in r}} for r in rows]
+    m = scenario_grid(inputs, pinned, mode="shift")
+    comps = risk_components_array(m["HY"], m["REAL10Y"], m["DXY"], m["PMI"], m["CORE_CPI"], scenario_percentiles(inputs, m))
+    total = comps["credit"] + comps["liquidity"] + comps["growth"] + comps["inflation"]
+    score = np.clip(np.round(total, 1), 0, 100)
+    letters = regime_array(m["HY"], m["HY_chg"], m["REAL10Y"], m["REAL10Y_chg"], m["PMI"], m["CORE_CPI"], score, params)
+    return comps, total, letters
+
+
+def risk_attribution(inputs: ScenarioInputs, params: RuleParams = DEFAULT_PARAMS) -> dict[str, Any]:
+    """
+    {"components": {credit, liquidity, growth, inflation: points}, "sensitivities": {field: {perUnit,
+    perStep, step}}, "thresholds": [{rule, input, value, threshold, distance, met}], "regimeFlip":
+    {field: {shift, to} | None}, "mostSensitive", "nearestThreshold"}.
+    """
+    key = _cache_key(inputs, params)
+    hit = _CACHE.get(key)
+    if hit is not None:
+        return hit
+
+    # Row 0: baseline; then +step / -step per level field; then the flip search lines
+    sens_fields = list(PCT_FIELDS)
+    rows: list[dict[str, float]] = [{}]
+    for f in sens_fields:
+        rows += [{f: STEP[f]}, {f: -STEP[f]}]
+    ks = np.r_[-np.arange(1, FLIP_STEPS + 1), np.arange(1, FLIP_STEPS + 1)]
+    ks = ks[np.argsort(np.abs(ks), kind="stable")]  # nearest shifts first, downside before upside
+    flip_at = len(rows)
+    for f in FIELDS:
+        rows += [{f: float(k * STEP[f])} for k in ks]
+    comps, total, letters = _evaluate(inputs, rows, params)
+
+    base_total = float(total[0])
+    sensitivities = {}
+    for i, f in enumerate(sens_fields):
+        up, down = total[1 + 2 * i], total[2 + 2 * i]
+        per_step = float(up - down) / 2
+        sensitivities[f] = {"step": STEP[f], "perStep": round(per_step, 3), "perUnit": round(per_step / STEP[f], 3)}
+
+    base_letter = str(letters[0])
+    regime_flip: dict[str, dict[str, Any] | None] = {}
+    for i, f in enumerate(FIELDS):
+        seg = letters[flip_at + i * len(ks): flip_at + (i + 1) * len(ks)]
+        changed = np.flatnonzero(seg != base_letter)
+        if len(changed):
+            j = int(changed[0])
+            regime_flip[f] = {"shift": round(float(ks[j] * STEP[f]), 4), "steps": int(ks[j]), "to": str(seg[j])}
+        else:
+            regime_flip[f] = None
+
+    values = {f: inputs.macro.get(f) for f in FIELDS}
+    values["riskScore"] = round(base_total, 1)
+    thresholds = []
+    for rule, field, op, thr in _thresholds(params):
+        v = values.get(field)
+        if v is None:
+            thresholds.append({"rule": rule, "input": field, "op": op, "value": None, "threshold": thr, "distance": None, "met": False})
+            continue
+        met = {"<": v < thr, ">": v > thr, ">=": v >= thr}[op]
+        thresholds.append({
+            "rule": rule,
+            "input": field,
+            "op": op,
+            "value": round(float(v), 4),
+            "threshold": thr,
+            "distance": round(float(v - thr), 4),
+            "met": bool(met),
+        })
+
+    def _in_steps(t: dict[str, Any]) -> float:
+        step = STEP.get(t["input"], 1.0)  # riskScore: points
+        return abs(t["distance"]) / step if t["distance"] is not None else np.inf
+
+    nearest = min(thresholds, key=_in_steps) if thresholds else None
+    out = {
+        "riskScore": round(base_total, 1),
+        "regime": base_letter,
+        "components": {k: round(float(v[0]), 2) for k, v in comps.items()},
+        "sensitivities": sensitivities,
+        "mostSensitive": max(sensitivities, key=lambda f: abs(sensitivities[f]["perStep"])) if sensitivities else None,
+        "thresholds": thresholds,
+        "nearestThreshold": nearest["rule"] if nearest and nearest["distance"] is not None else None,
+        "regimeFlip": regime_flip,
+    }
+    _CACHE.clear()
+    _CACHE[key] = out
+    return out
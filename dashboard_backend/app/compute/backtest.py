@@ -0,0 +1,369 @@
+"""
+Vectorized historical backtest of the daily signal rules.
+RiskScore, regime, trend/risk/catalyst lights, suggestedMaxWeight and action are evaluated for every
+business day at once from FRED history and price history, as-of joined onto one calendar.
+Position rule: hold suggestedMaxWeight unless action is REDUCE (flat); the signal at close t earns the
+asset's return from t to t+1.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Any
+
+import numpy as np
+
+from ..align import asof_index, asof_join, day_str, series_arrays, union_calendar
+from .params import DEFAULT_PARAMS, RuleParams
+from .percentile import PCT_MIN_OBS, rolling_percentiles
+from .regime import regime_array
+from .scoring import risk_score_array
+
+HIT_HORIZON = 20       # business days ahead for ADD / REDUCE hit rates
+PCT_WINDOW = 252       # volPercentile1y lookback (observations)
+# Monthly FRED rows are dated by reference period; shift to roughly the release day to avoid look-ahead
+RELEASE_LAG_DAYS = {"CORE_CPI": 45, "PMI": 35}
+# build_payload fallbacks when a macro is missing: (value, change1m)
+MACRO_DEFAULTS: dict[str, tuple[float, float]] = {
+    "HY": (4.5, -0.2),
+    "REAL10Y": (1.5, -0.1),
+    "DXY": (100.0, 0.0),
+    "CORE_CPI": (3.0, -0.1),
+    "PMI": (50.0, np.nan),
+}
+
+GREEN, YELLOW, RED = 0, 1, 2
+HOLD, ADD, REDUCE = 0, 1, 2
+LIGHTS = ("green", "yellow", "red")
+ACTIONS = ("HOLD", "ADD", "REDUCE")
+
+
+def _macro_on(cal: np.ndarray, rows: list[dict[str, Any]], monthly: bool, lag: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """(value, change1m) as of each calendar day; change1m as in fred: 28-day as-of diff, or previous month."""
+    days, vals = series_arrays(rows or [], "value")
+    if not len(days):
+        return np.full(len(cal), np.nan), np.full(len(cal), np.nan)
+    days = days + lag
+    if monthly:
+        chg = np.append(np.nan, np.diff(vals))
+    else:
+        j = asof_index(days, days - 28)
+        chg = np.where(j >= 0, vals - vals[np.maximum(j, 0)], np.nan)
+    return asof_join(cal, days, vals), asof_join(cal, days, chg)
+
+
+def macro_frame(cal: np.ndarray, macro: dict[str, list[dict[str, Any]]], release_lag: bool = True) -> dict[str, np.ndarray]:
+    """
+    Macro inputs of build_payload on every calendar day, missing values replaced by its defaults;
+    <mid>_pct: empirical percentile as of each day (NaN where the default is used).
+    release_lag=False dates monthly rows by reference period (as the live payload reads them).
+    """
+    out: dict[str, np.ndarray] = {}
+    for mid, (dv, dc) in MACRO_DEFAULTS.items():
+        monthly = mid in RELEASE_LAG_DAYS
+        lag = RELEASE_LAG_DAYS.get(mid, 0) if release_lag else 0
+        v, c = _macro_on(cal, macro.get(mid) or [], monthly, lag)
+        missing = np.isnan(v)
+        out[mid] = np.where(missing, dv, v)
+        out[mid + "_chg"] = np.where(missing, dc, c)
+        days, vals = series_arrays(macro.get(mid) or [], "value")
+        pct = rolling_percentiles(days, vals, min_obs=PCT_MIN_OBS["M" if monthly else "D"])
+        out[mid + "_pct"] = np.where(missing, np.nan, asof_join(cal, days + lag, pct))
+    return out
+
+
+def macro_pcts(m: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """The empirical percentile arrays of a macro_frame, keyed for risk_score_array."""
+    return {mid: m[mid + "_pct"] for mid in MACRO_DEFAULTS}
+
+
+def _rolling_percentile(closes: np.ndarray, window: int = PCT_WINDOW) -> np.ndarray:
+    """% of the last `window` closes (fewer at the start) <= the current close, per observation."""
+    padded = np.concatenate([np.full(window - 1, np.nan), closes])
+    win = np.lib.stride_tricks.sliding_window_view(padded, window)
+    return np.sum(win <= closes[:, None], axis=1) / np.sum(~np.isnan(win), axis=1) * 100
+
+
+def _rolling_mean(closes: np.ndarray, k: np.ndarray, window: int) -> np.ndarray:
+    cs = np.concatenate([[0.0], np.cumsum(closes)])
+    lo = np.maximum(k + 1 - window, 0)
+    return np.where(k >= window - 1, (cs[k + 1] - cs[lo]) / window, np.nan)
+
+
+def curve_stats(eq: np.ndarray, rets: np.ndarray, w: np.ndarray, days: int) -> dict[str, Any]:
+    """eq: equity curve, rets: its daily returns, w: weights (T,) or (T, N) for turnover."""
+    years = max(days / 252, 1e-9)
+    dd = 1 - eq / np.maximum.accumulate(eq)
+    sd = float(np.std(rets))
+    turnover = float(np.abs(np.diff(w, axis=0)).sum()) if len(w) > 1 else 0.0
+    return {
+        "finalEquity": round(float(eq[-1]), 4),
+        "cagr": round(float(eq[-1] ** (1 / years) - 1) * 100, 2),
+        "sharpe": round(float(np.mean(rets) / sd * np.sqrt(252)), 3) if sd > 0 else 0.0,
+        "maxDrawdown": round(float(dd.max()) * 100, 2),
+        "turnoverAnn": round(turnover / years, 3),
+    }
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    """Per-day rule outputs: (T,) arrays for the macro side, (T, N) for assets (column j = asset_ids[j])."""
+
+    dates: np.ndarray
+    asset_ids: tuple[str, ...]
+    risk_score: np.ndarray
+    regime: np.ndarray
+    catalyst: np.ndarray
+    trend: np.ndarray
+    risk: np.ndarray
+    weights: np.ndarray
+    actions: np.ndarray
+    asset_returns: np.ndarray
+    has_price: np.ndarray
+
+    @property
+    def strategy_returns(self) -> np.ndarray:
+        out = np.zeros_like(self.asset_returns)
+        out[1:] = self.weights[:-1] * self.asset_returns[1:]
+        return out
+
+    @property
+    def equity(self) -> np.ndarray:
+        return np.cumprod(1 + self.strategy_returns, axis=0)
+
+    @property
+    def portfolio_equity(self) -> np.ndarray:
+        return np.cumprod(1 + self.strategy_returns.sum(axis=1))
+
+    def hit_rates(self, horizon: int = HIT_HORIZON) -> tuple[np.ndarray, np.ndarray]:
+        """Per asset: share of ADD days followed by a positive `horizon`-day return, REDUCE days by a negative one."""
+        growth = np.cumprod(1 + self.asset_returns, axis=0)
+        fwd = np.full(growth.shape, np.nan)
+        if len(growth) > horizon:
+            fwd[:-horizon] = growth[horizon:] / growth[:-horizon] - 1
+        known = ~np.isnan(fwd) & self.has_price
+        add = known & (self.actions == ADD)
+        red = known & (self.actions == REDUCE)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            add_hit = np.sum(add & (fwd > 0), axis=0) / np.sum(add, axis=0)
+            red_hit = np.sum(red & (fwd < 0), axis=0) / np.sum(red, axis=0)
+        return add_hit, red_hit
+
+    def metrics(self) -> dict[str, Any]:
+        """Portfolio-level scalars used to rank parameter sets (no curves)."""
+        if not len(self.dates):
+            return {"days": 0}
+        out = curve_stats(self.portfolio_equity, self.strategy_returns.sum(axis=1), self.weights, len(self.dates))
+        add_hit, red_hit = self.hit_rates()
+        with np.errstate(invalid="ignore"):
+            out["hitRateAdd"] = None if np.all(np.isnan(add_hit)) else round(float(np.nanmean(add_hit)) * 100, 1)
+            out["hitRateReduce"] = None if np.all(np.isnan(red_hit)) else round(float(np.nanmean(red_hit)) * 100, 1)
+        out["avgGrossExposure"] = round(float(self.weights.sum(axis=1).mean()), 3)
+        out["days"] = int(len(self.dates))
+        return out
+
+    def summary(self, curve_step: int = 5) -> dict[str, Any]:
+        """JSON-serializable metrics + equity curves sampled every `curve_step` days."""
+        if not len(self.dates):
+            return {"start": None, "end": None, "days": 0, "portfolio": None, "assets": {}, "curves": {}}
+        eq = self.equity
+        sr = self.strategy_returns
+        add_hit, red_hit = self.hit_rates()
+        assets = {}
+        for j, aid in enumerate(self.asset_ids):
+            row = curve_stats(eq[:, j], sr[:, j], self.weights[:, j], len(self.dates))
+            row["hitRateAdd"] = None if np.isnan(add_hit[j]) else round(float(add_hit[j]) * 100, 1)
+            row["hitRateReduce"] = None if np.isnan(red_hit[j]) else round(float(red_hit[j]) * 100, 1)
+            row["signals"] = {name: int(np.sum((self.actions[:, j] == code) & self.has_price[:, j])) for code, name in enumerate(ACTIONS)}
+            assets[aid] = row
+        port = self.metrics()
+        port.pop("days")
+        letters, counts = np.unique(self.regime, return_counts=True)
+        idx = np.unique(np.append(np.arange(0, len(self.dates), max(1, curve_step)), len(self.dates) - 1))
+        return {
+            "start": day_str(self.dates[0]),
+            "end": day_str(self.dates[-1]),
+            "days": int(len(self.dates)),
+            "regimeDays": {str(k): int(v) for k, v in zip(letters, counts)},
+            "avgRiskScore": round(float(self.risk_score.mean()), 1),
+            "portfolio": port,
+            "assets": assets,
+            "curves": {
+                "dates": [day_str(d) for d in self.dates[idx]],
+                "portfolio": np.round(self.portfolio_equity[idx], 4).tolist(),
+                "assets": {aid: np.round(eq[idx, j], 4).tolist() for j, aid in enumerate(self.asset_ids)},
+            },
+        }
+
+
+@dataclass(frozen=True)
+class BacktestData:
+    """
+    Everything parameter-independent, aligned once: macro inputs (T,), per-asset raw lights before the
+    min-history mask, percentile, observation count and daily returns (T, N). Plain arrays, so the sweep
+    can place them in shared memory.
+    """
+
+    dates: np.ndarray
+    asset_ids: tuple[str, ...]
+    base: np.ndarray
+    risk_score: np.ndarray
+    hy: np.ndarray
+    hy_chg: np.ndarray
+    real: np.ndarray
+    real_chg: np.ndarray
+    dxy_chg: np.ndarray
+    pmi: np.ndarray
+    core_cpi: np.ndarray
+    trend_raw: np.ndarray
+    risk_raw: np.ndarray
+    pct: np.ndarray
+    obs_count: np.ndarray
+    asset_returns: np.ndarray
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "asset_ids"}
+
+    @classmethod
+    def from_arrays(cls, asset_ids: tuple[str, ...], arrays: dict[str, np.ndarray]) -> "BacktestData":
+        return cls(asset_ids=tuple(asset_ids), **arrays)
+
+
+def prepare_backtest(
+    asset_defs: list[dict[str, Any]] | tuple[dict[str, Any], ...],
+    ohlcv: dict[str, list[dict[str, Any]]],
+    macro: dict[str, list[dict[str, Any]]],
+    start_day: int | None = None,
+    release_lag: bool = True,
+) -> BacktestData:
+    """
+    asset_defs: universe assets; ohlcv: {ticker: rows}; macro: fred.get_macro_history() shape.
+    The calendar starts when the daily macro series (HY, REAL10Y, DXY) all have data, or at start_day.
+    release_lag=False for release-dated rows (fred.macro_history_pit), which need no lag approximation.
+    """
+    pts = [series_arrays(ohlcv.get(d["ticker"]) or [], "close") for d in asset_defs]
+    cal = union_calendar([days for days, _ in pts], weekdays_only=True)
+    starts = [int(d[0]) for d, _ in (series_arrays(macro.get(mid) or [], "value") for mid in ("HY", "REAL10Y", "DXY")) if len(d)]
+    if start_day is not None:
+        starts.append(start_day)
+    if starts:
+        cal = cal[cal >= max(starts)]
+    T, N = len(cal), len(asset_defs)
+
+    m = macro_frame(cal, macro, release_lag=release_lag)
+    risk_score, _ = risk_score_array(m["HY"], m["REAL10Y"], m["DXY"], m["PMI"], m["CORE_CPI"], macro_pcts(m))
+
+    trend = np.full((T, N), YELLOW, dtype=np.int8)
+    risk = np.full((T, N), YELLOW, dtype=np.int8)
+    pct_all = np.full((T, N), np.nan)
+    count = np.zeros((T, N), dtype=np.int64)
+    rets = np.zeros((T, N))
+
+    for j, (days, closes) in enumerate(pts):
+        if not len(days) or not T:
+            continue
+        k = asof_index(days, cal)
+        has = k >= 0
+        k = np.maximum(k, 0)
+        price = closes[k]
+        ma20, ma60, ma200 = (_rolling_mean(closes, k, w) for w in (20, 60, 200))
+        pct = _rolling_percentile(closes)[k]
+
+        with np.errstate(invalid="ignore"):
+            up = (price > ma20) & (ma20 > ma60) & (ma60 > ma200)
+            trend[:, j] = np.where(np.isnan(ma200), YELLOW, np.where(up, GREEN, np.where(price < ma200, RED, YELLOW)))
+        q = 100 - pct
+        risk[:, j] = np.where(q <= 33, GREEN, np.where(q <= 66, YELLOW, RED))
+        pct_all[:, j] = np.where(has, pct, np.nan)
+        count[:, j] = np.where(has, k + 1, 0)
+
+        level = asof_join(cal, days, closes)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = np.append(0.0, level[1:] / level[:-1] - 1)
+        rets[:, j] = np.where(np.isfinite(r), r, 0.0)
+
+    return BacktestData(
+        dates=cal,
+        asset_ids=tuple(d["id"] for d in asset_defs),
+        base=np.array([float(d["baseMaxWeight"]) for d in asset_defs]),
+        risk_score=risk_score,
+        hy=m["HY"],
+        hy_chg=m["HY_chg"],
+        real=m["REAL10Y"],
+        real_chg=m["REAL10Y_chg"],
+        dxy_chg=m["DXY_chg"],
+        pmi=m["PMI"],
+        core_cpi=m["CORE_CPI"],
+        trend_raw=trend,
+        risk_raw=risk,
+        pct=pct_all,
+        obs_count=count,
+        asset_returns=rets,
+    )
+
+
+def catalyst_array(regime: np.ndarray, real: np.ndarray, dxy_chg: np.ndarray, params: RuleParams = DEFAULT_PARAMS) -> np.ndarray:
+    """_catalyst_light codes for aligned regime letters / real rate / DXY 1m change."""
+    p = params
+    with np.errstate(invalid="ignore"):
+        return np.select(
+            [regime == "C", (regime == "A") & (real < p.catalyst_real_rate), (regime == "D") & (dxy_chg < p.catalyst_dxy_change)],
+            [RED, GREEN, GREEN],
+            YELLOW,
+        ).astype(np.int8)
+
+
+def suggested_array(base: np.ndarray, regime: np.ndarray, vol_pct: np.ndarray, params: RuleParams = DEFAULT_PARAMS) -> np.ndarray:
+    """suggestedMaxWeight: base (N,), regime (K,), vol_pct (N,) or (K, N) with NaN = unknown -> (K, N)."""
+    p = params
+    with np.errstate(invalid="ignore"):
+        regime_mult = np.select([regime == k for k in "ABCD"], [p.regime_mult(k) for k in "ABCD"], 1.0)
+        risk_mult = np.where(vol_pct > p.risk_pct_high, p.risk_mult_high, np.where(vol_pct > p.risk_pct_mid, p.risk_mult_mid, 1.0))
+    base = base[None, :]
+    return np.round(np.minimum(base, base * regime_mult[:, None] * risk_mult), 2)
+
+
+def action_array(trend: np.ndarray, risk: np.ndarray, catalyst: np.ndarray, suggested: np.ndarray) -> np.ndarray:
+    """_action codes; catalyst (K,) broadcasts over the asset axis."""
+    reduce = (risk == RED) | (trend == RED)
+    add = ~reduce & (trend == GREEN) & (catalyst[:, None] != RED) & (suggested > 0)
+    return np.where(reduce, REDUCE, np.where(add, ADD, HOLD)).astype(np.int8)
+
+
+def evaluate(data: BacktestData, params: RuleParams = DEFAULT_PARAMS) -> BacktestResult:
+    """Apply one rule parameter set to prepared data; all dates and assets at once."""
+    p = params
+    regime = regime_array(data.hy, data.hy_chg, data.real, data.real_chg, data.pmi, data.core_cpi, data.risk_score, p)
+    catalyst = catalyst_array(regime, data.real, data.dxy_chg, p)
+
+    has = data.obs_count > 0
+    enough = data.obs_count >= p.min_history
+    trend = np.where(enough, data.trend_raw, YELLOW).astype(np.int8)
+    risk = np.where(enough, data.risk_raw, YELLOW).astype(np.int8)
+    suggested = suggested_array(data.base, regime, data.pct, p)
+    actions = action_array(trend, risk, catalyst, suggested)
+    weights = np.where(has & (actions != REDUCE), suggested, 0.0)
+
+    return BacktestResult(
+        dates=data.dates,
+        asset_ids=data.asset_ids,
+        risk_score=data.risk_score,
+        regime=regime,
+        catalyst=catalyst,
+        trend=trend,
+        risk=risk,
+        weights=weights,
+        actions=actions,
+        asset_returns=data.asset_returns,
+        has_price=has,
+    )
+
+
+def run_backtest(
+    asset_defs: list[dict[str, Any]] | tuple[dict[str, Any], ...],
+    ohlcv: dict[str, list[dict[str, Any]]],
+    macro: dict[str, list[dict[str, Any]]],
+    start_day: int | None = None,
+    params: RuleParams = DEFAULT_PARAMS,
+    release_lag: bool = True,
+) -> BacktestResult:
+    return evaluate(prepare_backtest(asset_defs, ohlcv, macro, start_day, release_lag), params)
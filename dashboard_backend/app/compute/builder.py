@@ -1,29 +1,49 @@
 """
 Build dashboard payload: dailySignal, macroSwitches, assets, assetSignals.
 Align with frontend schema (dailySignal, not todaySignal).
+build_payload fetches and computes everything; fetch_sections + merge_sections (refresh_intraday for the
+btc section) refresh only the due sections (compute.sections) and swap the parts depending on them into
+the last payload.
 """
 from __future__ import annotations
 
 import os
+from dataclasses import replace
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterable
 
+import numpy as np
+
+from ..align import day_str, lookback, series_arrays
 from ..providers import fred as fred_prov
 from ..providers import price_chain as price_chain_prov
+from ..universe import Universe, load_universe
+from . import correlation as corr_engine
+from .attribution import risk_attribution
 from . import features as feat
+from .history import regime_history, slice_history
+from . import intraday
+from .kondratieff import weekly_chain
+from .memo import FeatureMemo
+from .params import DEFAULT_PARAMS, RuleParams
+from .percentile import MACRO_RANKS
+from .portfolio import portfolio_risk
+from .simulation import simulate_allocation, simulation_enabled
+from .volforecast import VOL_FORECASTER, vol_source
+from .pool import map_chunks
+from . import scenario
+from . import relstrength as rs_engine
 from . import scoring
 from .regime import regime as compute_regime
+from .regimestats import regime_stats
+from .resample import BAR_CACHE
+from .sections import PARTS, SECTION_INPUTS, SECTIONS, SectionInputs, parts_of
 
-ASSET_DEFS = [
-    {"id": "BTC", "name": "Bitcoin", "ticker": "BTC-USD", "assetType": "crypto", "currency": "USD", "benchmarkId": "QQQ", "baseMaxWeight": 0.25},
-    {"id": "AI_BASKET", "name": "AI Basket", "ticker": "SMH", "assetType": "equity", "currency": "USD", "benchmarkId": "SPY", "baseMaxWeight": 0.40},
-    {"id": "TSLA", "name": "Tesla", "ticker": "TSLA", "assetType": "equity", "currency": "USD", "benchmarkId": "SPY", "baseMaxWeight": 0.15},
-    {"id": "BABA", "name": "Alibaba", "ticker": "9988.HK", "assetType": "hk_equity", "currency": "HKD", "benchmarkId": "HSTECH", "baseMaxWeight": 0.15},
-    {"id": "TENCENT", "name": "Tencent", "ticker": "0700.HK", "assetType": "hk_equity", "currency": "HKD", "benchmarkId": "HSTECH", "baseMaxWeight": 0.15},
-    {"id": "XAU", "name": "Gold", "ticker": "GC=F", "assetType": "metal", "currency": "USD", "baseMaxWeight": 0.20},
-    {"id": "XAG", "name": "Silver", "ticker": "SI=F", "assetType": "metal", "currency": "USD", "baseMaxWeight": 0.08},
-    {"id": "HG", "name": "Copper", "ticker": "HG=F", "assetType": "future", "currency": "USD", "baseMaxWeight": 0.15},
-]
+# Payload keys of the macro / asset / weekly parts, in output order (after version, generatedAt, dailySignal)
+PAYLOAD_PARTS = (
+    "riskAttribution", "macroSwitches", "macroDataStatus", "regimeHistory", "regimeStats", "assets",
+    "assetSignals", "portfolioRisk", "riskSimulation", "dataStatus", "weeklyKondratieff", "technicalData",
+)
 
 TICKER_TO_STOOQ = {
     "GC=F": "xauusd",
@@ -40,12 +60,12 @@ def _pct_to_light(pct: float) -> str:
     return "red"
 
 
-def _trend_light(series: list[dict], price: float | None) -> str:
-    if not series or price is None:
+def _trend_light(tech: dict[str, Any], price: float | None) -> str:
+    if price is None:
         return "yellow"
-    ma20 = feat.ma(series, 20)
-    ma60 = feat.ma(series, 60)
-    ma200 = feat.ma(series, 200)
+    ma20 = tech.get("ma20")
+    ma60 = tech.get("ma60")
+    ma200 = tech.get("ma200")
     if ma200 is None:
         return "yellow"
     if price > (ma20 or 0) and (ma20 or 0) > (ma60 or 0) and (ma60 or 0) > ma200:
@@ -60,27 +80,32 @@ def _risk_light(vol_pct: float | None) -> str:
     return _pct_to_light(100 - p)
 
 
-def _catalyst_light(regime_letter: str, real_rate: float | None, dxy_chg: float | None) -> str:
+def _forecast_risk_light(vol_pct: float) -> str:
+    # Forecast-vol percentile (compute.volforecast): high vol -> red
+    return _pct_to_light(vol_pct)
+
+
+def _catalyst_light(regime_letter: str, real_rate: float | None, dxy_chg: float | None, params: RuleParams = DEFAULT_PARAMS) -> str:
     if regime_letter == "C":
         return "red"
-    if regime_letter == "A" and (real_rate is None or real_rate < 1.0):
+    if regime_letter == "A" and (real_rate is None or real_rate < params.catalyst_real_rate):
         return "green"
-    if regime_letter == "D" and dxy_chg is not None and dxy_chg < -0.5:
+    if regime_letter == "D" and dxy_chg is not None and dxy_chg < params.catalyst_dxy_change:
         return "green"
     return "yellow"
 
 
-def _regime_mult(r: str) -> float:
-    return {"A": 1.0, "B": 0.9, "C": 0.7, "D": 0.95}.get(r, 1.0)
+def _regime_mult(r: str, params: RuleParams = DEFAULT_PARAMS) -> float:
+    return params.regime_mult(r)
 
 
-def _risk_mult(vol_pct: float | None) -> float:
+def _risk_mult(vol_pct: float | None, params: RuleParams = DEFAULT_PARAMS) -> float:
     if vol_pct is None:
         return 1.0
-    if vol_pct > 70:
-        return 0.8
-    if vol_pct > 50:
-        return 0.9
+    if vol_pct > params.risk_pct_high:
+        return params.risk_mult_high
+    if vol_pct > params.risk_pct_mid:
+        return params.risk_mult_mid
     return 1.0
 
 
@@ -93,53 +118,293 @@ def _action(trend: str, risk: str, catalyst: str, suggested: float, base: float)
 
 
 def _latest_and_returns(series: list[dict[str, Any]]) -> dict[str, Any]:
-    if not series:
+    return _returns_from_arrays(*series_arrays(series, "close"))
+
+
+def _returns_from_arrays(days: np.ndarray, closes: np.ndarray) -> dict[str, Any]:
+    if not len(days):
         return {"price": None, "change1d": None, "change7d": None, "change30d": None}
-    series = sorted(series, key=lambda x: x["date"])
-    latest = series[-1]["close"]
-    ch1d = ch7d = ch30d = None
-    for r in reversed(series[:-1]):
-        days_ago = (datetime.strptime(series[-1]["date"], "%Y-%m-%d") - datetime.strptime(r["date"], "%Y-%m-%d")).days
-        if r["close"] and r["close"] != 0:
-            pct = (latest - r["close"]) / r["close"] * 100
-            if ch1d is None and days_ago >= 1:
-                ch1d = round(pct, 2)
-            if ch7d is None and days_ago >= 5:
-                ch7d = round(pct, 2)
-            if ch30d is None and days_ago >= 25:
-                ch30d = round(pct, 2)
-        if ch1d is not None and ch7d is not None and ch30d is not None:
-            break
+    latest = float(closes[-1])
+    prior = closes[:-1] != 0
+    days = np.append(days[:-1][prior], days[-1])
+    closes = np.append(closes[:-1][prior], latest)
+    ch1d, ch7d, ch30d = (
+        round((latest - p) / p * 100, 2) if p is not None else None
+        for p in lookback(days, closes, (1, 5, 25))
+    )
     return {"price": latest, "change1d": ch1d, "change7d": ch7d, "change30d": ch30d}
 
 
-def _fetch_prices_and_status() -> tuple[dict[str, list[dict[str, Any]]], dict[str, dict[str, Any]]]:
+EMPTY_TECH = {"ma20": 0, "ma60": 0, "ma200": 0, "mom12w": 0, "vol20Ann": 0, "mdd60": 0, "mdd120": 0, "volPercentile1y": 50, "ddPercentile1y": 50}
+
+
+def _asset_features(arrays: list[tuple[np.ndarray, np.ndarray]]) -> list[dict[str, Any]]:
+    """
+    Everything per asset that depends only on its own series (memoizable); one batched feature pass.
+    arrays: (days, closes) per asset from series_arrays. Module-level so pool workers can run it on a chunk.
+    """
+    out = []
+    for (days, closes), tech in zip(arrays, feat.compute_batch_arrays(arrays)):
+        tech = tech if len(days) else dict(EMPTY_TECH)
+        ret = _returns_from_arrays(days, closes)
+        out.append({
+            "tech": tech,
+            "ret": ret,
+            "trendLight": _trend_light(tech, ret.get("price")),
+            "riskLight": _risk_light(tech.get("volPercentile1y")),
+        })
+    return out
+
+
+def _features_by_id(
+    asset_defs: tuple[dict[str, Any], ...],
+    asset_series: dict[str, list[dict[str, Any]]],
+    memo: FeatureMemo | None,
+) -> dict[str, dict[str, Any]]:
+    """Memo hits are reused; misses go through _asset_features together, on a process pool for large universes."""
+    out: dict[str, dict[str, Any]] = {}
+    keys: dict[str, str] = {}
+    todo: list[str] = []
+    for defn in asset_defs:
+        aid = defn["id"]
+        if memo is not None:
+            keys[aid] = memo.key(defn["ticker"], asset_series[aid])
+            hit = memo.get(keys[aid])
+            if hit is not None:
+                out[aid] = hit
+                continue
+        todo.append(aid)
+    arrays = [series_arrays(asset_series[a], "close") for a in todo]
+    for aid, af in zip(todo, map_chunks(_asset_features, arrays)):
+        out[aid] = af
+        if memo is not None:
+            memo.put(keys[aid], af)
+    return out
+
+
+def _asset_entry(
+    defn: dict[str, Any],
+    af: dict[str, Any],
+    extra_tech: dict[str, Any],
+    st: dict[str, Any],
+    vol_src: str,
+    reg_letter: str,
+    real_rate: float | None,
+    dxy_chg: float | None,
+    date_str: str,
+    params: RuleParams = DEFAULT_PARAMS,
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any], tuple[str, float, str, str, int, float | None]]:
+    """
+    One asset's (technicalData, assets row, assetSignals row, scenario row) from its features (_asset_features),
+    the cross-asset fields (correlations, relative strength, vol forecasts), its price status and the macro state.
+    """
+    aid = defn["id"]
+    ticker = defn["ticker"]
+    base = defn["baseMaxWeight"]
+    tech = dict(af["tech"])
+    tech.update(extra_tech)
+    tech["assetId"] = aid
+
+    ret = af["ret"]
+    pr = ret.get("price")
+    ch1d, ch7d, ch30d = ret.get("change1d"), ret.get("change7d"), ret.get("change30d")
+
+    row_count = st.get("row_count", 0)
+    is_proxy = st.get("is_proxy", False)
+    trend_light = af["trendLight"]
+    risk_light = af["riskLight"]
+    # Risk light / _risk_mult input: price percentile (default) or the forecast-vol percentile (RISK_VOL_SOURCE)
+    vol_pct = tech.get("volPercentile1y")
+    if vol_src != "price" and tech.get(f"{vol_src}VolPercentile1y") is not None:
+        vol_pct = tech[f"{vol_src}VolPercentile1y"]
+        risk_light = _forecast_risk_light(vol_pct)
+    scenario_row = (aid, base, trend_light, risk_light, row_count, vol_pct)
+    if row_count < params.min_history:
+        trend_light = "yellow"
+        risk_light = "yellow"
+    catalyst_light = _catalyst_light(reg_letter, real_rate, dxy_chg, params)
+    regime_mult = _regime_mult(reg_letter, params)
+    risk_mult = _risk_mult(vol_pct, params)
+    suggested = round(min(base, base * regime_mult * risk_mult), 2)
+    action = _action(trend_light, risk_light, catalyst_light, suggested, 0)
+
+    reason_codes = []
+    if row_count < params.min_history:
+        reason_codes.append("INSUFFICIENT_HISTORY")
+    if is_proxy:
+        reason_codes.append("PROXY_USED")
+    if trend_light == "green":
+        reason_codes.append("TREND_UP")
+    if risk_light == "red":
+        reason_codes.append("VOL_HIGH")
+    if reg_letter == "C":
+        reason_codes.append("REGIME_C")
+    if catalyst_light == "green":
+        reason_codes.append("CATALYST_OK")
+    if not reason_codes:
+        reason_codes.append("HOLD")
+    # Fallback: never output 0 for price; use null and mark stale/fallback
+    if st.get("note") == "stale/fallback" and pr is not None and pr == 0:
+        pr = None
+    asset_row = {
+        "id": aid,
+        "name": defn["name"],
+        "ticker": ticker,
+        "assetType": defn["assetType"],
+        "currency": defn["currency"],
+        "benchmarkId": defn.get("benchmarkId"),
+        "baseMaxWeight": base,
+        "currentWeight": 0.0,
+        "suggestedMaxWeight": suggested,
+        "price": round(pr, 2) if pr is not None else None,
+        "priceChange24h": round(ch1d, 2) if ch1d is not None else None,
+        "priceChange7d": round(ch7d, 2) if ch7d is not None else None,
+        "priceChange30d": round(ch30d, 2) if ch30d is not None else None,
+    }
+    signal = {
+        "assetId": aid,
+        "date": date_str,
+        "trendLight": trend_light,
+        "riskLight": risk_light,
+        "catalystLight": catalyst_light,
+        "suggestedMaxWeight": suggested,
+        "action": action,
+        "reasonCodes": reason_codes,
+        "notes": f"{trend_light}/{risk_light}/{catalyst_light}",
+    }
+    return tech, asset_row, signal, scenario_row
+
+
+def _fetch_prices_and_status(tickers: list[str] | None = None) -> tuple[dict[str, list[dict[str, Any]]], dict[str, dict[str, Any]]]:
     """Provider chain: yfinance -> stooq -> marketwatch (HK) -> twelvedata -> binance. Returns (ohlcv, dataStatus)."""
-    return price_chain_prov.fetch_all_prices(days=400)
-
-
-def build_payload() -> dict[str, Any]:
-    hy = fred_prov.get_hy()
-    real10y = fred_prov.get_real10y()
-    dxy = fred_prov.get_dxy()
-    core_cpi = fred_prov.get_core_cpi_yoy()
-    pmi = fred_prov.get_pmi_like()
-    # PMI is always at least 50 (fallback); reason "PMI_FALLBACK" when no AMTMNO data
-
-    if not hy.get("value"):
-        hy = {"value": 4.5, "change7d": 0, "change1m": -0.2, "freshness_days": 999}
-    if not real10y.get("value"):
-        real10y = {"value": 1.5, "change7d": 0, "change1m": -0.1, "freshness_days": 999}
-    if not dxy.get("value"):
-        dxy = {"value": 100.0, "change7d": 0, "change1m": 0, "freshness_days": 999}
-    if not core_cpi.get("value"):
-        core_cpi = {"value": 3.0, "change7d": None, "change1m": -0.1, "freshness_days": 999}
+    return price_chain_prov.fetch_all_prices(days=400, tickers=tickers)
+
+
+# Fixed inputs for a FRED series that has never been fetched successfully
+FALLBACK_MACRO = {
+    "HY": {"value": 4.5, "change7d": 0, "change1m": -0.2, "freshness_days": 999},
+    "REAL10Y": {"value": 1.5, "change7d": 0, "change1m": -0.1, "freshness_days": 999},
+    "DXY": {"value": 100.0, "change7d": 0, "change1m": 0, "freshness_days": 999},
+    "CORE_CPI": {"value": 3.0, "change7d": None, "change1m": -0.1, "freshness_days": 999},
+}
+
+
+# FRED input id -> providers.fred getter
+MACRO_GETTERS = {
+    "HY": "get_hy",
+    "REAL10Y": "get_real10y",
+    "DXY": "get_dxy",
+    "PMI": "get_pmi_like",
+    "CORE_CPI": "get_core_cpi_yoy",
+}
+
+
+def _fetch_macro(
+    prev: dict[str, dict[str, Any]] | None = None, ids: Iterable[str] | None = None
+) -> tuple[dict[str, dict[str, Any]], list[str]]:
+    """
+    FRED inputs by id (HY, REAL10Y, DXY, PMI, CORE_CPI) and the ids whose fetch failed; `ids` fetches only
+    those (the others are kept from `prev`). A failed series keeps its previous dict from `prev`, else gets a
+    fixed fallback (PMI: get_pmi_like's own, reason PMI_FALLBACK).
+    """
+    fetched = {mid: getattr(fred_prov, MACRO_GETTERS[mid])() for mid in (MACRO_GETTERS if ids is None else ids)}
+    out = dict(prev or {})
+    failed = []
+    for mid, m in fetched.items():
+        if m.get("value") and m.get("reason") != "PMI_FALLBACK":
+            out[mid] = m
+            continue
+        failed.append(mid)
+        out[mid] = (prev or {}).get(mid) or FALLBACK_MACRO.get(mid, m)
+    return out, failed
+
+
+def _store_prices(tickers: list[str] | None) -> set[str]:
+    """
+    Fetch `tickers` (None: the whole price plan) into SECTION_INPUTS; only tickers fetched ok replace their
+    stored rows / status (a failed one keeps its last good data). Returns the tickers fetched ok.
+    """
+    store = SECTION_INPUTS
+    ohlcv, data_status = _fetch_prices_and_status(tickers)
+    ok = {t for t, st in data_status.items() if st.get("ok")}
+    fresh = {t: rows for t, rows in ohlcv.items() if t in ok}
+    store.ohlcv.update(fresh)
+    store.status.update({t: st for t, st in data_status.items() if t in ok or t not in store.status})
+    for t in set(ohlcv) - ok:
+        store.ohlcv.setdefault(t, [])
+    intraday.remember_daily(fresh)
+    # Weekly / monthly bars of every fetched series (only the newest bar is resampled on a warm cache)
+    BAR_CACHE.update_all(fresh)
+    return ok
+
+
+def fetch_sections(sections: Iterable[str]) -> list[str]:
+    """
+    Fetch the inputs of `sections` into SECTION_INPUTS: macro from FRED, market groups through the price chain
+    (every group -> one fetch of the whole price plan). weekly / btc fetch nothing here.
+    Every fetched section is marked refreshed; its failed tickers / series restart their backoff in
+    SectionInputs.failed (retry_failed). Returns the sections with a failed input.
+    """
+    sections = set(sections)
+    store = SECTION_INPUTS
+    now = datetime.now(timezone.utc)
+    if "macro" in sections:
+        store.macro, missing = _fetch_macro(store.macro)
+        store.failed.pop("macro", None)
+        store.record("macro", MACRO_GETTERS, missing, now)
+    groups = load_universe().groups
+    markets = [g for g in groups if g in sections]
+    if markets:
+        ok = _store_prices(None if len(markets) == len(groups) else [t for g in markets for t in groups[g]])
+        for g in markets:
+            store.failed.pop(g, None)
+            store.record(g, groups[g], [t for t in groups[g] if t not in ok], now)
+    store.mark(sections, now)
+    return sorted(s for s in sections if s in store.failed)
+
+
+def retry_failed(now: datetime | None = None) -> list[str]:
+    """
+    Refetch the failed tickers / FRED series whose backoff has elapsed (one price-chain call for all tickers).
+    Recovered ones replace their stored inputs and leave SectionInputs.failed, the others back off further.
+    Returns the sections with a recovered input (the parts depending on them need recomputing).
+    """
+    store = SECTION_INPUTS
+    now = now or datetime.now(timezone.utc)
+    due = store.retry_due(now)
+    recovered = []
+    if "macro" in due:
+        store.macro, missing = _fetch_macro(store.macro, due["macro"])
+        store.record("macro", due["macro"], missing, now)
+        if len(missing) < len(due["macro"]):
+            recovered.append("macro")
+    markets = {s: items for s, items in due.items() if s != "macro"}
+    if markets:
+        ok = _store_prices([t for items in markets.values() for t in items])
+        for g, items in markets.items():
+            store.record(g, items, [t for t in items if t not in ok], now)
+            if any(t in ok for t in items):
+                recovered.append(g)
+    return sorted(recovered)
+
+
+def _macro_block(macro_in: dict[str, dict[str, Any]], now: datetime, params: RuleParams = DEFAULT_PARAMS) -> dict[str, Any]:
+    """
+    Macro part of the payload (dailySignal, macroSwitches, macroDataStatus, regimeHistory) plus the regime,
+    label, drivers and full regime history the asset / weekly parts read.
+    """
+    hy, real10y, dxy, pmi, core_cpi = (macro_in[k] for k in ("HY", "REAL10Y", "DXY", "PMI", "CORE_CPI"))
+
+    # Empirical percentile vs each series' own trailing history (None -> fixed bands in scoring)
+    for mid, m in macro_in.items():
+        freq = "M" if mid in ("PMI", "CORE_CPI") else "D"
+        m["percentile"] = MACRO_RANKS.percentile(mid, m.get("history") or [], m.get("value"), freq)
 
     dxy_price = dxy.get("value")
     dxy_chg = dxy.get("change1m")
 
     risk_val, risk_confidence, missing_macros = scoring.risk_score(hy, real10y, dxy, pmi, core_cpi)
-    reg_letter, reg_label = compute_regime(hy, real10y, pmi, core_cpi, dxy, risk_val)
+    reg_letter, reg_label = compute_regime(hy, real10y, pmi, core_cpi, dxy, risk_val, params)
 
     drivers = []
     if hy.get("change1m") is not None and hy["change1m"] < 0:
@@ -159,7 +424,6 @@ def build_payload() -> dict[str, Any]:
     if not drivers:
         drivers.append("数据更新中")
 
-    now = datetime.now(timezone.utc)
     date_str = now.strftime("%Y-%m-%d")
     data_as_of = now.strftime("%Y-%m-%d %H:%M UTC")
 
@@ -177,11 +441,12 @@ def build_payload() -> dict[str, Any]:
         "dataAsOf": data_as_of,
     }
 
-    def _macro_row(mid: str, name: str, val: Any, ch7: Any, ch1m: Any, fresh: Any, freq: str) -> dict[str, Any]:
+    def _macro_row(mid: str, name: str, val: Any, ch7: Any, ch1m: Any, fresh: Any, freq: str, pct: float | None = None) -> dict[str, Any]:
         # 宁可 null + 原因，不要 0 + 正常灯号
-        pct = 50.0
-        if val is not None and mid == "PMI":
-            pct = max(0, min(100, (val - 35) / 30 * 100))
+        if pct is None:
+            pct = 50.0
+            if val is not None and mid == "PMI":
+                pct = max(0, min(100, (val - 35) / 30 * 100))
         light = _pct_to_light(pct) if mid != "PMI" else _pct_to_light(100 - pct)
         return {
             "id": mid,
@@ -196,89 +461,106 @@ def build_payload() -> dict[str, Any]:
         }
 
     macro_switches = [
-        _macro_row("HY_SPREAD", "HY Credit Spread", hy.get("value"), hy.get("change7d"), hy.get("change1m"), hy.get("freshness_days") or 999, "D"),
-        _macro_row("REAL10Y", "10Y Real Rate", real10y.get("value"), real10y.get("change7d"), real10y.get("change1m"), real10y.get("freshness_days") or 999, "D"),
-        _macro_row("DXY", "US Dollar Index", dxy_price, dxy.get("change7d"), dxy_chg, dxy.get("freshness_days") or 999, "D"),
-        _macro_row("PMI", "Manufacturing PMI (New Orders proxy)", pmi.get("value"), pmi.get("change7d"), pmi.get("change1m"), pmi.get("freshness_days") or 999, "M"),
-        _macro_row("CORE_INFL", "Core Inflation (YoY %)", core_cpi.get("value"), core_cpi.get("change7d"), core_cpi.get("change1m"), core_cpi.get("freshness_days") or 999, "M"),
+        _macro_row("HY_SPREAD", "HY Credit Spread", hy.get("value"), hy.get("change7d"), hy.get("change1m"), hy.get("freshness_days") or 999, "D", hy["percentile"]),
+        _macro_row("REAL10Y", "10Y Real Rate", real10y.get("value"), real10y.get("change7d"), real10y.get("change1m"), real10y.get("freshness_days") or 999, "D", real10y["percentile"]),
+        _macro_row("DXY", "US Dollar Index", dxy_price, dxy.get("change7d"), dxy_chg, dxy.get("freshness_days") or 999, "D", dxy["percentile"]),
+        _macro_row("PMI", "Manufacturing PMI (New Orders proxy)", pmi.get("value"), pmi.get("change7d"), pmi.get("change1m"), pmi.get("freshness_days") or 999, "M", pmi["percentile"]),
+        _macro_row("CORE_INFL", "Core Inflation (YoY %)", core_cpi.get("value"), core_cpi.get("change7d"), core_cpi.get("change1m"), core_cpi.get("freshness_days") or 999, "M", core_cpi["percentile"]),
     ]
 
-    ohlcv, data_status = _fetch_prices_and_status()
+    # Same scoring / regime rules over every observation date of the histories (percentiles see their own
+    # trailing window); the payload charts the last ~1y, the regime statistics use all of it
+    recent = [int(m["observations"][0]["date"]) for m in (hy, real10y, dxy) if m.get("observations")]
+    full_history = regime_history({mid: m.get("history") or m.get("observations") or [] for mid, m in macro_in.items()}, params)
+    history = slice_history(full_history, min(recent) if recent else None)
+
+    # macroDataStatus: HY, REAL10Y, DXY(fred_dtwexbgs), PMI, CORE_INFL
+    macro_data_status: dict[str, dict[str, Any]] = {}
+    for mid, name, val, fresh, freq in [
+        ("HY_SPREAD", "HY Credit Spread", hy.get("value"), hy.get("freshness_days"), "D"),
+        ("REAL10Y", "10Y Real Rate", real10y.get("value"), real10y.get("freshness_days"), "D"),
+        ("DXY", "US Dollar Index", dxy_price, dxy.get("freshness_days"), "D"),
+        ("PMI", "Manufacturing PMI (proxy)", pmi.get("value"), pmi.get("freshness_days"), "M"),
+        ("CORE_INFL", "Core Inflation (YoY %)", core_cpi.get("value"), core_cpi.get("freshness_days"), "M"),
+    ]:
+        provider = "fred_dtwexbgs" if mid == "DXY" else "fred"
+        macro_data_status[mid] = {
+            "provider": provider,
+            "ok": val is not None,
+            "note": "missing_observation" if val is None else None,
+            "freq": freq,
+            "freshness_days": int(fresh) if fresh is not None else 999,
+        }
+
+    return {
+        "regime": reg_letter,
+        "regimeLabel": reg_label,
+        "drivers": drivers,
+        "fullHistory": full_history,
+        "dailySignal": daily_signal,
+        "macroSwitches": macro_switches,
+        "macroDataStatus": macro_data_status,
+        "regimeHistory": history,
+    }
+
+
+def _asset_block(
+    universe: Universe,
+    store: SectionInputs,
+    memo: FeatureMemo | None,
+    now: datetime,
+    params: RuleParams = DEFAULT_PARAMS,
+) -> dict[str, Any]:
+    """
+    Asset part of the payload from the stored price series and macro state: technicalData, assets,
+    assetSignals, portfolioRisk, riskSimulation, regimeStats, riskAttribution, dataStatus.
+    """
+    macro_in, mb, ohlcv = store.macro, store.macro_block, store.ohlcv
+    real10y, dxy = macro_in["REAL10Y"], macro_in["DXY"]
+    dxy_chg = dxy.get("change1m")
+    date_str = now.strftime("%Y-%m-%d")
+
+    asset_series = {d["id"]: ohlcv.get(d["ticker"]) or [] for d in universe.assets}
+    corr_by_id = corr_engine.asset_correlations(
+        asset_series,
+        {"DXY": dxy.get("observations") or [], "REAL10Y": real10y.get("observations") or [], "SPX": ohlcv.get("SPY") or []},
+    )
+    rs_by_id = rs_engine.relative_strength(
+        asset_series,
+        universe.benchmark_of,
+        {bid: ohlcv.get(t) or [] for bid, t in universe.benchmarks.items()},
+    )
+    features_by_id = _features_by_id(universe.assets, asset_series, memo)
+    vol_by_id = VOL_FORECASTER.forecast({aid: series_arrays(rows, "close")[1] for aid, rows in asset_series.items()})
+    vol_src = vol_source()
     tech_by_id: dict[str, dict[str, Any]] = {}
     assets_out = []
     signals_out = []
+    scenario_rows = []
 
-    for defn in ASSET_DEFS:
+    for defn in universe.assets:
         aid = defn["id"]
-        ticker = defn["ticker"]
-        base = defn["baseMaxWeight"]
-        series = ohlcv.get(ticker) or []
-        tech = feat.compute_all(series) if series else {"ma20": 0, "ma60": 0, "ma200": 0, "mom12w": 0, "vol20Ann": 0, "mdd60": 0, "mdd120": 0, "volPercentile1y": 50, "ddPercentile1y": 50}
-        tech["assetId"] = aid
+        extra = {**(corr_by_id.get(aid) or {}), **(rs_by_id.get(aid) or {}), **(vol_by_id.get(aid) or {})}
+        tech, asset_row, signal, scenario_row = _asset_entry(
+            defn, features_by_id[aid], extra, store.status.get(defn["ticker"]) or {},
+            vol_src, mb["regime"], real10y.get("value"), dxy_chg, date_str, params,
+        )
         tech_by_id[aid] = tech
-
-        ret = _latest_and_returns(series)
-        pr = ret.get("price")
-        ch1d, ch7d, ch30d = ret.get("change1d"), ret.get("change7d"), ret.get("change30d")
-
-        st = data_status.get(ticker) or {}
-        row_count = st.get("row_count", 0)
-        is_proxy = st.get("is_proxy", False)
-        trend_light = _trend_light(series, pr)
-        risk_light = _risk_light(tech.get("volPercentile1y"))
-        if row_count < 220:
-            trend_light = "yellow"
-            risk_light = "yellow"
-        catalyst_light = _catalyst_light(reg_letter, real10y.get("value"), dxy_chg)
-        regime_mult = _regime_mult(reg_letter)
-        risk_mult = _risk_mult(tech.get("volPercentile1y"))
-        suggested = round(min(base, base * regime_mult * risk_mult), 2)
-        action = _action(trend_light, risk_light, catalyst_light, suggested, 0)
-
-        reason_codes = []
-        if row_count < 220:
-            reason_codes.append("INSUFFICIENT_HISTORY")
-        if is_proxy:
-            reason_codes.append("PROXY_USED")
-        if trend_light == "green":
-            reason_codes.append("TREND_UP")
-        if risk_light == "red":
-            reason_codes.append("VOL_HIGH")
-        if reg_letter == "C":
-            reason_codes.append("REGIME_C")
-        if catalyst_light == "green":
-            reason_codes.append("CATALYST_OK")
-        if not reason_codes:
-            reason_codes.append("HOLD")
-        # Fallback: never output 0 for price; use null and mark stale/fallback
-        if st.get("note") == "stale/fallback" and pr is not None and pr == 0:
-            pr = None
-        assets_out.append({
-            "id": aid,
-            "name": defn["name"],
-            "ticker": ticker,
-            "assetType": defn["assetType"],
-            "currency": defn["currency"],
-            "benchmarkId": defn.get("benchmarkId"),
-            "baseMaxWeight": base,
-            "currentWeight": 0.0,
-            "suggestedMaxWeight": suggested,
-            "price": round(pr, 2) if pr is not None else None,
-            "priceChange24h": round(ch1d, 2) if ch1d is not None else None,
-            "priceChange7d": round(ch7d, 2) if ch7d is not None else None,
-            "priceChange30d": round(ch30d, 2) if ch30d is not None else None,
-        })
-        signals_out.append({
-            "assetId": aid,
-            "date": date_str,
-            "trendLight": trend_light,
-            "riskLight": risk_light,
-            "catalystLight": catalyst_light,
-            "suggestedMaxWeight": suggested,
-            "action": action,
-            "reasonCodes": reason_codes,
-            "notes": f"{trend_light}/{risk_light}/{catalyst_light}",
-        })
+        assets_out.append(asset_row)
+        signals_out.append(signal)
+        scenario_rows.append(scenario_row)
+
+    # Portfolio vol of the suggested allocation (shrunk covariance) and the vol-targeted cap per asset
+    portfolio = portfolio_risk(asset_series, {s["assetId"]: s["suggestedMaxWeight"] for s in signals_out})
+    for s in signals_out:
+        cap = ((portfolio.get("assets") or {}).get(s["assetId"]) or {}).get("volTargetMaxWeight")
+        s["volTargetMaxWeight"] = s["suggestedMaxWeight"] if cap is None else cap
+    # Block-bootstrap drawdown / VaR of the same allocation (SIMULATION=0 skips the stage)
+    simulation = (
+        simulate_allocation(asset_series, {s["assetId"]: s["suggestedMaxWeight"] for s in signals_out})
+        if simulation_enabled()
+        else None
+    )
 
     # Do not fill 0 for missing price: leave null and dataStatus explains
     for a in assets_out:
@@ -291,14 +573,14 @@ def build_payload() -> dict[str, Any]:
 
     # dataStatus: per-ticker observability (mapped_symbol, last_obs_date, asof_ts, is_proxy, proxy_for, stale_policy, price_adjusted)
     data_status_out = {}
-    for ticker, st in data_status.items():
+    for ticker, st in store.status.items():
         data_status_out[ticker] = {
             "provider": st.get("provider", "unknown"),
             "freshness_days": st.get("freshness_days", 999),
             "ok": st.get("ok", False),
             "note": st.get("note"),
-            "last_date": st.get("last_date"),
-            "last_obs_date": st.get("last_obs_date") or st.get("last_date"),
+            "last_date": day_str(st.get("last_date")),
+            "last_obs_date": day_str(st.get("last_obs_date") or st.get("last_date")),
             "row_count": st.get("row_count", 0),
             "error_reason": st.get("error_reason"),
             "mapped_symbol": st.get("mapped_symbol"),
@@ -309,60 +591,159 @@ def build_payload() -> dict[str, Any]:
             "price_adjusted": st.get("price_adjusted"),
         }
 
-    # macroDataStatus: HY, REAL10Y, DXY(fred_dtwexbgs), PMI, CORE_INFL
-    macro_data_status: dict[str, dict[str, Any]] = {}
-    for mid, name, val, fresh, freq in [
-        ("HY_SPREAD", "HY Credit Spread", hy.get("value"), hy.get("freshness_days"), "D"),
-        ("REAL10Y", "10Y Real Rate", real10y.get("value"), real10y.get("freshness_days"), "D"),
-        ("DXY", "US Dollar Index", dxy_price, dxy.get("freshness_days"), "D"),
-        ("PMI", "Manufacturing PMI (proxy)", pmi.get("value"), pmi.get("freshness_days"), "M"),
-        ("CORE_INFL", "Core Inflation (YoY %)", core_cpi.get("value"), core_cpi.get("freshness_days"), "M"),
-    ]:
-        provider = "fred_dtwexbgs" if mid == "DXY" else "fred"
-        macro_data_status[mid] = {
-            "provider": provider,
-            "ok": val is not None,
-            "note": "missing_observation" if val is None else None,
-            "freq": freq,
-            "freshness_days": int(fresh) if fresh is not None else 999,
-        }
-
-    # weeklyKondratieff: ADI/CI 缺关键输入（铜/链）时置 null，reason CHAIN_INPUT_MISSING
-    copper_series = ohlcv.get("HG=F") or []
-    chain_ok = len(copper_series) >= 25
-    if not chain_ok:
-        weekly_adi = None
-        weekly_ci = None
-        chain_reason = "CHAIN_INPUT_MISSING"
-    else:
-        weekly_adi = daily_signal["aiDiffusionIndex"]
-        weekly_ci = daily_signal["constraintIndex"]
-        chain_reason = None
-    weekly_components = {"soxRatio": 1.0, "nvdaRatio": 1.0, "utilityRatio": 1.0, "copperMomentum": 0.0, "energyPrice": 0.0}
-    if copper_series and len(copper_series) >= 25:
-        cur = copper_series[-1]["close"]
-        prev = copper_series[-25]["close"]
-        if prev and prev != 0:
-            weekly_components["copperMomentum"] = round((cur / prev - 1) * 100, 4)
+    # Inputs of this build for /api/scenario (what-if reruns without fetching)
+    scenario_inputs = scenario.inputs_from_build(
+        now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        macro_in,
+        {mid: MACRO_RANKS.get(mid).sorted_values() for mid, m in macro_in.items() if m["percentile"] is not None},
+        scenario_rows,
+    )
+    scenario.remember(scenario_inputs)
 
     return {
-        "version": "0.1.0",
-        "generatedAt": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
-        "dailySignal": daily_signal,
-        "macroSwitches": macro_switches,
-        "macroDataStatus": macro_data_status,
+        "riskAttribution": risk_attribution(scenario_inputs, params),
+        "regimeStats": regime_stats(mb["fullHistory"], asset_series),
         "assets": assets_out,
         "assetSignals": signals_out,
+        "portfolioRisk": portfolio,
+        "riskSimulation": simulation,
         "dataStatus": data_status_out,
-        "weeklyKondratieff": {
-            "date": date_str,
-            "aiDiffusionIndex": weekly_adi,
-            "constraintIndex": weekly_ci,
-            "phase": "transition",
-            "strategy": f"Regime {reg_label}; " + "; ".join(drivers[:3]) + ("; " + chain_reason if chain_reason else ""),
-            "components": weekly_components,
-            "chainInputMissing": chain_reason,
-        },
         "technicalData": tech_by_id,
+    }
+
+
+def _weekly_block(universe: Universe, mb: dict[str, Any], now: datetime) -> dict[str, Any]:
+    """weeklyKondratieff: chain indices from weekly bars (compute.kondratieff); ADI/CI 缺关键输入时置 null，reason CHAIN_INPUT_MISSING."""
+    chain = weekly_chain(universe.chain)
+    weekly_adi = chain["aiDiffusionIndex"]
+    weekly_ci = chain["constraintIndex"]
+    chain_reason = "CHAIN_INPUT_MISSING" if weekly_adi is None or weekly_ci is None else None
+    # Neutral values (ratio 1, momentum 0) for components without data; missingInputs names the roles
+    weekly_components = {"soxRatio": 1.0, "nvdaRatio": 1.0, "utilityRatio": 1.0, "copperMomentum": 0.0, "energyPrice": 0.0}
+    weekly_components.update({k: v for k, v in chain["components"].items() if v is not None})
+    drivers = mb["drivers"]
+    return {
+        "date": now.strftime("%Y-%m-%d"),
+        "aiDiffusionIndex": weekly_adi,
+        "constraintIndex": weekly_ci,
+        "weekEnding": chain["asOf"],
+        "phase": chain["phase"],
+        "strategy": f"Regime {mb['regimeLabel']}; " + "; ".join(drivers[:3]) + ("; " + chain_reason if chain_reason else ""),
+        "components": weekly_components,
+        "chainInputMissing": chain_reason,
+        "missingInputs": chain["missing"],
+        "history": chain["history"],
+    }
+
+
+def merge_sections(
+    prev: dict[str, Any] | None,
+    sections: Iterable[str],
+    memo: FeatureMemo | None = None,
+    params: RuleParams = DEFAULT_PARAMS,
+) -> dict[str, Any]:
+    """
+    Payload from SECTION_INPUTS after `sections` were refreshed. Only the parts depending on them
+    (compute.sections.DEPENDENTS) are recomputed and swapped into prev; without prev, or when the universe's
+    assets changed since prev, every part is.
+    """
+    universe = load_universe()
+    store = SECTION_INPUTS
+    now = datetime.now(timezone.utc)
+    same_assets = prev is not None and [a.get("id") for a in prev.get("assets") or []] == [d["id"] for d in universe.assets]
+    parts = parts_of(sections) if same_assets and store.macro_block else set(PARTS)
+    out = dict(prev or {})
+
+    if "macro" in parts:
+        store.macro_block = _macro_block(store.macro, now, params)
+        out.update({k: store.macro_block[k] for k in ("macroSwitches", "macroDataStatus", "regimeHistory")})
+    if "assets" in parts:
+        out.update(_asset_block(universe, store, memo, now, params))
+    if "weekly" in parts:
+        out["weeklyKondratieff"] = _weekly_block(universe, store.macro_block, now)
+    # The weekly chain's indices replace the macro proxies in dailySignal when every input is there
+    daily_signal = dict(store.macro_block["dailySignal"])
+    weekly = out["weeklyKondratieff"]
+    if weekly["chainInputMissing"] is None:
+        daily_signal["aiDiffusionIndex"] = weekly["aiDiffusionIndex"]
+        daily_signal["constraintIndex"] = weekly["constraintIndex"]
+
+    payload = {
+        "version": "0.1.0",
+        "generatedAt": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "dailySignal": daily_signal,
+        **{k: out[k] for k in PAYLOAD_PARTS},
         "priceHistory": {},
     }
+    payload.update({k: v for k, v in out.items() if k not in payload})
+    payload["sections"] = store.refreshed_iso()
+    return payload
+
+
+def build_payload(memo: FeatureMemo | None = None, params: RuleParams = DEFAULT_PARAMS) -> dict[str, Any]:
+    """
+    memo: optional FeatureMemo; assets whose series fingerprint is unchanged skip feature computation.
+    params: rule thresholds (RuleParams); defaults are the production rules.
+    Fetches every section (btc comes from the intraday job) and computes every part.
+    """
+    fetch_sections([s for s in SECTIONS if s != "btc"])
+    return merge_sections(None, SECTIONS, memo, params)
+
+
+def refresh_intraday(
+    payload: dict[str, Any],
+    rows: dict[str, list[dict[str, Any]]],
+    memo: FeatureMemo | None = None,
+    params: RuleParams = DEFAULT_PARAMS,
+) -> dict[str, Any]:
+    """
+    btc section: daily series folded from intraday klines replace the stored ones of their tickers, and only
+    those assets' technicalData / assets / assetSignals entries and scenario rows are recomputed. Macro state,
+    cross-asset fields (correlations, relative strength, vol forecasts) and the cross-sectional parts
+    (portfolioRisk, riskSimulation, regimeStats, riskAttribution) stay as of the last crypto refresh;
+    volTargetMaxWeight reuses its portfolio scale.
+    """
+    store = SECTION_INPUTS
+    now = datetime.now(timezone.utc)
+    store.ohlcv.update(rows)
+    store.mark(["btc"], now)
+    if not store.macro_block or not payload.get("assets"):
+        return merge_sections(payload, ["btc"], memo, params)
+    defs = tuple(d for d in load_universe().assets if d["ticker"] in rows)
+    features_by_id = _features_by_id(defs, {d["id"]: rows[d["ticker"]] for d in defs}, memo)
+    real10y, dxy = store.macro["REAL10Y"], store.macro["DXY"]
+    portfolio = payload.get("portfolioRisk") or {}
+    inputs = scenario.last_inputs()
+    tech_by_id = dict(payload.get("technicalData") or {})
+    assets_by_id = {a.get("id"): a for a in payload["assets"]}
+    signals_by_id = {s.get("assetId"): s for s in payload.get("assetSignals") or []}
+
+    for defn in defs:
+        aid = defn["id"]
+        af = features_by_id[aid]
+        prev = tech_by_id.get(aid) or {}
+        extra = {k: v for k, v in prev.items() if k not in af["tech"] and k != "assetId"}
+        tech, asset_row, signal, scenario_row = _asset_entry(
+            defn, af, extra, store.status.get(defn["ticker"]) or {},
+            vol_source(), store.macro_block["regime"], real10y.get("value"), dxy.get("change1m"),
+            now.strftime("%Y-%m-%d"), params,
+        )
+        used = ((portfolio.get("assets") or {}).get(aid) or {}).get("vol") is not None
+        suggested = signal["suggestedMaxWeight"]
+        signal["volTargetMaxWeight"] = round(suggested * portfolio["scale"], 4) if used and "scale" in portfolio else suggested
+        tech_by_id[aid], assets_by_id[aid], signals_by_id[aid] = tech, asset_row, signal
+        # Keep /api/scenario in step with the refreshed asset
+        if inputs is not None and aid in inputs.asset_ids:
+            j = inputs.asset_ids.index(aid)
+            cols = {f: list(getattr(inputs, f)) for f in ("trend", "risk", "row_count", "vol_pct")}
+            cols["trend"][j], cols["risk"][j], cols["row_count"][j], cols["vol_pct"][j] = scenario_row[2:]
+            inputs = replace(inputs, **cols)
+            scenario.remember(inputs)
+
+    out = dict(payload)
+    out["generatedAt"] = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+    out["technicalData"] = tech_by_id
+    out["assets"] = [assets_by_id[a.get("id")] for a in payload["assets"]]
+    out["assetSignals"] = [signals_by_id[s.get("assetId")] for s in payload.get("assetSignals") or []]
+    out["sections"] = store.refreshed_iso()
+    return out
@@ -0,0 +1,148 @@
+"""
+Rolling cross-asset correlations: asset returns vs DXY, 10Y real rate and SPX.
+All series are aligned (as-of, last value carried forward) on one shared business-day
+calendar; correlations for the whole universe come out of a single cumulative-sum pass.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from ..align import asof_join, series_arrays, union_calendar
+
+CORR_WINDOW = 60
+MIN_OBS = 20
+
+# factor id -> (technicalData field, return kind). Rates use first differences, prices pct returns.
+FACTORS: dict[str, tuple[str, str]] = {
+    "DXY": ("correlationDXY", "pct"),
+    "REAL10Y": ("correlationRealRate", "diff"),
+    "SPX": ("correlationSPX", "pct"),
+}
+
+
+@dataclass(frozen=True)
+class ReturnPanel:
+    """Daily returns of many series on one calendar: returns[t, j] is column ids[j] on day index dates[t]."""
+
+    dates: np.ndarray
+    ids: tuple[str, ...]
+    returns: np.ndarray
+
+    def columns(self, ids: list[str] | tuple[str, ...]) -> np.ndarray:
+        pos = {k: i for i, k in enumerate(self.ids)}
+        out = np.full((len(self.dates), len(ids)), np.nan)
+        for j, k in enumerate(ids):
+            if k in pos:
+                out[:, j] = self.returns[:, pos[k]]
+        return out
+
+
+_PANEL_CACHE: dict[tuple, ReturnPanel] = {}
+_PANEL_CACHE_MAX = 4
+
+
+def _panel_key(levels: dict[str, tuple[list[dict[str, Any]], str, str]]) -> tuple:
+    key = []
+    for sid, (rows, field, kind) in sorted(levels.items()):
+        last = rows[-1] if rows else {}
+        key.append((sid, field, kind, len(rows), last.get("date"), last.get(field)))
+    return tuple(key)
+
+
+def build_return_panel(levels: dict[str, tuple[list[dict[str, Any]], str, str]]) -> ReturnPanel:
+    """
+    levels: {series_id: (rows, value_field, kind)}, kind "pct" (price) or "diff" (rate level).
+    Cached on (id, length, last date, last value) so repeated builds reuse the aligned matrix.
+    """
+    key = _panel_key(levels)
+    hit = _PANEL_CACHE.get(key)
+    if hit is not None:
+        return hit
+
+    ids = tuple(levels)
+    pts = [series_arrays(rows, field) for rows, field, _ in levels.values()]
+    # Weekend crypto moves fold into Monday's return on the business-day calendar
+    cal = union_calendar([d for d, _ in pts], weekdays_only=True)
+    lv = np.column_stack([asof_join(cal, d, v) for d, v in pts]) if ids else np.empty((len(cal), 0))
+    rets = np.full(lv.shape, np.nan)
+    if len(cal) > 1:
+        prev, cur = lv[:-1], lv[1:]
+        kinds = np.array([kind == "pct" for _, _, kind in levels.values()])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = np.where(prev != 0, cur / prev - 1, np.nan)
+        rets[1:] = np.where(kinds, pct, cur - prev)
+    panel = ReturnPanel(dates=cal, ids=ids, returns=rets)
+
+    if len(_PANEL_CACHE) >= _PANEL_CACHE_MAX:
+        _PANEL_CACHE.pop(next(iter(_PANEL_CACHE)))
+    _PANEL_CACHE[key] = panel
+    return panel
+
+
+def _window_sum(a: np.ndarray, window: int) -> np.ndarray:
+    c = np.cumsum(a, axis=0)
+    c[window:] = c[window:] - c[:-window]
+    return c
+
+
+def rolling_corr(x: np.ndarray, f: np.ndarray, window: int = CORR_WINDOW, min_obs: int = MIN_OBS) -> np.ndarray:
+    """
+    Rolling Pearson correlation of every column of x (T, N) with every column of f (T, K).
+    Returns (T, N, K); pairwise NaN handling, NaN where fewer than min_obs joint observations.
+    """
+    valid = ~np.isnan(x)[:, :, None] & ~np.isnan(f)[:, None, :]
+    xv = np.where(valid, np.nan_to_num(x)[:, :, None], 0.0)
+    fv = np.where(valid, np.nan_to_num(f)[:, None, :], 0.0)
+    n = _window_sum(valid.astype(float), window)
+    sx, sf = _window_sum(xv, window), _window_sum(fv, window)
+    sxx, sff, sxf = _window_sum(xv * xv, window), _window_sum(fv * fv, window), _window_sum(xv * fv, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxf - sx * sf / n
+        var_x = sxx - sx * sx / n
+        var_f = sff - sf * sf / n
+        corr = cov / np.sqrt(var_x * var_f)
+    bad = (n < min_obs) | (var_x <= 1e-18) | (var_f <= 1e-18)
+    corr[bad] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def asset_correlations(
+    asset_series: dict[str, list[dict[str, Any]]],
+    factor_series: dict[str, list[dict[str, Any]]],
+    window: int = CORR_WINDOW,
+) -> dict[str, dict[str, float]]:
+    """
+    asset_series: {asset_id: ohlcv rows}; factor_series: {"DXY"|"REAL10Y": FRED obs, "SPX": ohlcv rows}.
+    Returns {asset_id: {"correlationDXY": x, ...}} with only the fields that could be computed.
+    """
+    levels: dict[str, tuple[list[dict[str, Any]], str, str]] = {}
+    for aid, rows in asset_series.items():
+        levels[f"asset:{aid}"] = (rows or [], "close", "pct")
+    fids = [fid for fid in FACTORS if factor_series.get(fid)]
+    for fid in fids:
+        rows = factor_series[fid]
+        field = "close" if rows and "close" in rows[0] else "value"
+        levels[f"factor:{fid}"] = (rows, field, FACTORS[fid][1])
+    if not asset_series or not fids:
+        return {}
+
+    panel = build_return_panel(levels)
+    aids = list(asset_series)
+    x = panel.columns([f"asset:{a}" for a in aids])
+    f = panel.columns([f"factor:{k}" for k in fids])
+    if len(panel.dates) < 2:
+        return {}
+    latest = rolling_corr(x, f, window)[-1]
+
+    out: dict[str, dict[str, float]] = {}
+    for i, aid in enumerate(aids):
+        row = {}
+        for k, fid in enumerate(fids):
+            v = latest[i, k]
+            if not np.isnan(v):
+                row[FACTORS[fid][0]] = round(float(v), 3)
+        out[aid] = row
+    return out
@@ -1,13 +1,25 @@
 """
 Technical features: ma20/60/200, 12w momentum, vol20 ann, mdd60/120, percentile.
+Series rows: {"date": epoch day (int), "close": float, ...}.
+compute_all handles one series; compute_batch computes the same fields for a whole universe at once.
+mom12w is the change over MOM_WEEKS weekly bars (compute.resample; the last bar is the week to date).
 """
 from __future__ import annotations
 
 import math
 from typing import Any
 
+import numpy as np
 
-def _closes(series: list[dict[str, Any]]) -> list[tuple[str, float]]:
+from ..align import series_arrays
+from .resample import period_bounds, period_return, resample_rows
+
+# Longest lookback any feature needs (percentile over 252 observations)
+BATCH_DEPTH = 252
+MOM_WEEKS = 12
+
+
+def _closes(series: list[dict[str, Any]]) -> list[tuple[int, float]]:
     out = []
     for r in series:
         c = r.get("close")
@@ -73,7 +85,7 @@ def compute_all(series: list[dict[str, Any]], current_price: float | None = None
         "ma20": ma(series, 20),
         "ma60": ma(series, 60),
         "ma200": ma(series, 200),
-        "mom12w": None,
+        "mom12w": period_return(resample_rows(series, "W"), MOM_WEEKS),
         "vol20Ann": _vol_ann(series, 20),
         "mdd60": _mdd(series, 60),
         "mdd120": _mdd(series, 120),
@@ -84,11 +96,91 @@ def compute_all(series: list[dict[str, Any]], current_price: float | None = None
         "correlationRealRate": 0.0,
         "correlationSPX": 0.0,
     }
-    if len(pts) >= 84:
-        mom = (pts[-1][1] / pts[-(84 + 1)][1] - 1) * 100
-        out["mom12w"] = mom
     if current_price is not None and series:
         pct = _percentile_252(series, current_price)
         if pct is not None:
             out["volPercentile1y"] = pct
     return out
+
+
+def _close_matrix(closes_list: list[np.ndarray], depth: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Last `depth` closes of each series, right-aligned by observation (not by date): column j, row -1 is
+    series j's latest close. Shorter series are NaN-padded at the top. Returns (matrix (depth, N), counts).
+    """
+    mat = np.full((depth, len(closes_list)), np.nan)
+    counts = np.zeros(len(closes_list), dtype=np.int64)
+    for j, closes in enumerate(closes_list):
+        closes = closes[-depth:]
+        counts[j] = len(closes)
+        if len(closes):
+            mat[depth - len(closes):, j] = closes
+    return mat, counts
+
+
+def _batch_mdd(mat: np.ndarray, counts: np.ndarray, window: int) -> np.ndarray:
+    win = mat[-window:]
+    peak = np.fmax.accumulate(win, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = np.where(peak > 0, (peak - win) / peak * 100, np.nan)
+    out = np.fmax(np.nanmax(np.where(np.isnan(dd), -np.inf, dd), axis=0), 0.0)
+    return np.where(counts >= 2, out, np.nan)
+
+
+def _weekly_closes(arrays: list[tuple[np.ndarray, np.ndarray]], depth: int) -> tuple[np.ndarray, np.ndarray]:
+    """Last `depth` weekly-bar closes of each (days, closes), right-aligned as in _close_matrix."""
+    return _close_matrix([c[period_bounds(d, "W")[2]] if len(d) else c for d, c in arrays], depth)
+
+
+def compute_batch(series_list: list[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    """compute_all for many series in one vectorized pass; element i matches compute_all(series_list[i])."""
+    return compute_batch_arrays([series_arrays(s or [], "close") for s in series_list])
+
+
+def compute_batch_arrays(arrays: list[tuple[np.ndarray, np.ndarray]]) -> list[dict[str, Any]]:
+    """compute_batch on (days, closes) from series_arrays (the compact form shipped to worker processes)."""
+    if not arrays:
+        return []
+    closes_list = [c for _, c in arrays]
+    mat, n = _close_matrix(closes_list, BATCH_DEPTH)
+    last = mat[-1]
+    wk, n_wk = _weekly_closes(arrays, MOM_WEEKS + 1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mas = {w: np.where(n >= w, mat[-w:].mean(axis=0), np.nan) for w in (20, 60, 200)}
+        mom = np.where((n_wk > MOM_WEEKS) & (wk[0] != 0), (wk[-1] / wk[0] - 1) * 100, np.nan)
+
+        prev, cur = mat[-21:-1], mat[-20:]
+        rets = np.where((prev != 0) & ~np.isnan(prev), (cur - prev) / prev, np.nan)
+        n_rets = np.sum(~np.isnan(rets), axis=0)
+        mean_r = np.nansum(rets, axis=0) / n_rets
+        var = np.nansum((rets - mean_r) ** 2, axis=0) / n_rets
+        vol = np.where((n >= 21) & (n_rets > 0), np.sqrt(var * 252) * 100, np.nan)
+
+        n_pct = np.sum(~np.isnan(mat), axis=0)
+        pct = np.where(n_pct > 0, np.sum(mat <= last, axis=0) / n_pct * 100, np.nan)
+
+    mdd60 = _batch_mdd(mat, n, 60)
+    mdd120 = _batch_mdd(mat, n, 120)
+
+    def _f(v: float) -> float | None:
+        return None if np.isnan(v) else float(v)
+
+    out = []
+    for j in range(len(closes_list)):
+        out.append({
+            "ma20": _f(mas[20][j]),
+            "ma60": _f(mas[60][j]),
+            "ma200": _f(mas[200][j]),
+            "mom12w": _f(mom[j]),
+            "vol20Ann": _f(vol[j]),
+            "mdd60": _f(mdd60[j]),
+            "mdd120": _f(mdd120[j]),
+            "volPercentile1y": float(pct[j]) if n[j] and not np.isnan(pct[j]) else 50.0,
+            "ddPercentile1y": 50.0,
+            "rsToBenchmark": 1.0,
+            "correlationDXY": 0.0,
+            "correlationRealRate": 0.0,
+            "correlationSPX": 0.0,
+        })
+    return out
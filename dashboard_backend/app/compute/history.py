@@ -0,0 +1,67 @@
+"""
+RiskScore / confidence / regime for every date of the macro history (vectorized scoring + regime rules).
+Calendar: weekdays on which any daily macro series (HY, REAL10Y, DXY) has an observation.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+import numpy as np
+
+from ..align import day_str, series_arrays, union_calendar
+from .backtest import macro_frame, macro_pcts
+from .params import DEFAULT_PARAMS, RuleParams
+from .regime import regime_array
+from .scoring import risk_score_array
+
+DAILY_MACROS = ("HY", "REAL10Y", "DXY")
+
+
+def regime_history(
+    macro: dict[str, list[dict[str, Any]]],
+    params: RuleParams = DEFAULT_PARAMS,
+    release_lag: bool = False,
+    start_day: int | None = None,
+) -> dict[str, Any]:
+    """
+    macro: {"HY", "REAL10Y", "DXY", "CORE_CPI", "PMI": rows} (fred.get_macro_history shape).
+    Returns columns {"dates", "riskScore", "riskScoreConfidence", "regime"} plus "transitions"
+    [{"date", "from", "to"}]. release_lag=True shifts monthly rows to their approximate release day.
+    """
+    cal = union_calendar([series_arrays(macro.get(mid) or [], "value")[0] for mid in DAILY_MACROS], weekdays_only=True)
+    if start_day is not None:
+        cal = cal[cal >= start_day]
+    if not len(cal):
+        return {"dates": [], "riskScore": [], "riskScoreConfidence": [], "regime": [], "transitions": []}
+
+    m = macro_frame(cal, macro, release_lag=release_lag)
+    score, confidence = risk_score_array(m["HY"], m["REAL10Y"], m["DXY"], m["PMI"], m["CORE_CPI"], macro_pcts(m))
+    letters = regime_array(
+        m["HY"], m["HY_chg"], m["REAL10Y"], m["REAL10Y_chg"], m["PMI"], m["CORE_CPI"], score, params
+    )
+    switch = np.flatnonzero(letters[1:] != letters[:-1]) + 1
+    dates = [day_str(d) for d in cal]
+    return {
+        "dates": dates,
+        "riskScore": [round(float(x), 1) for x in score],
+        "riskScoreConfidence": [round(float(x), 2) for x in confidence],
+        "regime": letters.tolist(),
+        "transitions": [{"date": dates[i], "from": str(letters[i - 1]), "to": str(letters[i])} for i in switch],
+    }
+
+
+def slice_history(history: dict[str, Any], start_day: int | None) -> dict[str, Any]:
+    """
+    The block regime_history(..., start_day=start_day) returns, cut from a full-calendar history
+    (per-date values do not depend on where the calendar starts).
+    """
+    if start_day is None:
+        return history
+    dates = history["dates"]
+    i = bisect_left(dates, day_str(start_day))
+    first = dates[i] if i < len(dates) else None
+    return {
+        **{k: history[k][i:] for k in ("dates", "riskScore", "riskScoreConfidence", "regime")},
+        "transitions": [t for t in history["transitions"] if first is not None and t["date"] > first],
+    }
@@ -0,0 +1,160 @@
+"""
+Intraday BTC: klines pulled incrementally (startTime = open time of the newest stored candle, so the
+still-open candle is refetched and overwritten) into a fixed-size numpy ring buffer. The buffer is folded
+into UTC daily bars that replace the matching days of the last build's daily series; the scheduler's
+intraday job then merges them as the btc section of dashboard.json (builder.refresh_intraday).
+
+BTC_INTRADAY=1 enables the job; BTC_INTRADAY_INTERVAL (default 1h), BTC_INTRADAY_BARS (ring size) and
+BTC_INTRADAY_MINUTES (refresh period) tune it.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..align import MS_PER_DAY, day_str
+from ..io.write_json import write_json_atomic
+from ..providers import binance as binance_prov
+
+INTRADAY_INTERVAL = os.environ.get("BTC_INTRADAY_INTERVAL", "1h")
+INTRADAY_BARS = int(os.environ.get("BTC_INTRADAY_BARS", str(24 * 120)))
+INTRADAY_MINUTES = int(os.environ.get("BTC_INTRADAY_MINUTES", "5"))
+# Universe ticker -> exchange symbol of the assets refreshed intraday
+INTRADAY_SYMBOLS = {"BTC-USD": "BTCUSDT"}
+
+
+def intraday_enabled() -> bool:
+    return os.environ.get("BTC_INTRADAY", "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+class KlineRing:
+    """Last `capacity` klines [open ms, open, high, low, close, volume] in a circular (capacity, 6) array."""
+
+    def __init__(self, capacity: int = INTRADAY_BARS, interval: str = INTRADAY_INTERVAL) -> None:
+        self.capacity = capacity
+        self.interval = interval
+        self.buf = np.zeros((capacity, 6))
+        self.start = 0  # slot of the oldest kline
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def last_open_ms(self) -> int | None:
+        return int(self.buf[(self.start + self.count - 1) % self.capacity, 0]) if self.count else None
+
+    def view(self) -> np.ndarray:
+        """(count, 6) klines oldest first (a copy)."""
+        idx = (self.start + np.arange(self.count)) % self.capacity
+        return self.buf[idx]
+
+    def append(self, rows: np.ndarray) -> int:
+        """
+        Add klines sorted by open time: the one matching the newest stored candle overwrites it, older ones are
+        ignored, the rest go in after it (dropping the oldest once full). Returns how many slots were written.
+        """
+        if not len(rows):
+            return 0
+        last = self.last_open_ms
+        written = 0
+        if last is not None:
+            same = rows[:, 0] == last
+            if same.any():
+                self.buf[(self.start + self.count - 1) % self.capacity] = rows[same][-1]
+                written = 1
+            rows = rows[rows[:, 0] > last]
+        rows = rows[-self.capacity:]
+        k = len(rows)
+        if k:
+            slots = (self.start + self.count + np.arange(k)) % self.capacity
+            self.buf[slots] = rows
+            overflow = max(self.count + k - self.capacity, 0)
+            self.start = (self.start + overflow) % self.capacity
+            self.count = min(self.count + k, self.capacity)
+        return written + k
+
+    @classmethod
+    def load(cls, path: Path, capacity: int = INTRADAY_BARS, interval: str = INTRADAY_INTERVAL) -> "KlineRing":
+        ring = cls(capacity, interval)
+        try:
+            doc = json.loads(path.read_text(encoding="utf-8"))
+            if doc.get("interval") == interval:
+                ring.append(np.asarray(doc.get("rows") or [], dtype=float).reshape(-1, 6))
+        except (FileNotFoundError, ValueError, AttributeError, TypeError):
+            pass
+        return ring
+
+    def save(self, path: Path) -> None:
+        write_json_atomic(path, {"interval": self.interval, "rows": self.view().tolist()})
+
+
+# Process-wide buffer used by the scheduler's intraday job
+BTC_RING = KlineRing()
+# Daily rows of the intraday tickers from the last build (the base the ring is folded into)
+_DAILY: dict[str, list[dict[str, Any]]] = {}
+
+
+def remember_daily(ohlcv: dict[str, list[dict[str, Any]]]) -> None:
+    for ticker in INTRADAY_SYMBOLS:
+        if ohlcv.get(ticker):
+            _DAILY[ticker] = ohlcv[ticker]
+
+
+def fetch_new(ring: KlineRing, symbol: str = "BTCUSDT", now_ms: int | None = None) -> int:
+    """Pull klines from the newest stored candle on (or the last ring-capacity worth when empty)."""
+    step = binance_prov.INTERVAL_MS[ring.interval]
+    start = ring.last_open_ms
+    if start is None:
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        start = now_ms - ring.capacity * step
+    return ring.append(binance_prov.fetch_klines(symbol, ring.interval, start_ms=start))
+
+
+def daily_from_klines(k: np.ndarray, interval_ms: int) -> list[dict[str, Any]]:
+    """
+    UTC daily OHLCV rows from klines; a first day the buffer only covers from mid-day is left out
+    (the last day is today so far).
+    """
+    if not len(k):
+        return []
+    day = (k[:, 0] // MS_PER_DAY).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]])
+    ends = np.r_[starts[1:], len(day)] - 1
+    o = k[starts, 1]
+    h = np.maximum.reduceat(k[:, 2], starts)
+    l = np.minimum.reduceat(k[:, 3], starts)
+    c = k[ends, 4]
+    v = np.add.reduceat(k[:, 5], starts)
+    first_full = 0 if k[0, 0] % MS_PER_DAY < interval_ms else 1
+    return [
+        {"date": int(day[s]), "open": float(o[i]), "high": float(h[i]), "low": float(l[i]), "close": float(c[i]), "volume": int(v[i])}
+        for i, s in enumerate(starts)
+        if i >= first_full
+    ]
+
+
+def merged_daily(ticker: str, ring: KlineRing) -> list[dict[str, Any]]:
+    """Last build's daily rows with every day the ring covers replaced by the ring's bars."""
+    intraday = daily_from_klines(ring.view(), binance_prov.INTERVAL_MS[ring.interval])
+    base = _DAILY.get(ticker) or []
+    if not intraday:
+        return list(base)
+    first = intraday[0]["date"]
+    return [r for r in base if r["date"] < first] + intraday
+
+
+def status(ring: KlineRing) -> dict[str, Any]:
+    last = ring.last_open_ms
+    return {
+        "interval": ring.interval,
+        "bars": len(ring),
+        "capacity": ring.capacity,
+        "lastOpen": None if last is None else time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(last / 1000)),
+        "firstDay": day_str(int(ring.view()[0, 0] // MS_PER_DAY)) if len(ring) else None,
+    }
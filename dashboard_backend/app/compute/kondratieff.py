@@ -0,0 +1,148 @@
+"""
+Weekly Kondratieff chain from fetched prices (tickers by role: universe.chain).
+
+    soxRatio / nvdaRatio / utilityRatio: SMH / SPY, NVDA / SPY, XLU / SPY vs their own 52-week mean (1 = on trend)
+    copperMomentum: copper % change over COPPER_MOM_WEEKS (~25 trading days); energyPrice: last USO close
+    aiDiffusionIndex: mean percentile (own trailing RANK_WEEKS) of the 13-week log change of SMH / SPY, NVDA / SPY
+    constraintIndex: same over copper, USO and XLU / SPY (power / materials constraints)
+
+Reads the weekly bars of compute.resample (BAR_CACHE, kept between builds, so history also grows
+beyond the fetch window); the ratio / index history is one vectorized pass over the aligned weekly closes.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..align import asof_join, day_str
+from .resample import BAR_CACHE, BarCache, period_end
+
+TREND_WEEKS = 52
+CHANGE_WEEKS = 13
+COPPER_MOM_WEEKS = 5
+RANK_WEEKS = 156
+MIN_RANK_WEEKS = 26
+HISTORY_WEEKS = 52
+AI_ROLES = ("sox", "nvda")
+CONSTRAINT_ROLES = ("copper", "energy", "utility")
+# Phase bands on (aiDiffusionIndex, constraintIndex)
+SPRING_ADI, WINTER_ADI, CONSTRAINT_HIGH = 55.0, 45.0, 55.0
+
+
+def _rolling_rank(x: np.ndarray, window: int = RANK_WEEKS, min_obs: int = MIN_RANK_WEEKS) -> np.ndarray:
+    """Mid-rank % of each x[t] within x[t - window + 1 .. t] (NaN ignored); NaN below min_obs."""
+    padded = np.concatenate([np.full(window - 1, np.nan), x])
+    win = sliding_window_view(padded, window)  # (T, window), last column is x[t]
+    cur = x[:, None]
+    valid = ~np.isnan(win)
+    n = valid.sum(axis=1)
+    below = np.sum(valid & (win < cur), axis=1)
+    ties = np.sum(valid & (win == cur), axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = (below + 0.5 * ties) / n * 100
+    return np.where((n >= min_obs) & ~np.isnan(x), out, np.nan)
+
+
+def _lag_change(x: np.ndarray, lag: int, log: bool = True) -> np.ndarray:
+    out = np.full(len(x), np.nan)
+    if len(x) > lag:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[lag:] = np.log(x[lag:] / x[:-lag]) if log else x[lag:] / x[:-lag] - 1
+    return out
+
+
+def _trend_ratio(x: np.ndarray, window: int = TREND_WEEKS) -> np.ndarray:
+    """x over its trailing `window` mean (fewer weeks early on), NaN-aware."""
+    ok = ~np.isnan(x)
+    c = np.concatenate([[0.0], np.cumsum(np.where(ok, x, 0.0))])
+    n = np.concatenate([[0], np.cumsum(ok)])
+    hi = np.arange(1, len(x) + 1)
+    lo = np.maximum(hi - window, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return x / ((c[hi] - c[lo]) / (n[hi] - n[lo]))
+
+
+def _mean_rank(cols: list[np.ndarray]) -> np.ndarray:
+    """Mean of the available rolling ranks per week; NaN where none is available."""
+    ranks = np.vstack([_rolling_rank(c) for c in cols])
+    n = np.sum(~np.isnan(ranks), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, np.nansum(ranks, axis=0) / n, np.nan)
+
+
+def chain_history(closes: dict[str, tuple[np.ndarray, np.ndarray]]) -> dict[str, np.ndarray]:
+    """
+    closes: {role: (week numbers, weekly closes)}; calendar = the base (SPY) weeks, other roles as-of aligned.
+    Returns per-week arrays: weeks, the ratio / momentum components, aiDiffusionIndex, constraintIndex.
+    """
+    weeks = closes.get("base", (np.array([], dtype=np.int64), None))[0]
+    x = {r: asof_join(weeks, w, c) for r, (w, c) in closes.items()}
+    nan = np.full(len(weeks), np.nan)
+    base = x.get("base", nan)
+    # Equity legs relative to the base; commodities as prices
+    legs = {r: x.get(r, nan) for r in ("copper", "energy")}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        legs.update({r: x.get(r, nan) / base for r in ("sox", "nvda", "utility")})
+    return {
+        "weeks": weeks,
+        "soxRatio": _trend_ratio(legs["sox"]),
+        "nvdaRatio": _trend_ratio(legs["nvda"]),
+        "utilityRatio": _trend_ratio(legs["utility"]),
+        "copperMomentum": _lag_change(legs["copper"], COPPER_MOM_WEEKS, log=False) * 100,
+        "energyPrice": legs["energy"],
+        "aiDiffusionIndex": _mean_rank([_lag_change(legs[r], CHANGE_WEEKS) for r in AI_ROLES]),
+        "constraintIndex": _mean_rank([_lag_change(legs[r], CHANGE_WEEKS) for r in CONSTRAINT_ROLES]),
+    }
+
+
+def _phase(adi: float | None, ci: float | None) -> str:
+    if adi is None or ci is None:
+        return "transition"
+    if adi >= SPRING_ADI and ci < CONSTRAINT_HIGH:
+        return "spring"
+    if adi < WINTER_ADI and ci >= CONSTRAINT_HIGH:
+        return "winter"
+    return "transition"
+
+
+def _num(v: float, nd: int) -> float | None:
+    return None if v is None or not np.isfinite(v) else round(float(v), nd)
+
+
+def weekly_chain(chain: dict[str, str], bars: BarCache = BAR_CACHE) -> dict[str, Any]:
+    """
+    chain: {role: ticker}, read from the weekly bars of `bars` (update it with the fetched series first).
+    Copper falls back to CPER when its ticker has no bars.
+    Returns {"asOf", "components", "aiDiffusionIndex", "constraintIndex", "phase", "missing", "history"}.
+    """
+    tickers = dict(chain)
+    if not len(bars.get(tickers.get("copper", ""), "W")) and len(bars.get("CPER", "W")):
+        tickers["copper"] = "CPER"
+    weekly = {r: bars.get(t, "W") for r, t in tickers.items()}
+    # Weekly calendar = period numbers; closes as-of joined on them
+    closes = {r: (b.period, b.close) for r, b in weekly.items() if len(b)}
+    missing = sorted(set(tickers) - set(closes))
+    if "base" not in closes:
+        return {"asOf": None, "components": {}, "aiDiffusionIndex": None, "constraintIndex": None,
+                "phase": "transition", "missing": missing, "history": {}}
+
+    h = chain_history(closes)
+    comp_nd = {"soxRatio": 4, "nvdaRatio": 4, "utilityRatio": 4, "copperMomentum": 4, "energyPrice": 2}
+    adi = _num(h["aiDiffusionIndex"][-1], 2)
+    ci = _num(h["constraintIndex"][-1], 2)
+    tail = slice(-HISTORY_WEEKS, None)
+    return {
+        "asOf": day_str(int(period_end(h["weeks"][-1:], "W")[0])),
+        "components": {k: _num(h[k][-1], nd) for k, nd in comp_nd.items()},
+        "aiDiffusionIndex": adi,
+        "constraintIndex": ci,
+        "phase": _phase(adi, ci),
+        "missing": missing,
+        "history": {
+            "dates": [day_str(int(d)) for d in period_end(h["weeks"][tail], "W")],
+            "aiDiffusionIndex": [_num(v, 2) for v in h["aiDiffusionIndex"][tail]],
+            "constraintIndex": [_num(v, 2) for v in h["constraintIndex"][tail]],
+        },
+    }
@@ -0,0 +1,77 @@
+"""
+Memoization of per-asset feature results (compute_all, returns, trend/risk lights).
+Key = ticker + series fingerprint (length, last date, content hash of closes) + FEATURE_VERSION,
+so weekends / HK holidays / stale stooq data skip recomputation. Bounded LRU, persisted as JSON.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..io.write_json import write_json_atomic
+
+# Bump whenever compute_all/compute_batch, _latest_and_returns or the trend/risk light rules change.
+FEATURE_VERSION = "3"
+MAX_ENTRIES = 2048
+
+
+def series_fingerprint(series: list[dict[str, Any]]) -> str:
+    if not series:
+        return "empty"
+    closes = np.fromiter((r.get("close") or 0.0 for r in series), dtype=float, count=len(series))
+    digest = hashlib.blake2b(closes.tobytes(), digest_size=8).hexdigest()
+    return f"{len(series)}:{series[-1].get('date')}:{digest}"
+
+
+class FeatureMemo:
+    """LRU map key -> JSON-serializable result; `dirty` tells the owner whether a save is needed."""
+
+    def __init__(self, path: Path | None = None, max_entries: int = MAX_ENTRIES) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, Any] = OrderedDict()
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: Path, max_entries: int = MAX_ENTRIES) -> "FeatureMemo":
+        memo = cls(path, max_entries)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") == FEATURE_VERSION:
+                memo.entries.update(data.get("entries") or {})
+        except (FileNotFoundError, ValueError, AttributeError):
+            pass
+        return memo
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        write_json_atomic(self.path, {"version": FEATURE_VERSION, "entries": self.entries})
+        self.dirty = False
+
+    @staticmethod
+    def key(ticker: str, series: list[dict[str, Any]]) -> str:
+        return f"{ticker}|{series_fingerprint(series)}|v{FEATURE_VERSION}"
+
+    def get(self, key: str) -> Any | None:
+        hit = self.entries.get(key)
+        if hit is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return hit
+
+    def put(self, key: str, value: Any) -> None:
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self.dirty = True
@@ -0,0 +1,61 @@
+"""
+Rule parameters: every threshold used by regime(), the lights and suggestedMaxWeight in one place.
+DEFAULT_PARAMS reproduces the live rules; the backtest / sweep evaluate alternatives.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any
+
+
+@dataclass(frozen=True)
+class RuleParams:
+    # Price rows below this force trend/risk lights to yellow (INSUFFICIENT_HISTORY)
+    min_history: int = 220
+    # _risk_mult: volPercentile1y > risk_pct_high -> risk_mult_high, > risk_pct_mid -> risk_mult_mid
+    risk_pct_high: float = 70.0
+    risk_pct_mid: float = 50.0
+    risk_mult_high: float = 0.8
+    risk_mult_mid: float = 0.9
+    # _regime_mult per regime letter
+    regime_mult_a: float = 1.0
+    regime_mult_b: float = 0.9
+    regime_mult_c: float = 0.7
+    regime_mult_d: float = 0.95
+    # regime(): RiskScore floor for A, HY levels (elevated -> B / spread peak, stress -> C), 1m HY change at a peak
+    risk_score_a: float = 40.0
+    hy_elevated: float = 5.0
+    hy_stress: float = 6.0
+    hy_peak_change: float = -0.2
+    # regime(): real rate 1m change for easing, level for tight liquidity; PMI weak/ok; core inflation high
+    real_rate_easing: float = -0.05
+    real_rate_tight: float = 1.5
+    pmi_weak: float = 48.0
+    pmi_ok: float = 50.0
+    core_infl_high: float = 3.0
+    # _catalyst_light: A needs real rate below this, D needs DXY 1m change below this
+    catalyst_real_rate: float = 1.0
+    catalyst_dxy_change: float = -0.5
+
+    def regime_mult(self, letter: str) -> float:
+        return {"A": self.regime_mult_a, "B": self.regime_mult_b, "C": self.regime_mult_c, "D": self.regime_mult_d}.get(letter, 1.0)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def diff(self, other: "RuleParams" | None = None) -> dict[str, Any]:
+        """Fields that differ from `other` (default: DEFAULT_PARAMS)."""
+        base = other or DEFAULT_PARAMS
+        return {f.name: getattr(self, f.name) for f in fields(self) if getattr(self, f.name) != getattr(base, f.name)}
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "RuleParams":
+        """Unknown keys raise ValueError; missing keys keep their defaults."""
+        names = {f.name for f in fields(cls)}
+        unknown = set(d) - names
+        if unknown:
+            raise ValueError(f"unknown rule params: {sorted(unknown)}")
+        return replace(DEFAULT_PARAMS, **d)
+
+
+DEFAULT_PARAMS = RuleParams()
@@ -0,0 +1,119 @@
+"""
+Empirical macro percentiles: each series ranked against its own trailing PCT_YEARS of observations.
+RollingRank keeps the window sorted (bisect), so a new observation costs O(log n) search + one
+list insert/delete instead of re-sorting the history. MacroRanks holds one index per macro id and
+only pushes observations newer than what it has already seen; a revision to an earlier row rebuilds the index.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from typing import Any
+
+import numpy as np
+
+from ..align import series_arrays
+
+PCT_YEARS = 5
+PCT_SPAN_DAYS = 365 * PCT_YEARS
+# Below this many observations in the window the caller falls back to the fixed bands
+PCT_MIN_OBS = {"D": 250, "M": 24}
+
+
+class RollingRank:
+    """Time-based sliding window (span_days) of (day, value) with a sorted copy of the values."""
+
+    def __init__(self, span_days: int = PCT_SPAN_DAYS, min_obs: int = 1) -> None:
+        self.span_days = span_days
+        self.min_obs = min_obs
+        self._rows: deque[tuple[int, float]] = deque()
+        self._sorted: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    @property
+    def last_day(self) -> int | None:
+        return self._rows[-1][0] if self._rows else None
+
+    def _drop(self, value: float) -> None:
+        del self._sorted[bisect_left(self._sorted, value)]
+
+    def push(self, day: int, value: float) -> bool:
+        """Append one observation (days must increase; the same day replaces a revised value). False if older."""
+        last = self.last_day
+        if last is not None and day < last:
+            return False
+        if last is not None and day == last:
+            self._drop(self._rows.pop()[1])
+        self._rows.append((day, value))
+        insort(self._sorted, value)
+        while self._rows[0][0] <= day - self.span_days:
+            self._drop(self._rows.popleft()[1])
+        return True
+
+    def matches(self, days: np.ndarray, vals: np.ndarray) -> bool:
+        """Whether days / vals agree with the window on the span they share before last_day (no earlier revision)."""
+        last = self.last_day
+        if last is None or not len(days):
+            return True
+        lo = max(int(days[0]), self._rows[0][0])
+        held = [(d, v) for d, v in self._rows if lo <= d < last]
+        sel = (days >= lo) & (days < last)
+        return np.array_equal(days[sel], [d for d, _ in held]) and np.array_equal(vals[sel], [v for _, v in held])
+
+    def sorted_values(self) -> list[float]:
+        """Copy of the window, ascending ([] while shorter than min_obs)."""
+        return list(self._sorted) if len(self._sorted) >= self.min_obs else []
+
+    def percentile(self, value: float | None) -> float | None:
+        """% of window values <= value; None when the window is too short."""
+        if value is None or len(self._sorted) < self.min_obs:
+            return None
+        return bisect_right(self._sorted, value) / len(self._sorted) * 100
+
+
+class MacroRanks:
+    """{macro id: RollingRank}; update() pushes only rows after each index's last day (rebuilds on a revision)."""
+
+    def __init__(self, span_days: int = PCT_SPAN_DAYS) -> None:
+        self.span_days = span_days
+        self._ranks: dict[str, RollingRank] = {}
+
+    def update(self, mid: str, rows: list[dict[str, Any]], freq: str = "D") -> RollingRank:
+        days, vals = series_arrays(rows or [], "value")
+        rank = self._ranks.get(mid)
+        if rank is None or not rank.matches(days, vals):
+            rank = self._ranks[mid] = RollingRank(self.span_days, PCT_MIN_OBS.get(freq, 1))
+        last = rank.last_day
+        start = 0 if last is None else int(np.searchsorted(days, last, side="left"))
+        for d, v in zip(days[start:], vals[start:]):
+            rank.push(int(d), float(v))
+        return rank
+
+    def get(self, mid: str) -> RollingRank | None:
+        return self._ranks.get(mid)
+
+    def percentile(self, mid: str, rows: list[dict[str, Any]], value: float | None, freq: str = "D") -> float | None:
+        """Update with rows, then rank value; None without rows (fallback values are not ranked)."""
+        if not rows:
+            return None
+        return self.update(mid, rows, freq).percentile(value)
+
+
+# Process-wide index used by build_payload (scheduler runs keep it warm between builds)
+MACRO_RANKS = MacroRanks()
+
+
+def rolling_percentiles(
+    days: np.ndarray, vals: np.ndarray, span_days: int = PCT_SPAN_DAYS, min_obs: int = 1
+) -> np.ndarray:
+    """Percentile of every observation against its trailing window (NaN while the window is short)."""
+    rank = RollingRank(span_days, min_obs)
+    out = np.full(len(vals), np.nan)
+    for i, (d, v) in enumerate(zip(days, vals)):
+        rank.push(int(d), float(v))
+        p = rank.percentile(float(v))
+        if p is not None:
+            out[i] = p
+    return out
@@ -0,0 +1,52 @@
+"""
+Chunked process-pool map for CPU-bound per-asset work (features + trend/risk lights).
+Callers ship compact numpy arrays, not lists of row dicts; results come back in input order.
+FEATURE_WORKERS <= 1 or fewer than FEATURE_POOL_MIN_ASSETS items run in-process. Workers are spawned, not
+forked: the pool is started from the scheduler's background thread inside uvicorn, and forking a threaded
+process is unsafe.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pickle import PicklingError
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+FEATURE_WORKERS = int(os.environ.get("FEATURE_WORKERS", str(min(4, os.cpu_count() or 1))))
+POOL_MIN_ITEMS = int(os.environ.get("FEATURE_POOL_MIN_ASSETS", "200"))
+
+
+def chunks(items: list[T], n: int) -> list[list[T]]:
+    """Split into at most n contiguous, near-equal chunks."""
+    if not items:
+        return []
+    size = -(-len(items) // max(1, n))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def map_chunks(
+    fn: Callable[[list[T]], list[R]],
+    items: list[T],
+    workers: int | None = None,
+    min_items: int | None = None,
+) -> list[R]:
+    """
+    fn(chunk) -> one result per item. fn must be a module-level function (picklable under spawn).
+    Falls back to fn(items) in-process when the pool is not worth it or cannot start.
+    """
+    workers = FEATURE_WORKERS if workers is None else workers
+    min_items = POOL_MIN_ITEMS if min_items is None else min_items
+    if workers <= 1 or len(items) < max(2, min_items):
+        return fn(items)
+    parts = chunks(items, workers)
+    try:
+        with ProcessPoolExecutor(max_workers=len(parts), mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(fn, parts))
+    except (OSError, BrokenProcessPool, PicklingError):
+        return fn(items)
+    return [r for part in results for r in part]
@@ -0,0 +1,156 @@
+"""
+Portfolio risk of the suggested allocation: shrunk covariance of the universe's daily returns, portfolio
+vol, marginal / component risk contributions and a vol-targeted cap per asset.
+
+Covariance: the last COV_WINDOW rows of the business-day return panel (compute.correlation), returns
+taken as zero-mean (RiskMetrics convention), each entry averaged over the rows where both returns exist
+(an asset with a short history is not diluted by the rows before it). Off-diagonal entries are shrunk
+toward 0 (diagonal target) with the Schafer-Strimmer intensity, estimated from the same sums.
+RollingCov keeps X'X, (X*X)'(X*X) and the pairwise valid counts V'V of the window between builds; update() adds the rows that entered
+and subtracts the rows that left or were revised, so a new bar costs O(N^2) instead of O(W * N^2).
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from ..align import day_str
+from .correlation import build_return_panel
+
+COV_WINDOW = 252
+MIN_OBS = 60
+TARGET_VOL = 0.15  # annualized portfolio vol the caps scale to
+ANNUAL = 252
+# Full recompute after this many incremental updates (bounds floating-point drift)
+REBUILD_EVERY = 500
+
+
+class RollingCov:
+    """Sufficient statistics of the last `window` rows of a (T, N) return panel with fixed column ids."""
+
+    def __init__(self, window: int = COV_WINDOW) -> None:
+        self.window = window
+        self.ids: tuple[str, ...] = ()
+        self.reset(())
+
+    def reset(self, ids: tuple[str, ...]) -> None:
+        n = len(ids)
+        self.ids = ids
+        self.dates = np.zeros(0, dtype=np.int64)
+        self.rows = np.zeros((0, n))
+        self.valid = np.zeros((0, n), dtype=bool)
+        self.s1 = np.zeros((n, n))
+        self.s2 = np.zeros((n, n))
+        self.s0 = np.zeros((n, n))
+        self.updates = 0
+
+    def _apply(self, rows: np.ndarray, valid: np.ndarray, sign: float) -> None:
+        if len(rows):
+            sq = rows * rows
+            v = valid.astype(float)
+            self.s1 += sign * (rows.T @ rows)
+            self.s2 += sign * (sq.T @ sq)
+            self.s0 += sign * (v.T @ v)
+
+    def update(self, dates: np.ndarray, returns: np.ndarray, ids: tuple[str, ...]) -> int:
+        """Move the window to the panel's last `window` rows; returns how many rows were (re)added."""
+        if ids != self.ids or self.updates >= REBUILD_EVERY:
+            self.reset(ids)
+        dates, returns = dates[-self.window:], returns[-self.window:]
+        valid = ~np.isnan(returns)
+        rows = np.where(valid, returns, 0.0)
+
+        _, i_old, i_new = np.intersect1d(self.dates, dates, assume_unique=True, return_indices=True)
+        same = np.all((self.rows[i_old] == rows[i_new]) & (self.valid[i_old] == valid[i_new]), axis=1)
+        keep_old = np.zeros(len(self.dates), dtype=bool)
+        keep_old[i_old[same]] = True
+        keep_new = np.zeros(len(dates), dtype=bool)
+        keep_new[i_new[same]] = True
+
+        self._apply(self.rows[~keep_old], self.valid[~keep_old], -1.0)
+        self._apply(rows[~keep_new], valid[~keep_new], 1.0)
+        self.dates, self.rows, self.valid = dates, rows, valid
+        self.updates += 1
+        return int(np.sum(~keep_new))
+
+    def covariance(self) -> tuple[np.ndarray, float, np.ndarray]:
+        """(shrunk daily covariance (N, N), shrinkage intensity, valid observations per column)."""
+        counts = self.valid.sum(axis=0)
+        if len(self.dates) < 2:
+            return np.zeros_like(self.s1), 1.0, counts
+        # Pairwise counts (exact integers despite the float sums); entries with < 2 common rows are 0
+        n = np.rint(self.s0)
+        ok = n >= 2
+        safe = np.where(ok, n, 2.0)
+        s = np.where(ok, self.s1 / safe, 0.0)
+        # Var of each mean-of-products entry: (E[w^2] - E[w]^2) / (n - 1)
+        var_s = np.where(ok, np.maximum(self.s2 / safe - s * s, 0.0) / (safe - 1), 0.0)
+        off = ~np.eye(len(s), dtype=bool)
+        denom = float(np.sum(s[off] ** 2))
+        shrink = float(np.clip(np.sum(var_s[off]) / denom, 0.0, 1.0)) if denom > 0 else 1.0
+        cov = np.where(off, (1 - shrink) * s, s)
+        return cov, shrink, counts
+
+
+# Process-wide state used by build_payload (scheduler runs only add the new bars)
+COV_STATE = RollingCov()
+
+
+def risk_decomposition(cov: np.ndarray, w: np.ndarray) -> tuple[float, np.ndarray, np.ndarray]:
+    """(portfolio vol, marginal risk d vol / d w_i, component contributions w_i * marginal_i); annualized."""
+    cov_a = cov * ANNUAL
+    cw = cov_a @ w
+    vol = float(np.sqrt(max(float(w @ cw), 0.0)))
+    marginal = cw / vol if vol > 0 else np.zeros_like(w)
+    return vol, marginal, w * marginal
+
+
+def portfolio_risk(
+    asset_series: dict[str, list[dict[str, Any]]],
+    weights: dict[str, float],
+    target_vol: float = TARGET_VOL,
+    state: RollingCov = COV_STATE,
+) -> dict[str, Any]:
+    """
+    asset_series: {asset id: ohlcv rows}; weights: {asset id: suggestedMaxWeight}.
+    Assets with fewer than MIN_OBS returns in the window are left out (their cap is their weight).
+    Returns the "portfolioRisk" payload block ({} without enough data).
+    """
+    aids = list(asset_series)
+    panel = build_return_panel({f"asset:{a}": (asset_series[a] or [], "close", "pct") for a in aids})
+    if len(panel.dates) < MIN_OBS:
+        return {}
+    state.update(panel.dates, panel.columns([f"asset:{a}" for a in aids]), tuple(aids))
+    cov, shrink, counts = state.covariance()
+
+    used = counts >= MIN_OBS
+    w = np.array([weights.get(a, 0.0) for a in aids], dtype=float)
+    wu = np.where(used, w, 0.0)
+    cov_u = cov * np.outer(used, used)
+    vol, marginal, contrib = risk_decomposition(cov_u, wu)
+    scale = min(1.0, target_vol / vol) if vol > 0 else 1.0
+    asset_vol = np.sqrt(np.diag(cov_u) * ANNUAL)
+
+    per_asset = {}
+    for j, aid in enumerate(aids):
+        if not used[j]:
+            per_asset[aid] = {"vol": None, "marginalRisk": None, "riskContribution": None, "volTargetMaxWeight": round(w[j], 4)}
+            continue
+        per_asset[aid] = {
+            "vol": round(float(asset_vol[j]) * 100, 2),
+            "marginalRisk": round(float(marginal[j]) * 100, 3),
+            "riskContribution": round(float(contrib[j] / vol) * 100, 2) if vol > 0 else 0.0,
+            "volTargetMaxWeight": round(float(w[j] * scale), 4),
+        }
+    return {
+        "asOf": day_str(int(state.dates[-1])),
+        "window": len(state.dates),
+        "assetsUsed": int(used.sum()),
+        "shrinkage": round(shrink, 4),
+        "portfolioVol": round(vol * 100, 2),
+        "targetVol": round(target_vol * 100, 2),
+        "scale": round(scale, 4),
+        "grossWeight": round(float(w.sum()), 4),
+        "assets": per_asset,
+    }
@@ -9,6 +9,10 @@ from __future__ import annotations
 
 from typing import Any
 
+import numpy as np
+
+from .params import DEFAULT_PARAMS, RuleParams
+
 
 def regime(
     hy: dict[str, Any],
@@ -17,6 +21,7 @@ def regime(
     core_cpi: dict[str, Any],
     dxy: dict[str, Any],
     risk_score_val: float,
+    params: RuleParams = DEFAULT_PARAMS,
 ) -> tuple[str, str]:
     hv = hy.get("value")
     hch = hy.get("change1m")
@@ -26,25 +31,57 @@ def regime(
     cv = core_cpi.get("value")
     dch = dxy.get("change1m")
 
-    spread_peak_falling = hch is not None and hch < -0.2 and (hv or 0) > 5.0
-    liquidity_easing = rch is not None and rch < -0.05
-    growth_weak = pv is not None and pv < 48
-    growth_ok = pv is not None and pv >= 50
-    infl_high = cv is not None and cv > 3.0
-    liquidity_tight = rv is not None and rv > 1.5
+    p = params
+    spread_peak_falling = hch is not None and hch < p.hy_peak_change and (hv or 0) > p.hy_elevated
+    liquidity_easing = rch is not None and rch < p.real_rate_easing
+    growth_weak = pv is not None and pv < p.pmi_weak
+    growth_ok = pv is not None and pv >= p.pmi_ok
+    infl_high = cv is not None and cv > p.core_infl_high
+    liquidity_tight = rv is not None and rv > p.real_rate_tight
 
-    if risk_score_val < 40:
+    if risk_score_val < p.risk_score_a:
         return ("A", "A")
     if spread_peak_falling and liquidity_easing:
         return ("D", "D_late")
-    if growth_weak and (hv is not None and hv > 6):
+    if growth_weak and (hv is not None and hv > p.hy_stress):
         return ("C", "C")
     if growth_ok and (infl_high or liquidity_tight):
         return ("B", "B")
     if growth_ok:
         return ("A", "A")
-    if hv is not None and hv > 6:
+    if hv is not None and hv > p.hy_stress:
         return ("C", "C")
-    if hv is not None and hv > 5:
+    if hv is not None and hv > p.hy_elevated:
         return ("B", "B")
     return ("A", "A")
+
+
+def regime_array(
+    hv: np.ndarray,
+    hch: np.ndarray,
+    rv: np.ndarray,
+    rch: np.ndarray,
+    pv: np.ndarray,
+    cv: np.ndarray,
+    risk_score_val: np.ndarray,
+    params: RuleParams = DEFAULT_PARAMS,
+) -> np.ndarray:
+    """regime() letter for every date at once; NaN inputs behave like None (comparisons are False)."""
+    p = params
+    with np.errstate(invalid="ignore"):
+        spread_peak_falling = (hch < p.hy_peak_change) & (hv > p.hy_elevated)
+        liquidity_easing = rch < p.real_rate_easing
+        growth_weak = pv < p.pmi_weak
+        growth_ok = pv >= p.pmi_ok
+        infl_high = cv > p.core_infl_high
+        liquidity_tight = rv > p.real_rate_tight
+        conds = [
+            risk_score_val < p.risk_score_a,
+            spread_peak_falling & liquidity_easing,
+            growth_weak & (hv > p.hy_stress),
+            growth_ok & (infl_high | liquidity_tight),
+            growth_ok,
+            hv > p.hy_stress,
+            hv > p.hy_elevated,
+        ]
+    return np.select(conds, ["A", "D", "C", "B", "A", "C", "B"], "A")
@@ -0,0 +1,227 @@
+"""
+Regime transition statistics over the macro-history regime series (compute.history): daily transition
+matrix, dwell times (completed spell lengths and the 1 / (1 - p_ii) implied by the matrix) and, per
+asset, forward-return distributions grouped by the regime on the start day.
+RegimeStats.update() appends only days after the last one it has seen: transitions / spells are
+counted for the new days. The input window may slide forward (rolling FRED history); days before its
+start are kept. Each asset's as-of closes are checked against its new price series on the days both
+cover (adjusted history re-adjusted after a split / dividend changes them); a new asset or a changed
+series rebuilds that asset's forward returns over every stored day, otherwise a forward return is added
+once its horizon has elapsed. The newest day's close is provisional (still trading) and never ends a
+forward return. Group sums use np.bincount over the regime codes; quantiles come from a fixed-size
+log-return histogram per regime.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from ..align import asof_join, day_str, parse_day, series_arrays
+
+REGIMES = ("A", "B", "C", "D")
+# Forward-return horizons in regime-calendar days (weekdays): ~1m, ~3m
+FWD_HORIZONS = (21, 63)
+QUANTILES = (10, 50, 90)
+# Quantile sketch: log-return bins of SKETCH_STEP over [SKETCH_LO, SKETCH_HI) (~-90% .. +300%), edges clipped
+SKETCH_LO, SKETCH_HI, SKETCH_STEP = -2.3, 1.4, 0.0025
+SKETCH_BINS = int(round((SKETCH_HI - SKETCH_LO) / SKETCH_STEP))
+
+
+def _codes(letters: list[str] | np.ndarray) -> np.ndarray:
+    lookup = {r: i for i, r in enumerate(REGIMES)}
+    return np.array([lookup.get(str(x), 0) for x in letters], dtype=np.int64)
+
+
+class _FwdAcc:
+    """Forward returns of one asset at one horizon: per-regime count / sum / sum of squares / hits + histogram."""
+
+    def __init__(self) -> None:
+        k = len(REGIMES)
+        self.n = np.zeros(k, dtype=np.int64)
+        self.s1 = np.zeros(k)
+        self.s2 = np.zeros(k)
+        self.hits = np.zeros(k, dtype=np.int64)
+        self.hist = np.zeros((k, SKETCH_BINS), dtype=np.int32)
+        self.done = 0  # start positions already accounted for
+
+    def add(self, codes: np.ndarray, rets: np.ndarray) -> None:
+        ok = ~np.isnan(rets)
+        c, r = codes[ok], rets[ok]
+        k = len(REGIMES)
+        self.n += np.bincount(c, minlength=k)
+        self.s1 += np.bincount(c, weights=r, minlength=k)
+        self.s2 += np.bincount(c, weights=r * r, minlength=k)
+        self.hits += np.bincount(c, weights=(r > 0), minlength=k).astype(np.int64)
+        bins = np.clip(((np.log1p(r) - SKETCH_LO) / SKETCH_STEP).astype(np.int64), 0, SKETCH_BINS - 1)
+        np.add.at(self.hist, (c, bins), 1)
+
+    def quantiles(self, g: int) -> np.ndarray:
+        """QUANTILES of regime g's returns, interpolated linearly (in log return) within the histogram bin."""
+        counts = self.hist[g]
+        cum = np.cumsum(counts)
+        rank = np.asarray(QUANTILES, dtype=float) / 100 * cum[-1]
+        b = np.minimum(np.searchsorted(cum, np.maximum(rank, 1e-9)), SKETCH_BINS - 1)
+        frac = (rank - (cum[b] - counts[b])) / np.maximum(counts[b], 1)
+        return np.expm1(SKETCH_LO + (b + frac) * SKETCH_STEP)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        out = {}
+        for g, letter in enumerate(REGIMES):
+            n = int(self.n[g])
+            if not n:
+                continue
+            mean = self.s1[g] / n
+            std = float(np.sqrt(max(self.s2[g] / n - mean * mean, 0.0)))
+            q = self.quantiles(g)
+            out[letter] = {
+                "n": n,
+                "mean": round(float(mean) * 100, 2),
+                "std": round(std * 100, 2),
+                "hitRate": round(float(self.hits[g]) / n * 100, 1),
+                **{f"p{p}": round(float(v) * 100, 2) for p, v in zip(QUANTILES, q)},
+            }
+        return out
+
+
+class RegimeStats:
+    """Incremental statistics over a growing (date, regime) series and per-asset closes aligned to it."""
+
+    def __init__(self, horizons: tuple[int, ...] = FWD_HORIZONS) -> None:
+        self.horizons = horizons
+        self.reset()
+
+    def reset(self) -> None:
+        k = len(REGIMES)
+        self.days = np.zeros(0, dtype=np.int64)
+        self.codes = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros((k, k), dtype=np.int64)
+        self.spell_n = np.zeros(k, dtype=np.int64)
+        self.spell_days = np.zeros(k, dtype=np.int64)
+        self.spell_len = 0
+        self.closes: dict[str, np.ndarray] = {}
+        self.fwd: dict[str, dict[int, _FwdAcc]] = {}
+
+    @property
+    def last_day(self) -> int | None:
+        return int(self.days[-1]) if len(self.days) else None
+
+    def update(self, days: np.ndarray, letters: list[str] | np.ndarray, prices: dict[str, list[dict[str, Any]]]) -> int:
+        """
+        Append the days after last_day. The series may start later than ours (the stored days before its
+        start are kept); it is rebuilt when it starts earlier or its days / regimes on the overlap differ.
+        prices: {asset id: ohlcv rows}; each day takes the as-of close. Returns the number of days added.
+        """
+        days = np.asarray(days, dtype=np.int64)
+        letters = list(letters)
+        if len(self.days) and not self._continues(days, letters):
+            self.reset()
+        start = 0 if self.last_day is None else int(np.searchsorted(days, self.last_day, side="right"))
+        new_days, new_codes = days[start:], _codes(letters[start:])
+
+        if len(new_days):
+            # Transitions (day t-1 -> t) and spell run lengths over [previous last day] + new days
+            prev = self.codes[-1:] if len(self.codes) else np.zeros(0, dtype=np.int64)
+            seq = np.concatenate([prev, new_codes])
+            np.add.at(self.counts, (seq[:-1], seq[1:]), 1)
+            breaks = np.flatnonzero(seq[1:] != seq[:-1]) + 1
+            starts = np.r_[0, breaks]
+            lengths = np.diff(np.r_[starts, len(seq)])
+            if len(prev):
+                lengths[0] += self.spell_len - 1  # the first run continues the open spell
+            done = starts[:-1]  # every run but the last one is complete
+            np.add.at(self.spell_n, seq[done], 1)
+            np.add.at(self.spell_days, seq[done], lengths[:-1])
+            self.spell_len = int(lengths[-1])
+            self.days = np.concatenate([self.days, new_days])
+            self.codes = np.concatenate([self.codes, new_codes])
+
+        for aid in set(self.closes) - set(prices):
+            self.closes.pop(aid)
+            self.fwd.pop(aid, None)
+        for aid, rows in prices.items():
+            self._update_asset(aid, rows)
+        return len(new_days)
+
+    def _update_asset(self, aid: str, rows: list[dict[str, Any]]) -> None:
+        """As-of closes on every stored day; forward returns rebuilt when the series changed on settled days."""
+        pdays, pcloses = series_arrays(rows or [], "close")
+        aligned = asof_join(self.days, pdays, pcloses)
+        old = self.closes.get(aid)
+        settled = len(old) - 1 if old is not None else 0  # the last stored close was provisional
+        if old is not None:
+            seen = ~np.isnan(aligned[:settled])
+            # A stored NaN where the series now has a close counts as a change too
+            if np.allclose(old[:settled][seen], aligned[:settled][seen], rtol=1e-9, atol=0.0):
+                # Days before the new price window keep their closes
+                aligned = np.concatenate([np.where(seen, aligned[:settled], old[:settled]), aligned[settled:]])
+            else:
+                old = None
+        if old is None:
+            self.fwd[aid] = {h: _FwdAcc() for h in self.horizons}
+        self.closes[aid] = c = aligned
+        for h, acc in self.fwd[aid].items():
+            end = len(c) - h - 1  # starts whose horizon ends on a settled day
+            if end <= acc.done:
+                continue
+            i = np.arange(acc.done, end)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                rets = c[i + h] / c[i] - 1
+            acc.add(self.codes[i], np.where(c[i] > 0, rets, np.nan))
+            acc.done = end
+
+    def _continues(self, days: np.ndarray, letters: list[str]) -> bool:
+        """days / letters extend ours: start within our days and match them (and their regimes) up to last_day."""
+        if not len(days) or days[0] < self.days[0] or days[-1] < self.days[-1]:
+            return False
+        i = int(np.searchsorted(self.days, days[0]))
+        j = int(np.searchsorted(days, self.days[-1], side="right"))
+        ours = self.days[i:]
+        return j == len(ours) and np.array_equal(days[:j], ours) and np.array_equal(_codes(letters[:j]), self.codes[i:])
+
+    def summary(self) -> dict[str, Any]:
+        if not len(self.days):
+            return {}
+        rows = self.counts.sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            matrix = np.where(rows > 0, self.counts / np.maximum(rows, 1), np.nan)
+        cur = int(self.codes[-1])
+        dwell = {}
+        for g, letter in enumerate(REGIMES):
+            stay = matrix[g, g]
+            dwell[letter] = {
+                "days": int(np.sum(self.codes == g)),
+                "spells": int(self.spell_n[g]),
+                "meanSpellDays": round(float(self.spell_days[g] / self.spell_n[g]), 1) if self.spell_n[g] else None,
+                "expectedDays": round(float(1 / (1 - stay)), 1) if np.isfinite(stay) and stay < 1 else None,
+            }
+        return {
+            "since": day_str(int(self.days[0])),
+            "asOf": day_str(int(self.days[-1])),
+            "days": len(self.days),
+            "regimes": list(REGIMES),
+            "transitionCounts": self.counts.tolist(),
+            "transitionMatrix": [[None if np.isnan(p) else round(float(p), 4) for p in row] for row in matrix],
+            "dwell": dwell,
+            "current": {
+                "regime": REGIMES[cur],
+                "spellDays": self.spell_len,
+                "expectedDays": dwell[REGIMES[cur]]["expectedDays"],
+                "next": {r: (None if np.isnan(p) else round(float(p), 4)) for r, p in zip(REGIMES, matrix[cur])},
+            },
+            "forwardReturns": {
+                "horizons": list(self.horizons),
+                "assets": {aid: {str(h): acc.summary() for h, acc in accs.items()} for aid, accs in self.fwd.items()},
+            },
+        }
+
+
+# Process-wide engine used by build_payload (scheduler runs only append the new days)
+REGIME_STATS = RegimeStats()
+
+
+def regime_stats(history: dict[str, Any], prices: dict[str, list[dict[str, Any]]], engine: RegimeStats = REGIME_STATS) -> dict[str, Any]:
+    """history: regime_history() output (full calendar); prices: {asset id: ohlcv rows}."""
+    days = np.array([parse_day(d) for d in history.get("dates") or []], dtype=np.int64)
+    engine.update(days, history.get("regime") or [], prices)
+    return engine.summary()
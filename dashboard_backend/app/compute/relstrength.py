@@ -0,0 +1,65 @@
+"""
+Relative strength vs each asset's benchmark (benchmarkId in the universe config).
+Assets and benchmarks share one aligned return panel; every benchmark is one column, aligned once
+no matter how many assets use it. RS line = asset index / benchmark index (vectorized division).
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from .correlation import build_return_panel
+
+RS_LOOKBACK = 63     # ~3 months: rsToBenchmark = RS_t / RS_{t-63}
+TREND_WINDOW = 20    # rsTrend = RS_t vs its 20-day mean, in %
+
+
+def _index_levels(returns: np.ndarray) -> np.ndarray:
+    """Cumulative log-index per column; NaN before each column's first observation."""
+    started = np.cumsum(~np.isnan(returns), axis=0) > 0
+    with np.errstate(invalid="ignore"):
+        logs = np.cumsum(np.log1p(np.nan_to_num(returns)), axis=0)
+    return np.where(started, logs, np.nan)
+
+
+def relative_strength(
+    asset_series: dict[str, list[dict[str, Any]]],
+    benchmark_of: dict[str, str],
+    benchmark_series: dict[str, list[dict[str, Any]]],
+) -> dict[str, dict[str, float]]:
+    """
+    asset_series: {asset_id: ohlcv}; benchmark_of: {asset_id: benchmarkId}; benchmark_series: {benchmarkId: ohlcv}.
+    Returns {asset_id: {"rsToBenchmark": x, "rsTrend": y}} for assets with a usable benchmark.
+    """
+    aids = [a for a in asset_series if benchmark_series.get(benchmark_of.get(a) or "")]
+    if not aids:
+        return {}
+    bids = sorted({benchmark_of[a] for a in aids})
+    levels = {f"asset:{a}": (asset_series[a] or [], "close", "pct") for a in aids}
+    levels.update({f"bench:{b}": (benchmark_series[b], "close", "pct") for b in bids})
+    panel = build_return_panel(levels)
+    if len(panel.dates) <= RS_LOOKBACK:
+        return {}
+
+    la = _index_levels(panel.columns([f"asset:{a}" for a in aids]))
+    lb = _index_levels(panel.columns([f"bench:{b}" for b in bids]))
+    col = np.array([bids.index(benchmark_of[a]) for a in aids])
+    rs_log = la - lb[:, col]  # log(asset / benchmark), all assets at once
+
+    rs_now = rs_log[-1]
+    rs_then = rs_log[-1 - RS_LOOKBACK]
+    with np.errstate(invalid="ignore", over="ignore"):
+        rs = np.exp(rs_now - rs_then)
+        recent = np.exp(rs_log[-TREND_WINDOW:] - rs_now)
+        trend = (1.0 / np.mean(recent, axis=0) - 1) * 100
+
+    out: dict[str, dict[str, float]] = {}
+    for i, aid in enumerate(aids):
+        row = {}
+        if np.isfinite(rs[i]):
+            row["rsToBenchmark"] = round(float(rs[i]), 4)
+        if np.isfinite(trend[i]):
+            row["rsTrend"] = round(float(trend[i]), 2)
+        out[aid] = row
+    return out
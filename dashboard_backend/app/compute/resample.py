@@ -0,0 +1,207 @@
+"""
+Daily -> weekly / monthly OHLCV bars. Periods: "W" = Monday-based weeks, "M" = calendar months, both as
+integer period numbers computed from the epoch day index; group boundaries are where the period number
+changes, and open / high / low / close / volume are ufunc.reduceat over those boundaries.
+
+Each bar carries `day`, the last daily observation in it, so as-of joins on bars never look ahead; the
+newest bar is the period to date. BarCache keeps the bars of every fetched series between builds and
+resamples only from the last cached bar on (the previous bar is checked against the new daily data;
+a mismatch -- adjusted history revised -- rebuilds the series from the daily window).
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..align import to_days
+from ..io.write_json import write_json_atomic
+
+FREQS = ("W", "M")
+# Bars kept per series and frequency (~10y weekly, 20y monthly)
+MAX_BARS = {"W": 520, "M": 240}
+_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def period_of(days: np.ndarray, freq: str) -> np.ndarray:
+    """Period number of each epoch day: week (day 0 was a Thursday) or month since 1970-01."""
+    days = np.asarray(days, dtype=np.int64)
+    if freq == "W":
+        return (days + 3) // 7
+    if freq == "M":
+        return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    raise ValueError(f"unknown frequency {freq!r}")
+
+
+def period_end(periods: np.ndarray, freq: str) -> np.ndarray:
+    """Nominal last day of each period as an epoch day: Friday of the week / last day of the month."""
+    periods = np.asarray(periods, dtype=np.int64)
+    if freq == "W":
+        return periods * 7 + 1
+    if freq == "M":
+        return (periods + 1).astype("datetime64[M]").astype("datetime64[D]").astype(np.int64) - 1
+    raise ValueError(f"unknown frequency {freq!r}")
+
+
+@dataclass(frozen=True)
+class Bars:
+    """Resampled bars of one series; all arrays have one entry per period, oldest first."""
+
+    period: np.ndarray
+    day: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.period)
+
+    def take(self, idx: np.ndarray | slice) -> "Bars":
+        return Bars(*(getattr(self, f)[idx] for f in ("period", "day", *_FIELDS)))
+
+    @staticmethod
+    def concat(a: "Bars", b: "Bars") -> "Bars":
+        return Bars(*(np.concatenate([getattr(a, f), getattr(b, f)]) for f in ("period", "day", *_FIELDS)))
+
+    def rows(self) -> list[list[float]]:
+        return np.column_stack([self.period, self.day, *(getattr(self, f) for f in _FIELDS)]).tolist()
+
+    @classmethod
+    def from_rows(cls, rows: list[list[float]]) -> "Bars":
+        arr = np.asarray(rows, dtype=float).reshape(-1, 2 + len(_FIELDS))
+        return cls(arr[:, 0].astype(np.int64), arr[:, 1].astype(np.int64), *(arr[:, 2 + i] for i in range(len(_FIELDS))))
+
+
+EMPTY = Bars(*(np.array([], dtype=np.int64) for _ in range(2)), *(np.array([], dtype=float) for _ in _FIELDS))
+
+
+def ohlcv_arrays(rows: list[dict[str, Any]]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (days, (T, 5) open / high / low / close / volume) sorted by day, rows without close dropped, last row
+    wins on duplicate days. Missing open / high / low take the close, missing volume is 0.
+    """
+    pts = [r for r in rows if r.get("close") is not None]
+    if not pts:
+        return np.array([], dtype=np.int64), np.zeros((0, len(_FIELDS)))
+    days = to_days([r["date"] for r in pts])
+    vals = np.array([[r.get(f) if r.get(f) is not None else np.nan for f in _FIELDS] for r in pts], dtype=float)
+    vals[:, :3] = np.where(np.isnan(vals[:, :3]), vals[:, 3:4], vals[:, :3])
+    vals[:, 4] = np.nan_to_num(vals[:, 4])
+    order = np.argsort(days, kind="stable")
+    days, vals = days[order], vals[order]
+    keep = np.append(days[1:] != days[:-1], True)
+    return days[keep], vals[keep]
+
+
+def period_bounds(days: np.ndarray, freq: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(period numbers, first row, last row) of each period present in sorted days."""
+    p = period_of(days, freq)
+    starts = np.flatnonzero(np.r_[True, p[1:] != p[:-1]])
+    ends = np.r_[starts[1:], len(p)] - 1
+    return p[starts], starts, ends
+
+
+def resample(days: np.ndarray, vals: np.ndarray, freq: str) -> Bars:
+    """Bars of sorted daily rows (ohlcv_arrays output), one pass of reduceat over the period boundaries."""
+    if not len(days):
+        return EMPTY
+    periods, starts, ends = period_bounds(days, freq)
+    return Bars(
+        period=periods,
+        day=days[ends],
+        open=vals[starts, 0],
+        high=np.fmax.reduceat(vals[:, 1], starts),
+        low=np.fmin.reduceat(vals[:, 2], starts),
+        close=vals[ends, 3],
+        volume=np.add.reduceat(vals[:, 4], starts),
+    )
+
+
+def resample_rows(rows: list[dict[str, Any]], freq: str) -> Bars:
+    return resample(*ohlcv_arrays(rows or []), freq)
+
+
+def period_return(bars: Bars, n: int) -> float | None:
+    """% change of the last close over the close n bars earlier; None without enough bars."""
+    if len(bars) <= n or not bars.close[-1 - n]:
+        return None
+    return float((bars.close[-1] / bars.close[-1 - n] - 1) * 100)
+
+
+def merge_bars(old: Bars, days: np.ndarray, vals: np.ndarray, freq: str) -> tuple[Bars, int]:
+    """
+    Bring cached bars up to date with a daily window; returns (bars, number of bars resampled).
+    Only the daily rows from the last cached period on are resampled when the previous bar's last day is
+    in the window with the same close; otherwise the whole window is, and on a changed close the cached
+    history is dropped.
+    """
+    if not len(days):
+        return old, 0
+    start, revised = 0, False
+    if len(old) > 1:
+        j = int(np.searchsorted(days, old.day[-2], side="right")) - 1
+        if j >= 0 and days[j] == old.day[-2]:
+            if np.isclose(vals[j, 3], old.close[-2], rtol=1e-9, atol=0.0):
+                start = int(np.searchsorted(period_of(days, freq), old.period[-1]))
+            else:
+                revised = True
+    new = resample(days[start:], vals[start:], freq)
+    if revised or not len(old):
+        return new, len(new)
+    if start == 0 and len(new):
+        # The window may start inside a cached period: the cached bar wins if it already reaches that bar's day
+        hit = np.flatnonzero(old.period == new.period[0])
+        if len(hit) and old.day[hit[0]] >= new.day[0]:
+            new = new.take(slice(1, None))
+    cut = new.period[0] if len(new) else old.period[-1] + 1
+    return Bars.concat(old.take(old.period < cut), new), len(new)
+
+
+class BarCache:
+    """Bars by (ticker, freq); load / save as JSON {"<ticker>|<freq>": [[period, day, o, h, l, c, v], ...]}."""
+
+    def __init__(self, freqs: tuple[str, ...] = FREQS) -> None:
+        self.freqs = freqs
+        self.bars: dict[tuple[str, str], Bars] = {}
+        self.last_resampled = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "BarCache":
+        bc = cls()
+        try:
+            for key, rows in json.loads(path.read_text(encoding="utf-8")).items():
+                ticker, _, freq = key.rpartition("|")
+                if freq in bc.freqs:
+                    bc.bars[(ticker, freq)] = Bars.from_rows(rows)
+        except (FileNotFoundError, ValueError, AttributeError, TypeError):
+            pass
+        return bc
+
+    def save(self, path: Path) -> None:
+        write_json_atomic(path, {f"{t}|{f}": b.rows() for (t, f), b in self.bars.items()})
+
+    def get(self, ticker: str, freq: str) -> Bars:
+        return self.bars.get((ticker, freq), EMPTY)
+
+    def update(self, ticker: str, rows: list[dict[str, Any]]) -> int:
+        """Merge one daily series into every frequency; returns the number of bars resampled."""
+        days, vals = ohlcv_arrays(rows or [])
+        n = 0
+        for freq in self.freqs:
+            bars, k = merge_bars(self.get(ticker, freq), days, vals, freq)
+            self.bars[(ticker, freq)] = bars.take(slice(-MAX_BARS[freq], None)) if len(bars) > MAX_BARS[freq] else bars
+            n += k
+        return n
+
+    def update_all(self, ohlcv: dict[str, list[dict[str, Any]]]) -> int:
+        self.last_resampled = sum(self.update(t, rows) for t, rows in ohlcv.items() if rows)
+        return self.last_resampled
+
+
+# Process-wide cache used by build_payload; the scheduler loads / saves it
+BAR_CACHE = BarCache()
@@ -0,0 +1,216 @@
+"""
+What-if scenarios over the last build: macro overrides -> RiskScore, regime, catalyst light,
+suggestedMaxWeight and action for every asset, without fetching anything. build_payload records its
+macro inputs, percentile windows and per-asset features (ScenarioInputs); K scenarios are then evaluated
+as (K,) / (K, N) arrays in one pass.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..io.write_json import write_json_atomic
+from .backtest import ACTIONS, GREEN, LIGHTS, RED, YELLOW, action_array, catalyst_array, suggested_array
+from .params import DEFAULT_PARAMS, RuleParams
+from .regime import regime_array
+from .scoring import risk_score_array
+
+# Scenario fields: levels and 1m changes of the macro inputs
+FIELDS = ("HY", "HY_chg", "REAL10Y", "REAL10Y_chg", "DXY", "DXY_chg", "PMI", "CORE_CPI")
+PCT_FIELDS = ("HY", "REAL10Y", "DXY", "PMI", "CORE_CPI")
+MAX_SCENARIOS = 200_000
+_LIGHT_CODE = {"green": GREEN, "yellow": YELLOW, "red": RED}
+
+
+@dataclass(frozen=True)
+class ScenarioInputs:
+    generated_at: str
+    macro: dict[str, float | None]          # FIELDS -> value used by the build (None = missing)
+    windows: dict[str, list[float]]         # PCT_FIELDS -> sorted percentile window ([] = fixed bands)
+    asset_ids: list[str]
+    base: list[float]
+    trend: list[str]
+    risk: list[str]
+    row_count: list[int]
+    vol_pct: list[float | None]
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "ScenarioInputs":
+        return cls(**d)
+
+
+_LAST: ScenarioInputs | None = None
+
+
+def remember(inputs: ScenarioInputs) -> None:
+    global _LAST
+    _LAST = inputs
+
+
+def save_last(path: Path) -> None:
+    if _LAST is not None:
+        write_json_atomic(path, _LAST.to_dict())
+
+
+def last_inputs(path: Path | None = None) -> ScenarioInputs | None:
+    """Inputs of the last build in this process, else the copy saved next to the other caches."""
+    global _LAST
+    if _LAST is None and path is not None:
+        try:
+            _LAST = ScenarioInputs.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+    return _LAST
+
+
+def scenario_grid(
+    inputs: ScenarioInputs,
+    scenarios: list[dict[str, float]] | None = None,
+    grid: dict[str, list[float]] | None = None,
+    mode: str = "shift",
+) -> dict[str, np.ndarray]:
+    """
+    (K,) arrays for every field. mode="shift": values are added to the build's inputs, and shifting a
+    level also shifts its 1m change (the move happened now) unless the change is given explicitly;
+    mode="set": values replace the inputs. Explicit scenarios come first, then the grid's product.
+    No scenarios and no grid -> one baseline scenario.
+    """
+    if mode not in ("shift", "set"):
+        raise ValueError("mode must be 'shift' or 'set'")
+    rows = list(scenarios or [])
+    grid = grid or {}
+    unknown = ({k for r in rows for k in r} | set(grid)) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"unknown scenario fields: {sorted(unknown)}; allowed: {list(FIELDS)}")
+    empty = sorted(f for f, v in grid.items() if not len(v))
+    if empty:
+        raise ValueError(f"grid values must be non-empty lists: {empty}")
+    n_grid = int(np.prod([len(v) for v in grid.values()])) if grid else 0
+    k = len(rows) + n_grid or 1
+    if k > MAX_SCENARIOS:
+        raise ValueError(f"too many scenarios ({k} > {MAX_SCENARIOS})")
+
+    given = {f: np.full(k, np.nan) for f in FIELDS}
+    for i, r in enumerate(rows):
+        for f, v in r.items():
+            given[f][i] = v
+    if grid:
+        keys = list(grid)
+        mesh = np.meshgrid(*[np.asarray(grid[f], dtype=float) for f in keys], indexing="ij")
+        for f, m in zip(keys, mesh):
+            given[f][len(rows):] = m.ravel()
+
+    out: dict[str, np.ndarray] = {}
+    for f in FIELDS:
+        base = np.nan if inputs.macro.get(f) is None else float(inputs.macro[f])
+        if mode == "set":
+            out[f] = np.where(np.isnan(given[f]), base, given[f])
+        else:
+            out[f] = base + np.nan_to_num(given[f])
+    if mode == "shift":
+        for f in ("HY", "REAL10Y", "DXY"):
+            implied = np.nan_to_num(given[f])
+            out[f + "_chg"] = np.where(np.isnan(given[f + "_chg"]), out[f + "_chg"] + implied, out[f + "_chg"])
+    return out
+
+
+def scenario_percentiles(inputs: ScenarioInputs, macro: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Empirical percentile of each scenario value in the build's window (NaN = fixed bands)."""
+    pcts = {}
+    for f in PCT_FIELDS:
+        w = np.asarray(inputs.windows.get(f) or [], dtype=float)
+        pcts[f] = np.searchsorted(w, macro[f], side="right") / len(w) * 100 if len(w) else np.full(len(macro[f]), np.nan)
+    return pcts
+
+
+def evaluate_scenarios(inputs: ScenarioInputs, macro: dict[str, np.ndarray], params: RuleParams = DEFAULT_PARAMS) -> dict[str, Any]:
+    """Columns for K scenarios: riskScore, regime, catalystLight and per-asset suggestedMaxWeight / action."""
+    pcts = scenario_percentiles(inputs, macro)
+    score, confidence = risk_score_array(macro["HY"], macro["REAL10Y"], macro["DXY"], macro["PMI"], macro["CORE_CPI"], pcts)
+    regime = regime_array(
+        macro["HY"], macro["HY_chg"], macro["REAL10Y"], macro["REAL10Y_chg"], macro["PMI"], macro["CORE_CPI"], score, params
+    )
+    # _catalyst_light: a missing real rate counts as below the threshold
+    real = np.where(np.isnan(macro["REAL10Y"]), -np.inf, macro["REAL10Y"])
+    catalyst = catalyst_array(regime, real, macro["DXY_chg"], params)
+
+    enough = np.asarray(inputs.row_count) >= params.min_history
+    trend = np.where(enough, [_LIGHT_CODE[x] for x in inputs.trend], YELLOW)[None, :] if inputs.asset_ids else np.zeros((1, 0))
+    risk = np.where(enough, [_LIGHT_CODE[x] for x in inputs.risk], YELLOW)[None, :] if inputs.asset_ids else np.zeros((1, 0))
+    vol_pct = np.array([np.nan if v is None else v for v in inputs.vol_pct], dtype=float)
+    suggested = suggested_array(np.asarray(inputs.base, dtype=float), regime, vol_pct, params)
+    actions = action_array(trend, risk, catalyst, suggested)
+
+    lights = np.array(LIGHTS)
+    names = np.array(ACTIONS)
+    return {
+        "riskScore": score.tolist(),
+        "riskScoreConfidence": confidence.tolist(),
+        "regime": regime.tolist(),
+        "catalystLight": lights[catalyst].tolist(),
+        "assets": {
+            aid: {"suggestedMaxWeight": suggested[:, j].tolist(), "action": names[actions[:, j]].tolist()}
+            for j, aid in enumerate(inputs.asset_ids)
+        },
+    }
+
+
+def run_scenarios(
+    inputs: ScenarioInputs,
+    scenarios: list[dict[str, float]] | None = None,
+    grid: dict[str, list[float]] | None = None,
+    mode: str = "shift",
+    include_assets: bool = True,
+    params: RuleParams = DEFAULT_PARAMS,
+) -> dict[str, Any]:
+    """scenario_grid + evaluate_scenarios; "inputs" echoes the fields that vary across scenarios."""
+    macro = scenario_grid(inputs, scenarios, grid, mode)
+    out = evaluate_scenarios(inputs, macro, params)
+    if not include_assets:
+        out.pop("assets")
+    varied = {f for r in scenarios or [] for f in r} | set(grid or {})
+    return {
+        "generatedAt": inputs.generated_at,
+        "mode": mode,
+        "count": len(out["regime"]),
+        "inputs": {f: np.round(macro[f], 4).tolist() for f in FIELDS if f in varied},
+        **out,
+    }
+
+
+def inputs_from_build(
+    generated_at: str,
+    macro_in: dict[str, dict[str, Any]],
+    windows: dict[str, list[float]],
+    asset_rows: list[tuple[str, float, str, str, int, float | None]],
+) -> ScenarioInputs:
+    """asset_rows: (id, baseMaxWeight, raw trend light, raw risk light, row_count, volPercentile1y)."""
+    macro = {
+        "HY": macro_in["HY"].get("value"),
+        "HY_chg": macro_in["HY"].get("change1m"),
+        "REAL10Y": macro_in["REAL10Y"].get("value"),
+        "REAL10Y_chg": macro_in["REAL10Y"].get("change1m"),
+        "DXY": macro_in["DXY"].get("value"),
+        "DXY_chg": macro_in["DXY"].get("change1m"),
+        "PMI": macro_in["PMI"].get("value"),
+        "CORE_CPI": macro_in["CORE_CPI"].get("value"),
+    }
+    cols = list(zip(*asset_rows)) if asset_rows else [[]] * 6
+    return ScenarioInputs(
+        generated_at=generated_at,
+        macro=macro,
+        windows={f: list(windows.get(f) or []) for f in PCT_FIELDS},
+        asset_ids=list(cols[0]),
+        base=[float(x) for x in cols[1]],
+        trend=list(cols[2]),
+        risk=list(cols[3]),
+        row_count=[int(x) for x in cols[4]],
+        vol_pct=list(cols[5]),
+    )
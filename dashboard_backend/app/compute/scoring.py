@@ -1,15 +1,21 @@
 """
 RiskScore 0-100: Credit 35% + Liquidity 30% + Growth 20% + Inflation 15%.
 Confidence 0-1: 缺 1 个宏观 -> 0.8, 缺 2 -> 0.6, 缺 3 -> 0.4.
+Components use each macro's empirical percentile ("percentile", see compute.percentile) when present,
+otherwise the fixed bands below.
 """
 from __future__ import annotations
 
 from typing import Any
 
+import numpy as np
 
-def _pct(val: float | None, low: float, high: float, invert: bool = False) -> float:
+
+def _pct(val: float | None, low: float, high: float, invert: bool = False, pct: float | None = None) -> float:
     if val is None:
         return 50.0
+    if pct is not None:
+        return 100 - pct if invert else pct
     p = (val - low) / (high - low) * 100 if high != low else 50.0
     p = max(0, min(100, p))
     return 100 - p if invert else p
@@ -40,12 +46,67 @@ def risk_score(
     n = len(missing)
     confidence = 1.0 if n == 0 else (0.8 if n == 1 else (0.6 if n == 2 else 0.4))
 
-    credit = _pct(hy.get("value"), 2, 8, invert=True)
-    liquidity_ry = _pct(real10y.get("value"), 0, 3, invert=True)
-    liquidity_dxy = _pct(dxy.get("value"), 90, 130, invert=True)
+    credit = _pct(hy.get("value"), 2, 8, invert=True, pct=hy.get("percentile"))
+    liquidity_ry = _pct(real10y.get("value"), 0, 3, invert=True, pct=real10y.get("percentile"))
+    liquidity_dxy = _pct(dxy.get("value"), 90, 130, invert=True, pct=dxy.get("percentile"))
     liquidity = (liquidity_ry + liquidity_dxy) / 2
-    growth = _pct(pmi.get("value"), 35, 65, invert=False) if pmi.get("value") is not None else 50.0
-    inflation = _pct(core_cpi.get("value"), 1, 5, invert=True) if core_cpi.get("value") is not None else 50.0
+    growth = _pct(pmi.get("value"), 35, 65, invert=False, pct=pmi.get("percentile")) if pmi.get("value") is not None else 50.0
+    inflation = _pct(core_cpi.get("value"), 1, 5, invert=True, pct=core_cpi.get("percentile")) if core_cpi.get("value") is not None else 50.0
     total = 0.35 * credit + 0.30 * liquidity + 0.20 * growth + 0.15 * inflation
     score = max(0, min(100, round(total, 1)))
     return (score, confidence, missing)
+
+
+def _pct_array(val: np.ndarray, low: float, high: float, invert: bool = False, pct: np.ndarray | None = None) -> np.ndarray:
+    p = np.clip((val - low) / (high - low) * 100, 0, 100)
+    if pct is not None:
+        p = np.where(np.isnan(pct), p, pct)
+    p = 100 - p if invert else p
+    return np.where(np.isnan(val), 50.0, p)
+
+
+# RiskScore = sum of the weighted components
+WEIGHTS = {"credit": 0.35, "liquidity": 0.30, "growth": 0.20, "inflation": 0.15}
+
+
+def risk_components_array(
+    hy: np.ndarray,
+    real10y: np.ndarray,
+    dxy: np.ndarray,
+    pmi: np.ndarray,
+    core_cpi: np.ndarray,
+    pcts: dict[str, np.ndarray] | None = None,
+) -> dict[str, np.ndarray]:
+    """Weighted component points {"credit", "liquidity", "growth", "inflation"}; their sum is the unrounded score."""
+    pc = pcts or {}
+    credit = _pct_array(hy, 2, 8, invert=True, pct=pc.get("HY"))
+    liquidity = (
+        _pct_array(real10y, 0, 3, invert=True, pct=pc.get("REAL10Y")) + _pct_array(dxy, 90, 130, invert=True, pct=pc.get("DXY"))
+    ) / 2
+    growth = _pct_array(pmi, 35, 65, pct=pc.get("PMI"))
+    inflation = _pct_array(core_cpi, 1, 5, invert=True, pct=pc.get("CORE_CPI"))
+    return {
+        "credit": WEIGHTS["credit"] * credit,
+        "liquidity": WEIGHTS["liquidity"] * liquidity,
+        "growth": WEIGHTS["growth"] * growth,
+        "inflation": WEIGHTS["inflation"] * inflation,
+    }
+
+
+def risk_score_array(
+    hy: np.ndarray,
+    real10y: np.ndarray,
+    dxy: np.ndarray,
+    pmi: np.ndarray,
+    core_cpi: np.ndarray,
+    pcts: dict[str, np.ndarray] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    risk_score over aligned value arrays (NaN = missing). Returns (score, confidence) arrays.
+    pcts: optional {"HY", "REAL10Y", "DXY", "PMI", "CORE_CPI": empirical percentile arrays}, NaN = use bands.
+    """
+    n = sum(np.isnan(a).astype(int) for a in (hy, real10y, dxy, pmi, core_cpi))
+    confidence = np.select([n == 0, n == 1, n == 2], [1.0, 0.8, 0.6], 0.4)
+    c = risk_components_array(hy, real10y, dxy, pmi, core_cpi, pcts)
+    total = c["credit"] + c["liquidity"] + c["growth"] + c["inflation"]
+    return np.clip(np.round(total, 1), 0, 100), confidence
@@ -0,0 +1,87 @@
+"""
+Payload sections and their inputs between refreshes. A refresh fetches only the sections that are due and
+recomputes the payload parts depending on them; the other parts are carried over from the last payload.
+
+    macro:                      FRED inputs -> dailySignal, macroSwitches, macroDataStatus, regimeHistory
+    crypto / hk / futures / us: price series of that market group (Universe.groups)
+    btc:                        intraday BTC daily bars folded from the kline ring (compute.intraday)
+    weekly:                     Kondratieff chain, recomputed from the weekly bar cache (no fetch)
+
+Every market group feeds the whole asset block (technicalData, assets, assetSignals, dataStatus and the
+cross-asset parts: correlations share one calendar, the GARCH fit, portfolioRisk, riskSimulation,
+regimeStats, riskAttribution); features stay memoized per series, so unchanged assets are not recomputed.
+btc recomputes no part: builder.refresh_intraday only swaps in the entries of the intraday assets, and the
+cross-asset parts pick up the new bars at the next crypto refresh.
+
+A section is marked refreshed once its fetch finishes, even when some tickers / FRED series failed; those are
+kept in SectionInputs.failed and refetched alone (builder.retry_failed) with a doubling backoff until they
+come back or the section's next release refetches it whole.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+from ..universe import MARKET_GROUPS
+
+SECTIONS = ("macro", *MARKET_GROUPS, "weekly", "btc")
+# Payload parts recomputed when a section is refreshed
+DEPENDENTS = {
+    "macro": ("macro", "assets", "weekly"),
+    **{s: ("assets",) for s in MARKET_GROUPS},
+    "btc": (),
+    "weekly": ("weekly",),
+}
+PARTS = ("macro", "assets", "weekly")
+# Backoff of a failed ticker / series: RETRY_MINUTES after the first failure, doubling up to RETRY_MAX_MINUTES
+RETRY_MINUTES = 15
+RETRY_MAX_MINUTES = 6 * 60
+
+
+class SectionInputs:
+    """Fetched inputs of every section (macro dicts, price rows / status by ticker) and their refresh times."""
+
+    def __init__(self) -> None:
+        self.macro: dict[str, dict[str, Any]] = {}
+        self.ohlcv: dict[str, list[dict[str, Any]]] = {}
+        self.status: dict[str, dict[str, Any]] = {}
+        self.refreshed: dict[str, datetime] = {}
+        # {section: {ticker / FRED id: (failed attempts, next retry)}}
+        self.failed: dict[str, dict[str, tuple[int, datetime]]] = {}
+        # Last macro block (builder._macro_block): regime, drivers, full history for the parts reusing it
+        self.macro_block: dict[str, Any] = {}
+
+    def mark(self, sections: Iterable[str], at: datetime) -> None:
+        self.refreshed.update(dict.fromkeys(sections, at))
+
+    def record(self, section: str, fetched: Iterable[str], failed: Iterable[str], at: datetime) -> None:
+        """Outcome of fetching `fetched` items of a section: the ones in `failed` back off, the others are cleared."""
+        cur = self.failed.setdefault(section, {})
+        bad = set(failed)
+        for item in fetched:
+            if item not in bad:
+                cur.pop(item, None)
+                continue
+            n = cur.get(item, (0, at))[0] + 1
+            cur[item] = (n, at + timedelta(minutes=min(RETRY_MINUTES * 2 ** (n - 1), RETRY_MAX_MINUTES)))
+        if not cur:
+            self.failed.pop(section)
+
+    def retry_due(self, now: datetime) -> dict[str, list[str]]:
+        """{section: failed items whose backoff has elapsed}."""
+        out = {s: sorted(i for i, (_, t) in items.items() if t <= now) for s, items in self.failed.items()}
+        return {s: items for s, items in out.items() if items}
+
+    def next_retry(self) -> datetime | None:
+        return min((t for items in self.failed.values() for _, t in items.values()), default=None)
+
+    def refreshed_iso(self) -> dict[str, str]:
+        return {s: self.refreshed[s].strftime("%Y-%m-%dT%H:%M:%SZ") for s in SECTIONS if s in self.refreshed}
+
+
+def parts_of(sections: Iterable[str]) -> set[str]:
+    return {p for s in sections for p in DEPENDENTS.get(s, ())}
+
+
+# Process-wide inputs behind the last payload; build_payload fills every section
+SECTION_INPUTS = SectionInputs()
@@ -0,0 +1,119 @@
+"""
+Forward-looking risk of the suggested allocation: block bootstrap of the universe's historical joint
+daily returns (whole rows of the business-day return panel, so cross-asset co-moves are kept), held at
+fixed weights. For each horizon: distribution of max drawdown and of the period return (VaR / CVaR).
+Paths are simulated in chunks of SIM_CHUNK, so memory is O(SIM_CHUNK * horizon) whatever SIM_PATHS is.
+SIMULATION=0 switches the stage off; SIM_SEED makes it reproducible.
+"""
+from __future__ import annotations
+
+import os
+from typing import Any
+
+import numpy as np
+
+from ..align import day_str
+from .correlation import build_return_panel
+
+SIM_PATHS = int(os.environ.get("SIM_PATHS", "10000"))
+SIM_CHUNK = 2000
+SIM_HORIZONS = {"1m": 21, "3m": 63}
+BLOCK_DAYS = 10
+HISTORY_DAYS = 756  # ~3y of joint rows to resample from
+MIN_ROWS = 120
+
+
+def simulation_enabled() -> bool:
+    return os.environ.get("SIMULATION", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _seed() -> int | None:
+    v = os.environ.get("SIM_SEED", "").strip()
+    return int(v) if v else None
+
+
+def bootstrap_paths(rets: np.ndarray, n_paths: int, horizon: int, block: int, rng: np.random.Generator) -> np.ndarray:
+    """(n_paths, horizon) resampled returns: consecutive blocks from random starts, wrapping around the end."""
+    n_blocks = -(-horizon // block)
+    starts = rng.integers(0, len(rets), size=(n_paths, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block)).reshape(n_paths, -1)[:, :horizon] % len(rets)
+    return rets[idx]
+
+
+def path_stats(path_rets: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(max drawdown, period return) per path; equity starts at 1 before the first return."""
+    eq = np.cumprod(1 + path_rets, axis=1)
+    peak = np.maximum(np.maximum.accumulate(eq, axis=1), 1.0)
+    return np.max(1 - eq / peak, axis=1), eq[:, -1] - 1
+
+
+def simulate_portfolio(
+    port_rets: np.ndarray,
+    horizons: dict[str, int] = SIM_HORIZONS,
+    n_paths: int = SIM_PATHS,
+    block: int = BLOCK_DAYS,
+    seed: int | None = None,
+    chunk: int = SIM_CHUNK,
+) -> dict[str, dict[str, Any]]:
+    """Drawdown / return quantiles per horizon for one daily portfolio return series."""
+    rng = np.random.default_rng(seed)
+    out = {}
+    for name, h in horizons.items():
+        dd = np.empty(n_paths)
+        ret = np.empty(n_paths)
+        for lo in range(0, n_paths, chunk):
+            hi = min(lo + chunk, n_paths)
+            dd[lo:hi], ret[lo:hi] = path_stats(bootstrap_paths(port_rets, hi - lo, h, block, rng))
+        var95, var99 = -np.percentile(ret, [5, 1])
+        out[name] = {
+            "days": h,
+            "maxDrawdown": {f"p{p}": round(float(v) * 100, 2) for p, v in zip((50, 90, 95, 99), np.percentile(dd, [50, 90, 95, 99]))},
+            "probDrawdownOver10": round(float(np.mean(dd > 0.10)) * 100, 1),
+            "return": {f"p{p}": round(float(v) * 100, 2) for p, v in zip((5, 50, 95), np.percentile(ret, [5, 50, 95]))},
+            "var95": round(float(var95) * 100, 2),
+            "var99": round(float(var99) * 100, 2),
+            "cvar95": round(float(-ret[ret <= -var95].mean()) * 100, 2) if np.any(ret <= -var95) else None,
+        }
+    return out
+
+
+def simulate_allocation(
+    asset_series: dict[str, list[dict[str, Any]]],
+    weights: dict[str, float],
+    n_paths: int = SIM_PATHS,
+    seed: int | None = None,
+) -> dict[str, Any]:
+    """
+    payload "riskSimulation": bootstrap of the last HISTORY_DAYS joint rows since every weighted asset has
+    data (missing returns after that count as 0). Weighted assets with fewer than MIN_ROWS returns are left
+    out first (listed in "excluded") so one new listing does not cut the common history. {} when nothing
+    with enough history is weighted.
+    """
+    aids = [a for a in asset_series if weights.get(a, 0) > 0]
+    if not aids:
+        return {}
+    panel = build_return_panel({f"asset:{a}": (asset_series[a] or [], "close", "pct") for a in asset_series})
+    x = panel.columns([f"asset:{a}" for a in aids])
+    ok = ~np.isnan(x)
+    has = ok.sum(axis=0) >= MIN_ROWS  # short / missing histories are left out
+    excluded = [a for a, h in zip(aids, has) if not h]
+    if not has.any():
+        return {}
+    aids = [a for a, h in zip(aids, has) if h]
+    x = x[:, has]
+    first = int(np.max(np.argmax(ok[:, has], axis=0)))
+    x = np.nan_to_num(x[first:][-HISTORY_DAYS:])
+    if len(x) < MIN_ROWS:
+        return {}
+    w = np.array([weights[a] for a in aids], dtype=float)
+    seed = _seed() if seed is None else seed
+    return {
+        "asOf": day_str(int(panel.dates[-1])),
+        "paths": n_paths,
+        "blockDays": BLOCK_DAYS,
+        "historyDays": len(x),
+        "seed": seed,
+        "grossWeight": round(float(w.sum()), 4),
+        "excluded": excluded,
+        "horizons": simulate_portfolio(x @ w, n_paths=n_paths, seed=seed),
+    }
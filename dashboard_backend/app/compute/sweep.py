@@ -0,0 +1,169 @@
+"""
+Parameter sweep: evaluate many RuleParams through the backtest engine and rank them.
+The aligned BacktestData is prepared once and placed in shared memory; pool workers attach to it
+(no per-task pickling of the (T, N) arrays) and only receive parameter dicts.
+"""
+from __future__ import annotations
+
+import itertools
+import random
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Iterable
+
+import numpy as np
+
+from .backtest import BacktestData, evaluate
+from .params import DEFAULT_PARAMS, RuleParams
+from .pool import FEATURE_WORKERS, chunks
+
+# Default search space around the production thresholds
+DEFAULT_SPACE: dict[str, list[Any]] = {
+    "min_history": [120, 220, 320],
+    "risk_pct_high": [60.0, 70.0, 80.0],
+    "risk_pct_mid": [40.0, 50.0, 60.0],
+    "hy_elevated": [4.5, 5.0, 5.5],
+    "hy_stress": [5.5, 6.0, 7.0],
+    "real_rate_tight": [1.0, 1.5, 2.0],
+    "regime_mult_c": [0.5, 0.7, 0.85],
+}
+RANK_KEYS = ("sharpe", "cagr", "finalEquity", "maxDrawdown")
+
+
+def param_grid(space: dict[str, list[Any]]) -> list[RuleParams]:
+    """Cartesian product of the listed values (other fields at their defaults)."""
+    keys = list(space)
+    return [RuleParams.from_dict(dict(zip(keys, combo))) for combo in itertools.product(*(space[k] for k in keys))]
+
+
+def param_samples(space: dict[str, Any], n: int, seed: int = 0) -> list[RuleParams]:
+    """n random sets: list values are sampled uniformly, (lo, hi) tuples uniformly in the range."""
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        d = {}
+        for k, v in space.items():
+            if isinstance(v, tuple):
+                lo, hi = v
+                d[k] = rnd.randint(lo, hi) if isinstance(lo, int) and isinstance(hi, int) else rnd.uniform(lo, hi)
+            else:
+                d[k] = rnd.choice(list(v))
+        out.append(RuleParams.from_dict(d))
+    return out
+
+
+class SharedArrays:
+    """Named numpy arrays copied into SharedMemory blocks; spec() is what workers need to attach."""
+
+    def __init__(self, arrays: dict[str, np.ndarray]) -> None:
+        self._blocks: list[shared_memory.SharedMemory] = []
+        self._spec: dict[str, tuple[str, tuple[int, ...], str]] = {}
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+            self._blocks.append(shm)
+            self._spec[name] = (shm.name, arr.shape, arr.dtype.str)
+
+    def spec(self) -> dict[str, tuple[str, tuple[int, ...], str]]:
+        return dict(self._spec)
+
+    def close(self) -> None:
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+_WORKER_DATA: BacktestData | None = None
+_WORKER_BLOCKS: list[shared_memory.SharedMemory] = []
+
+
+def _attach(asset_ids: tuple[str, ...], spec: dict[str, tuple[str, tuple[int, ...], str]]) -> None:
+    """Pool initializer: map the shared blocks as read-only arrays (kept referenced for the worker's life)."""
+    global _WORKER_DATA
+    arrays = {}
+    for name, (shm_name, shape, dtype) in spec.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _WORKER_BLOCKS.append(shm)
+        arr = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        arr.flags.writeable = False
+        arrays[name] = arr
+    _WORKER_DATA = BacktestData.from_arrays(asset_ids, arrays)
+
+
+def _evaluate_chunk(param_dicts: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    assert _WORKER_DATA is not None
+    return [evaluate(_WORKER_DATA, RuleParams.from_dict(d)).metrics() for d in param_dicts]
+
+
+def returns_chunk(param_dicts: list[dict[str, Any]]) -> list[np.ndarray]:
+    """Daily strategy returns (summed over assets) per param dict, against the worker's data (map_params fn)."""
+    assert _WORKER_DATA is not None
+    return [evaluate(_WORKER_DATA, RuleParams.from_dict(d)).strategy_returns.sum(axis=1) for d in param_dicts]
+
+
+def map_params(data: BacktestData, params: list[RuleParams], fn: Any, workers: int | None = None) -> list[Any]:
+    """
+    fn(list of param dicts) -> one result per dict, run against `data` (_evaluate_chunk / returns_chunk).
+    Workers attach to `data` through shared memory; in-process when workers <= 1 or the pool cannot start.
+    """
+    global _WORKER_DATA
+    workers = FEATURE_WORKERS if workers is None else workers
+    dicts = [p.to_dict() for p in params]
+    if workers > 1 and len(dicts) > 1:
+        try:
+            with SharedArrays(data.arrays()) as shared:
+                with ProcessPoolExecutor(
+                    max_workers=workers, initializer=_attach, initargs=(data.asset_ids, shared.spec())
+                ) as pool:
+                    parts = list(pool.map(fn, chunks(dicts, workers * 4)))
+            return [r for part in parts for r in part]
+        except (OSError, BrokenProcessPool):
+            pass
+    prev, _WORKER_DATA = _WORKER_DATA, data
+    try:
+        return fn(dicts)
+    finally:
+        _WORKER_DATA = prev
+
+
+def _rank(params: list[RuleParams], metrics: list[dict[str, Any]], rank_by: str) -> list[dict[str, Any]]:
+    sign = 1 if rank_by == "maxDrawdown" else -1
+    rows = [{"params": p.diff(), "metrics": m} for p, m in zip(params, metrics)]
+    rows.sort(key=lambda r: sign * (r["metrics"].get(rank_by) or 0.0))
+    for i, r in enumerate(rows, 1):
+        r["rank"] = i
+    return rows
+
+
+def run_sweep(
+    data: BacktestData,
+    params: Iterable[RuleParams],
+    workers: int | None = None,
+    rank_by: str = "sharpe",
+    top: int | None = 20,
+) -> dict[str, Any]:
+    """
+    Evaluate every parameter set on `data`; returns {"rankBy", "evaluated", "baseline", "results": [...]}
+    sorted best-first (maxDrawdown ascending, other keys descending). Runs in-process when workers <= 1.
+    """
+    if rank_by not in RANK_KEYS:
+        raise ValueError(f"rank_by must be one of {RANK_KEYS}")
+    params = list(params)
+    metrics = map_params(data, params, _evaluate_chunk, workers)
+
+    ranked = _rank(params, metrics, rank_by)
+    return {
+        "rankBy": rank_by,
+        "evaluated": len(params),
+        "baseline": evaluate(data, DEFAULT_PARAMS).metrics(),
+        "results": ranked[:top] if top else ranked,
+    }
@@ -0,0 +1,219 @@
+"""
+Volatility forecasts per asset: EWMA (RiskMetrics, lambda 0.94) and GARCH(1,1) with variance targeting,
+both on each asset's own daily log returns (last VOL_DEPTH observations, right-aligned as in
+compute.features). Outputs the annualized 1m forecast vol and its percentile against the asset's own
+conditional vol over the last year -- an alternative input to the risk light / _risk_mult
+(RISK_VOL_SOURCE=garch|ewma; default "price" keeps volPercentile1y).
+
+GARCH fits run for all assets at once: a batched pattern search on (alpha, beta) whose likelihood
+evaluations are (T, N * candidates) recursions. Fitted parameters are kept per asset (and persisted by
+the scheduler), so the next build starts from them with a small step and converges in a few rounds.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..io.write_json import write_json_atomic
+from .features import _close_matrix
+
+VOL_DEPTH = 756
+MIN_RETURNS = 120
+EWMA_LAMBDA = 0.94
+HORIZON = 21
+PCT_WINDOW = 252
+ANNUAL = 252
+# Pattern search: start point / step cold vs warm (doubles after a move, up to COLD_STEP), stop below MIN_STEP
+COLD_START = (0.08, 0.90)
+COLD_STEP = 0.04
+WARM_STEP = 0.005
+MIN_STEP = 0.001
+MAX_ROUNDS = 40
+MAX_PERSISTENCE = 0.999
+LL_TOL = 1e-3  # a move must improve the log-likelihood by more than this
+
+
+def vol_source() -> str:
+    """Input of the risk light and _risk_mult: "price" (volPercentile1y), "garch" or "ewma"."""
+    v = os.environ.get("RISK_VOL_SOURCE", "price").strip().lower()
+    return v if v in ("price", "garch", "ewma") else "price"
+
+
+def log_returns(closes_list: list[np.ndarray], depth: int = VOL_DEPTH) -> np.ndarray:
+    """(depth, N) demeaned daily log returns, NaN-padded at the top for short histories."""
+    mat, _ = _close_matrix(closes_list, depth + 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.diff(np.log(np.where(mat > 0, mat, np.nan)), axis=0)
+    return r - np.nanmean(r, axis=0) if r.size else r
+
+
+def ewma_variance(r: np.ndarray, lam: float = EWMA_LAMBDA) -> np.ndarray:
+    """(T + 1, N): variance for each day given the returns before it; row -1 is tomorrow's forecast."""
+    t_len, n = r.shape
+    h = np.full((t_len + 1, n), np.nan)
+    head = r[:30]
+    cnt = np.sum(~np.isnan(head), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        prev = np.where(cnt > 0, np.nansum(head * head, axis=0) / cnt, np.nan)  # returns are demeaned
+    for t in range(t_len):
+        h[t] = prev
+        x = r[t]
+        prev = np.where(np.isnan(x), prev, lam * np.nan_to_num(prev, nan=x * x) + (1 - lam) * x * x)
+    h[t_len] = prev
+    return h
+
+
+def garch_variance(r: np.ndarray, alpha: np.ndarray, beta: np.ndarray, var: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    GARCH(1,1) with omega = var * (1 - alpha - beta); r (T, M), parameters (M,).
+    Returns (variance path (T + 1, M), log-likelihood (M,)); NaN returns leave the variance unchanged.
+    """
+    omega = var * (1 - alpha - beta)
+    t_len, m = r.shape
+    h = np.empty((t_len + 1, m))
+    ll = np.zeros(m)
+    prev = var.copy()
+    for t in range(t_len):
+        h[t] = prev
+        x = r[t]
+        ok = ~np.isnan(x)
+        x2 = np.where(ok, x * x, 0.0)
+        ll -= np.where(ok, 0.5 * (np.log(prev) + x2 / prev), 0.0)
+        prev = np.where(ok, omega + alpha * x2 + beta * prev, prev)
+    h[t_len] = prev
+    return h, ll
+
+
+def _feasible(alpha: np.ndarray, beta: np.ndarray) -> np.ndarray:
+    return (alpha >= 0) & (beta >= 0) & (alpha + beta <= MAX_PERSISTENCE)
+
+
+def fit_garch(r: np.ndarray, start: np.ndarray | None = None, step: float | np.ndarray = COLD_STEP) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Batched pattern search over (alpha, beta) for every column of r at once.
+    start: (N, 2) initial parameters (warm start); step: initial step (scalar or (N,)).
+    Returns (params (N, 2), log-likelihood (N,), rounds used (N,)).
+    """
+    n = r.shape[1]
+    var = np.nanvar(r, axis=0)
+    var = np.where(var > 0, var, 1e-8)
+    p = np.tile(COLD_START, (n, 1)) if start is None else np.asarray(start, dtype=float).copy()
+    bad = ~_feasible(p[:, 0], p[:, 1])
+    p[bad] = COLD_START
+    step = np.broadcast_to(np.asarray(step, dtype=float), (n,)).copy()
+    moves = np.array([[0, 0], [1, 0], [-1, 0], [0, 1], [0, -1], [1, -1], [-1, 1]], dtype=float)
+    rounds = np.zeros(n, dtype=np.int64)
+    best_ll = np.full(n, -np.inf)
+    for _ in range(MAX_ROUNDS):
+        active = step >= MIN_STEP
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        cand = p[idx, None, :] + step[idx, None, None] * moves[None, :, :]  # (A, K, 2)
+        a, b = cand[..., 0].ravel(), cand[..., 1].ravel()
+        ok = _feasible(a, b)
+        k = len(moves)
+        _, ll = garch_variance(
+            np.repeat(r[:, idx], k, axis=1),
+            np.where(ok, a, COLD_START[0]),
+            np.where(ok, b, COLD_START[1]),
+            np.repeat(var[idx], k),
+        )
+        ll = np.where(ok, ll, -np.inf).reshape(len(idx), k)
+        j = np.argmax(ll, axis=1)
+        rows = np.arange(len(idx))
+        j = np.where(ll[rows, j] > ll[:, 0] + LL_TOL, j, 0)
+        moved = j != 0
+        p[idx] = cand[rows, j]
+        best_ll[idx] = ll[rows, j]
+        step[idx] = np.where(moved, np.minimum(step[idx] * 2, COLD_STEP), step[idx] / 2)  # expand on success
+        rounds[idx] += 1
+    return p, best_ll, rounds
+
+
+def horizon_vol(h_next: np.ndarray, persistence: np.ndarray, var: np.ndarray, horizon: int = HORIZON) -> np.ndarray:
+    """Annualized vol of the average variance over the next `horizon` days (mean-reverting to var)."""
+    k = np.arange(horizon)[:, None]
+    avg = var + np.mean(persistence ** k, axis=0) * (h_next - var)
+    return np.sqrt(np.maximum(avg, 0.0) * ANNUAL)
+
+
+def _percentile_last(h: np.ndarray, window: int = PCT_WINDOW, rtol: float = 1e-9) -> np.ndarray:
+    """
+    Mid-rank % of the forecast (row -1) among the last `window` conditional variances, per column;
+    values within rtol count as ties (a flat GARCH path, alpha = 0, ranks at 50).
+    """
+    win = h[-window - 1:-1]
+    last = h[-1]
+    n = np.sum(~np.isnan(win), axis=0)
+    tie = np.abs(win - last) <= rtol * np.abs(last)
+    below = (win < last) & ~tie
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, (np.sum(below, axis=0) + 0.5 * np.sum(tie, axis=0)) / n * 100, np.nan)
+
+
+class VolForecaster:
+    """GARCH parameters by asset id, reused as warm starts; load / save as JSON."""
+
+    def __init__(self) -> None:
+        self.params: dict[str, list[float]] = {}
+        self.last_rounds = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "VolForecaster":
+        vf = cls()
+        try:
+            vf.params = {k: list(v) for k, v in json.loads(path.read_text(encoding="utf-8")).items()}
+        except (FileNotFoundError, ValueError, AttributeError, TypeError):
+            pass
+        return vf
+
+    def save(self, path: Path) -> None:
+        write_json_atomic(path, self.params)
+
+    def forecast(self, closes_by_id: dict[str, np.ndarray]) -> dict[str, dict[str, Any]]:
+        """
+        {asset id: {"ewmaVolAnn", "ewmaVolPercentile1y", "garchVolAnn", "garchVolPercentile1y", "garchParams"}}
+        for assets with at least MIN_RETURNS returns (vols in %). Flat series (zero variance) get no
+        forecast and keep no parameters.
+        """
+        aids = [a for a, c in closes_by_id.items() if len(c) > MIN_RETURNS]
+        if not aids:
+            return {}
+        r = log_returns([closes_by_id[a] for a in aids])
+        var = np.nanvar(r, axis=0)
+        live = var > 0
+        for aid in (a for a, k in zip(aids, live) if not k):
+            self.params.pop(aid, None)
+        aids, r, var = [a for a, k in zip(aids, live) if k], r[:, live], var[live]
+        if not aids:
+            return {}
+        warm = np.array([aid in self.params for aid in aids])
+        start = np.array([self.params.get(a, COLD_START) for a in aids], dtype=float)
+        p, _, rounds = fit_garch(r, start, np.where(warm, WARM_STEP, COLD_STEP))
+        self.last_rounds = int(rounds.max()) if len(rounds) else 0
+        h_g, _ = garch_variance(r, p[:, 0], p[:, 1], var)
+        h_e = ewma_variance(r)
+        g_vol = horizon_vol(h_g[-1], p[:, 0] + p[:, 1], var)
+        e_vol = np.sqrt(h_e[-1] * ANNUAL)  # EWMA: flat term structure
+        g_pct, e_pct = _percentile_last(h_g), _percentile_last(h_e)
+
+        out = {}
+        for j, aid in enumerate(aids):
+            self.params[aid] = [float(p[j, 0]), float(p[j, 1])]
+            out[aid] = {
+                "ewmaVolAnn": round(float(e_vol[j]) * 100, 2),
+                "ewmaVolPercentile1y": round(float(e_pct[j]), 1),
+                "garchVolAnn": round(float(g_vol[j]) * 100, 2),
+                "garchVolPercentile1y": round(float(g_pct[j]), 1),
+                "garchParams": {"alpha": round(float(p[j, 0]), 4), "beta": round(float(p[j, 1]), 4)},
+            }
+        return out
+
+
+# Process-wide forecaster used by build_payload; the scheduler loads / saves its parameters
+VOL_FORECASTER = VolForecaster()
@@ -0,0 +1,128 @@
+"""
+Walk-forward: pick RuleParams on a rolling training window, apply them to the next out-of-sample window.
+The rules are causal (day t only sees data <= t), so each candidate is replayed once over the whole
+calendar; per-fold training stats then come from prefix sums of its daily returns (O(1) per fold)
+instead of re-running the backtest for every window.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+import numpy as np
+
+from ..align import day_str
+from .backtest import BacktestData, curve_stats
+from .params import DEFAULT_PARAMS, RuleParams
+from .sweep import map_params, returns_chunk
+
+TRAIN_MONTHS = 36
+TEST_MONTHS = 1
+OBJECTIVES = ("sharpe", "return")
+
+
+def month_starts(dates: np.ndarray) -> np.ndarray:
+    """Index of the first calendar row of every month (epoch-day dates)."""
+    if len(dates) == 0:
+        return np.zeros(0, dtype=int)
+    months = dates.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    return np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+
+
+def fold_bounds(dates: np.ndarray, train_months: int = TRAIN_MONTHS, test_months: int = TEST_MONTHS) -> np.ndarray:
+    """(F, 3) rows of [train_start, test_start, test_end) row indices, stepping test_months at a time."""
+    starts = np.r_[month_starts(dates), len(dates)]
+    n_months = len(starts) - 1
+    k = np.arange(train_months, n_months, test_months)
+    if len(k) == 0:
+        return np.zeros((0, 3), dtype=int)
+    return np.stack([starts[k - train_months], starts[k], starts[np.minimum(k + test_months, n_months)]], axis=1)
+
+
+class WindowStats:
+    """Prefix sums over a (C, T) matrix of daily returns: any [a, b) window's stats in O(C)."""
+
+    def __init__(self, returns: np.ndarray) -> None:
+        pad = np.zeros((returns.shape[0], 1))
+        self._s1 = np.hstack([pad, np.cumsum(returns, axis=1)])
+        self._s2 = np.hstack([pad, np.cumsum(returns * returns, axis=1)])
+        self._lg = np.hstack([pad, np.cumsum(np.log1p(returns), axis=1)])
+
+    def sharpe(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """(C, F) annualized Sharpe for windows [a, b)."""
+        n = np.maximum(b - a, 1)
+        mean = (self._s1[:, b] - self._s1[:, a]) / n
+        var = np.maximum((self._s2[:, b] - self._s2[:, a]) / n - mean * mean, 0.0)
+        sd = np.sqrt(var)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(sd > 1e-12, mean / sd * np.sqrt(252), 0.0)
+
+    def total_return(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """(C, F) compounded return for windows [a, b)."""
+        return np.expm1(self._lg[:, b] - self._lg[:, a])
+
+
+def walk_forward(
+    data: BacktestData,
+    params: Iterable[RuleParams],
+    train_months: int = TRAIN_MONTHS,
+    test_months: int = TEST_MONTHS,
+    objective: str = "sharpe",
+    workers: int | None = None,
+) -> dict[str, Any]:
+    """
+    Returns {"objective", "trainMonths", "testMonths", "candidates", "oos", "baselineOos", "folds", "chosen"}.
+    oos: stitched out-of-sample stats of the chosen params; baselineOos: DEFAULT_PARAMS over the same span.
+    Ties go to the earlier candidate; DEFAULT_PARAMS is always a candidate (index 0).
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {OBJECTIVES}")
+    cands = list(dict.fromkeys([DEFAULT_PARAMS, *params]))
+    rets = np.asarray(map_params(data, cands, returns_chunk, workers), dtype=float).reshape(len(cands), -1)
+
+    bounds = fold_bounds(data.dates, train_months, test_months)
+    out: dict[str, Any] = {
+        "objective": objective,
+        "trainMonths": train_months,
+        "testMonths": test_months,
+        "candidates": len(cands),
+        "folds": [],
+        "chosen": [],
+    }
+    if len(bounds) == 0:
+        out["oos"] = out["baselineOos"] = None
+        return out
+
+    a, t, b = bounds[:, 0], bounds[:, 1], bounds[:, 2]
+    stats = WindowStats(rets)
+    score = stats.sharpe(a, t) if objective == "sharpe" else stats.total_return(a, t)
+    best = np.argmax(score, axis=0)
+    fold_ret = stats.total_return(t, b)
+
+    span = slice(int(t[0]), int(b[-1]))
+    owner = np.repeat(best, b - t)
+    oos = rets[owner, np.arange(span.start, span.stop)]
+    base = rets[0, span]
+    days = span.stop - span.start
+    flat = np.zeros(days)
+    out["oos"] = curve_stats(np.cumprod(1 + oos), oos, flat, days)
+    out["baselineOos"] = curve_stats(np.cumprod(1 + base), base, flat, days)
+    out["oos"].pop("turnoverAnn")
+    out["baselineOos"].pop("turnoverAnn")
+    out["oos"]["switches"] = int(np.sum(best[1:] != best[:-1]))
+
+    for i, c in enumerate(best):
+        out["folds"].append({
+            "trainStart": day_str(int(data.dates[a[i]])),
+            "testStart": day_str(int(data.dates[t[i]])),
+            "testEnd": day_str(int(data.dates[b[i] - 1])),
+            "candidate": int(c),
+            "trainScore": round(float(score[c, i]), 4),
+            "testReturn": round(float(fold_ret[c, i]) * 100, 2),
+            "baselineTestReturn": round(float(fold_ret[0, i]) * 100, 2),
+        })
+    picked, counts = np.unique(best, return_counts=True)
+    out["chosen"] = sorted(
+        ({"candidate": int(c), "folds": int(n), "params": cands[c].diff()} for c, n in zip(picked, counts)),
+        key=lambda r: -r["folds"],
+    )
+    return out
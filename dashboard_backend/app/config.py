@@ -19,6 +19,9 @@ class Settings:
     # CORS allowed origins (comma-separated)
     cors_allow_origins: list[str]
 
+    # Persistent build caches (feature memo, ...)
+    cache_dir: Path
+
 
 def _bool_env(name: str, default: bool = False) -> bool:
     v = os.getenv(name)
@@ -35,6 +38,7 @@ def load_settings() -> Settings:
       - SERVE_FRONTEND: true/false, whether to serve frontend dist
       - FRONTEND_DIST_DIR: path to the built frontend (default: ../dashboard_frontend/app/dist)
       - CORS_ALLOW_ORIGINS: comma-separated list, default: http://localhost:5173
+      - DASHBOARD_CACHE_DIR: directory for persistent build caches (default: ./data)
     """
 
     default_dashboard_paths = [
@@ -67,9 +71,12 @@ def load_settings() -> Settings:
     cors_env = os.getenv("CORS_ALLOW_ORIGINS", "http://localhost:5173")
     cors_allow_origins = [o.strip() for o in cors_env.split(",") if o.strip()]
 
+    cache_dir = Path(os.getenv("DASHBOARD_CACHE_DIR", "./data")).resolve()
+
     return Settings(
         dashboard_json_path=dashboard_json_path,
         serve_frontend=serve_frontend,
         frontend_dist_dir=frontend_dist_dir,
         cors_allow_origins=cors_allow_origins,
+        cache_dir=cache_dir,
     )
@@ -1,3 +1,3 @@
-from .write_json import write_dashboard_json
+from .write_json import write_dashboard_json, write_json_atomic
 
-__all__ = ["write_dashboard_json"]
+__all__ = ["write_dashboard_json", "write_json_atomic"]
@@ -8,11 +8,19 @@ import os
 from pathlib import Path
 from typing import Any
 
+# Above this many assets dashboard.json is written compact (no indent); large universes stay a few MB
+PRETTY_MAX_ASSETS = 50
 
-def write_dashboard_json(path: Path, payload: dict[str, Any]) -> None:
+
+def write_json_atomic(path: Path, obj: Any, indent: int | None = None) -> None:
     path = path.resolve()
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(path.suffix + ".tmp")
     with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+        json.dump(obj, f, ensure_ascii=False, indent=indent)
     os.replace(tmp, path)
+
+
+def write_dashboard_json(path: Path, payload: dict[str, Any]) -> None:
+    pretty = len(payload.get("assets") or []) <= PRETTY_MAX_ASSETS
+    write_json_atomic(path, payload, indent=2 if pretty else None)
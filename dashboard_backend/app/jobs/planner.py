@@ -0,0 +1,145 @@
+"""
+Refresh planner: when new data can exist. Each release is a local time on eligible days in its own time
+zone (exchange closes for US / HK / CME futures, the UTC daily candle for crypto, FRED publication
+windows for the macro series), plus a delay for the data vendors to post the bar. A payload section
+(compute.sections) is due when a release of it has passed since it was last refreshed, or when it is
+older than its TTL (SECTION_TTL_<NAME> minutes; 0 = releases only, the default except for weekly).
+
+Exchange holidays are not modelled (a holiday close triggers one redundant refresh); monthly releases
+use a day-of-month window around the usual release day and fire on each weekday of it.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Iterable
+from zoneinfo import ZoneInfo
+
+# calendar (default): refresh after closes / releases; interval: every SCHEDULE_INTERVAL_MINUTES
+SCHEDULE_MODE = os.environ.get("SCHEDULE_MODE", "calendar").strip().lower()
+SCHEDULE_INTERVAL_MINUTES = int(os.environ.get("SCHEDULE_INTERVAL_MINUTES", "60"))
+# Retry after a refresh that raised (failed tickers back off on their own, compute.sections)
+RETRY_MINUTES = 15
+WEEKDAYS = (0, 1, 2, 3, 4)
+EVERY_DAY = (0, 1, 2, 3, 4, 5, 6)
+_SEARCH_DAYS = 40  # covers the gap between two monthly windows
+DEFAULT_SECTION_TTL = {"weekly": 24 * 60}
+
+
+@dataclass(frozen=True)
+class Release:
+    """Local release times on eligible days (weekday in `weekdays`, day of month within `days`)."""
+
+    tz: str
+    times: tuple[time, ...]
+    weekdays: tuple[int, ...] = WEEKDAYS
+    days: tuple[int, int] = (1, 31)
+    delay_minutes: int = 20
+
+    def _on(self, d: date) -> list[datetime]:
+        if d.weekday() not in self.weekdays or not self.days[0] <= d.day <= self.days[1]:
+            return []
+        tz = ZoneInfo(self.tz)
+        delay = timedelta(minutes=self.delay_minutes)
+        return [(datetime.combine(d, t, tz) + delay).astimezone(timezone.utc) for t in self.times]
+
+    def last(self, now: datetime) -> datetime | None:
+        """Most recent release (UTC) at or before now."""
+        d = now.astimezone(ZoneInfo(self.tz)).date() + timedelta(days=1)
+        for i in range(_SEARCH_DAYS):
+            hits = [t for t in self._on(d - timedelta(days=i)) if t <= now]
+            if hits:
+                return max(hits)
+        return None
+
+    def next(self, now: datetime) -> datetime | None:
+        """First release (UTC) after now."""
+        d = now.astimezone(ZoneInfo(self.tz)).date() - timedelta(days=1)
+        for i in range(_SEARCH_DAYS):
+            hits = [t for t in self._on(d + timedelta(days=i)) if t > now]
+            if hits:
+                return min(hits)
+        return None
+
+
+# Asset groups: daily bar final shortly after the close
+MARKET_RELEASES = {
+    "us": Release("America/New_York", (time(16, 0),)),
+    "hk": Release("Asia/Hong_Kong", (time(16, 10),)),  # after the closing auction
+    "futures": Release("America/Chicago", (time(16, 0),)),  # CME daily session end (trade date Mon-Fri)
+    "crypto": Release("UTC", (time(0, 0),), weekdays=EVERY_DAY, delay_minutes=10),
+}
+# FRED: daily series (HY OAS in the US morning, DFII10 / DTWEXBGS in the afternoon), core CPI (BLS, 08:30 ET
+# around mid-month) and factory orders (Census M3, 10:00 ET in the first week) -- FRED posts within the hour
+MACRO_RELEASES = {
+    "fred_daily": Release("America/New_York", (time(9, 30), time(16, 30)), delay_minutes=30),
+    "cpi": Release("America/New_York", (time(8, 30),), days=(10, 16), delay_minutes=45),
+    "factory_orders": Release("America/New_York", (time(10, 0),), days=(1, 8), delay_minutes=45),
+}
+RELEASES = {**MARKET_RELEASES, **MACRO_RELEASES}
+
+
+def section_of(group: str) -> str:
+    """Payload section refreshed by a release group: the FRED releases feed macro, market groups themselves."""
+    return "macro" if group in MACRO_RELEASES else group
+
+
+def section_ttls(sections: Iterable[str]) -> dict[str, timedelta]:
+    """TTL per section (SECTION_TTL_<NAME> minutes), sections without one left out."""
+    out = {}
+    for s in sections:
+        minutes = int(os.environ.get(f"SECTION_TTL_{s.upper()}", DEFAULT_SECTION_TTL.get(s, 0)))
+        if minutes > 0:
+            out[s] = timedelta(minutes=minutes)
+    return out
+
+
+def active_releases(groups: Iterable[str]) -> dict[str, Release]:
+    """Releases of the market groups present plus every macro release."""
+    return {**{g: MARKET_RELEASES[g] for g in groups if g in MARKET_RELEASES}, **MACRO_RELEASES}
+
+
+def _sections(releases: dict[str, Release]) -> set[str]:
+    return {section_of(g) for g in releases} | {"weekly"}
+
+
+def due(releases: dict[str, Release], refreshed: dict[str, datetime], now: datetime) -> list[str]:
+    """Sections with a release after their last refresh, past their TTL, or never refreshed."""
+    out = {s for s in _sections(releases) if s not in refreshed}
+    for g, rel in releases.items():
+        seen = refreshed.get(section_of(g))
+        last = rel.last(now)
+        if seen is not None and last is not None and last > seen:
+            out.add(section_of(g))
+    for s, ttl in section_ttls(_sections(releases)).items():
+        if s in refreshed and now - refreshed[s] >= ttl:
+            out.add(s)
+    return sorted(out)
+
+
+def next_run(releases: dict[str, Release], refreshed: dict[str, datetime], now: datetime) -> tuple[datetime, list[str]]:
+    """Earliest upcoming release or TTL expiry and the sections due then."""
+    nxt: dict[str, datetime] = {}
+    for g, rel in releases.items():
+        t = rel.next(now)
+        s = section_of(g)
+        if t is not None and (s not in nxt or t < nxt[s]):
+            nxt[s] = t
+    for s, ttl in section_ttls(_sections(releases)).items():
+        if s in refreshed:
+            t = max(refreshed[s] + ttl, now)
+            nxt[s] = min(nxt.get(s, t), t)
+    if not nxt:
+        return now + timedelta(minutes=SCHEDULE_INTERVAL_MINUTES), []
+    at = min(nxt.values())
+    return at, sorted(s for s, t in nxt.items() if t == at)
+
+
+def iso(t: datetime | None) -> str | None:
+    return t.strftime("%Y-%m-%dT%H:%M:%SZ") if t else None
+
+
+def describe(releases: dict[str, Release], now: datetime) -> dict[str, Any]:
+    """Next release per group (ISO UTC), for /api/health."""
+    return {g: iso(rel.next(now)) for g, rel in releases.items()}
@@ -1,26 +1,181 @@
 """
-APScheduler: every 60 min run build_dashboard_job().
-build_dashboard_job() calls builder.build_payload() then write to DASHBOARD_JSON_PATH.
+APScheduler: refresh the payload sections that are due after each market close / macro release of the
+universe or past their TTL (jobs.planner, compute.sections); SCHEDULE_MODE=interval restores full builds
+every SCHEDULE_INTERVAL_MINUTES.
+build_dashboard_job() calls builder.build_payload() then write to DASHBOARD_JSON_PATH (startup, first run,
+/api/dashboard/live); refresh_dashboard_job() fetches only the due sections (plus the failed tickers / FRED
+series whose backoff has elapsed, builder.retry_failed) and merges them into the last payload.
+With BTC_INTRADAY=1, intraday_job() runs every BTC_INTRADAY_MINUTES: new BTC klines go into the ring
+buffer (<cache_dir>/btc_klines.json) and are merged as the btc section.
+Per-asset feature results are memoized in <cache_dir>/feature_memo.json across runs; the build's
+scenario inputs go to <cache_dir>/scenario_inputs.json (read by /api/scenario after a restart), the
+fitted GARCH parameters to <cache_dir>/vol_params.json (warm starts for the next fit) and the weekly /
+monthly bars of every fetched series to <cache_dir>/bars.json (only the newest bar is resampled).
 """
 from __future__ import annotations
 
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Any
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
-from ..config import load_settings
-from ..compute.builder import build_payload
+from ..config import Settings, load_settings
+from ..compute.builder import build_payload, fetch_sections, merge_sections, refresh_intraday, retry_failed
+from ..compute import intraday
+from ..compute.memo import FeatureMemo
+from ..compute import scenario
+from ..compute.resample import BAR_CACHE, BarCache
+from ..compute.sections import SECTION_INPUTS
+from ..compute.volforecast import VOL_FORECASTER, VolForecaster
 from ..io.write_json import write_dashboard_json
+from ..universe import load_universe
+from . import planner
 
 _scheduler: BackgroundScheduler | None = None
+_memo: FeatureMemo | None = None
+_payload: dict[str, Any] | None = None
+_next_run: datetime | None = None
+# Full builds, section refreshes and intraday refreshes all rewrite dashboard.json
+_write_lock = threading.Lock()
 
 
-def build_dashboard_job() -> None:
+def _feature_memo(cache_dir: Path) -> FeatureMemo:
+    global _memo
+    path = cache_dir / "feature_memo.json"
+    if _memo is None or _memo.path != path:
+        _memo = FeatureMemo.load(path)
+    return _memo
+
+
+def _load_caches(settings: Settings) -> None:
+    if not VOL_FORECASTER.params:
+        VOL_FORECASTER.params = VolForecaster.load(settings.cache_dir / "vol_params.json").params
+    if not BAR_CACHE.bars:
+        BAR_CACHE.bars = BarCache.load(settings.cache_dir / "bars.json").bars
+
+
+def _save_caches(settings: Settings, memo: FeatureMemo) -> None:
+    memo.save()
+    scenario.save_last(settings.cache_dir / "scenario_inputs.json")
+    VOL_FORECASTER.save(settings.cache_dir / "vol_params.json")
+    BAR_CACHE.save(settings.cache_dir / "bars.json")
+
+
+def build_dashboard_job() -> bool:
+    global _payload
     settings = load_settings()
     path = settings.dashboard_json_path
     try:
-        payload = build_payload()
-        write_dashboard_json(path, payload)
+        memo = _feature_memo(settings.cache_dir)
+        _load_caches(settings)
+        payload = build_payload(memo=memo)
+        with _write_lock:
+            write_dashboard_json(path, payload)
+            _payload = payload
+        _save_caches(settings, memo)
+    except Exception:
+        return False
+    return True
+
+
+def refresh_dashboard_job(sections: list[str]) -> bool:
+    """
+    Fetch only `sections` and the failed inputs due for a retry, and merge the parts depending on them into the
+    last payload (full build without one).
+    """
+    global _payload
+    if _payload is None:
+        return build_dashboard_job()
+    settings = load_settings()
+    try:
+        memo = _feature_memo(settings.cache_dir)
+        fetch_sections(sections)
+        sections = sorted({*sections, *retry_failed()})
+        if not sections:
+            return True
+        with _write_lock:
+            payload = merge_sections(_payload, sections, memo=memo)
+            write_dashboard_json(settings.dashboard_json_path, payload)
+            _payload = payload
+        _save_caches(settings, memo)
+    except Exception:
+        return False
+    return True
+
+
+def _releases() -> dict[str, planner.Release]:
+    return planner.active_releases(load_universe().groups)
+
+
+def planned_build_job() -> None:
+    """
+    Refresh the sections due (a close / release since their last refresh, or past their TTL) and retry the
+    failed inputs whose backoff has elapsed, then schedule the next wake-up: the next release / TTL expiry or
+    failed-input retry, or RETRY_MINUTES from now when the refresh raised.
+    """
+    global _next_run
+    now = datetime.now(timezone.utc)
+    releases = _releases()
+    sections = planner.due(releases, SECTION_INPUTS.refreshed, now)
+    ok = True
+    if sections or SECTION_INPUTS.retry_due(now):
+        ok = refresh_dashboard_job(sections)
+    now = datetime.now(timezone.utc)
+    _next_run = planner.next_run(releases, SECTION_INPUTS.refreshed, now)[0]
+    retry = SECTION_INPUTS.next_retry()
+    if retry is not None:
+        _next_run = min(_next_run, max(retry, now))
+    # A refresh that raised leaves its sections unmarked (still due): try again after RETRY_MINUTES
+    if not ok or planner.due(releases, SECTION_INPUTS.refreshed, now):
+        _next_run = min(_next_run, now + timedelta(minutes=planner.RETRY_MINUTES))
+    if _scheduler is not None:
+        _scheduler.add_job(
+            planned_build_job, "date", run_date=_next_run, id="build_dashboard",
+            replace_existing=True, misfire_grace_time=None,
+        )
+
+
+def schedule_status() -> dict[str, Any]:
+    """Schedule mode, next planned refresh, last refresh per section and next release per group (for /api/health)."""
+    if planner.SCHEDULE_MODE == "interval":
+        return {"mode": "interval", "minutes": planner.SCHEDULE_INTERVAL_MINUTES}
+    now = datetime.now(timezone.utc)
+    return {
+        "mode": "calendar",
+        "nextRun": planner.iso(_next_run),
+        "sections": SECTION_INPUTS.refreshed_iso(),
+        "releases": planner.describe(_releases(), now),
+    }
+
+
+def intraday_job() -> None:
+    """Fetch new klines, fold them into the daily series and merge the btc section into the last payload."""
+    global _payload
+    settings = load_settings()
+    ring = intraday.BTC_RING
+    ring_path = settings.cache_dir / "btc_klines.json"
+    try:
+        if not len(ring):
+            ring.append(intraday.KlineRing.load(ring_path).view())
+        if not intraday.fetch_new(ring):
+            return
+        ring.save(ring_path)
+        with _write_lock:
+            if _payload is None:
+                return
+            rows = {t: intraday.merged_daily(t, ring) for t in intraday.INTRADAY_SYMBOLS}
+            rows = {t: r for t, r in rows.items() if r}
+            if not rows:
+                return
+            payload = refresh_intraday(_payload, rows, memo=_feature_memo(settings.cache_dir))
+            payload["intraday"] = {
+                **intraday.status(ring),
+                "assets": [a["id"] for a in payload["assets"] if a.get("ticker") in rows],
+            }
+            write_dashboard_json(settings.dashboard_json_path, payload)
+            _payload = payload
     except Exception:
         pass
 
@@ -30,9 +185,14 @@ def start_scheduler() -> None:
     if _scheduler is not None:
         return
     _scheduler = BackgroundScheduler()
-    _scheduler.add_job(build_dashboard_job, "interval", minutes=60, id="build_dashboard")
+    if intraday.intraday_enabled():
+        _scheduler.add_job(intraday_job, "interval", minutes=intraday.INTRADAY_MINUTES, id="btc_intraday")
+    interval = planner.SCHEDULE_MODE == "interval"
+    if interval:
+        _scheduler.add_job(build_dashboard_job, "interval", minutes=planner.SCHEDULE_INTERVAL_MINUTES, id="build_dashboard")
     _scheduler.start()
-    build_dashboard_job()
+    # Calendar mode: the first run builds (nothing refreshed yet) and schedules the next release
+    build_dashboard_job() if interval else planned_build_job()
 
 
 def shutdown_scheduler() -> None:
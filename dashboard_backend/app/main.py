@@ -9,12 +9,16 @@ load_dotenv()
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from .compute import scenario
+from .compute.history import regime_history
 from .config import load_settings
-from .schemas import DashboardPayload
-from .jobs.scheduler import start_scheduler, shutdown_scheduler, build_dashboard_job
+from .schemas import DashboardPayload, ScenarioRequest
+from .jobs.scheduler import start_scheduler, shutdown_scheduler, build_dashboard_job, schedule_status
+from .providers.fred import get_macro_history, macro_history_pit
 
 settings = load_settings()
 
@@ -41,6 +45,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Payload grows with the universe (technicalData per asset); compress responses
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 
 def _read_dashboard_json(path: Path) -> Dict[str, Any]:
@@ -63,6 +69,7 @@ def health():
     return {
         "ok": True,
         "dashboard_json_path": str(settings.dashboard_json_path),
+        "schedule": schedule_status(),
     }
 
 
@@ -83,6 +90,43 @@ def get_dashboard_live():
     return JSONResponse(content=data)
 
 
+@app.get("/api/regime/history")
+def get_regime_history(years: int | None = None, point_in_time: bool = False):
+    """
+    RiskScore / confidence / regime per date. Default: the ~1y block in dashboard.json (regimeHistory);
+    years=N recomputes from N years of FRED history; point_in_time uses ALFRED vintages as known on each
+    date (or, without the vintage store, shifts monthly data to approximate release dates).
+    """
+    if years is None:
+        data = _read_dashboard_json(settings.dashboard_json_path)
+        return JSONResponse(content=data.get("regimeHistory") or {})
+    if not 1 <= years <= 30:
+        raise HTTPException(status_code=400, detail="years must be between 1 and 30")
+    try:
+        macro = macro_history_pit(years) if point_in_time else None
+        if macro is not None:
+            return JSONResponse(content=regime_history(macro))
+        return JSONResponse(content=regime_history(get_macro_history(years), release_lag=point_in_time))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"History failed: {e}")
+
+
+@app.post("/api/scenario")
+def post_scenario(req: ScenarioRequest):
+    """
+    What-if over the last build's cached inputs (no fetching): macro overrides -> riskScore, regime,
+    catalystLight, per-asset suggestedMaxWeight / action, one column entry per scenario.
+    """
+    inputs = scenario.last_inputs(settings.cache_dir / "scenario_inputs.json")
+    if inputs is None:
+        raise HTTPException(status_code=404, detail="no build yet: scenario inputs unavailable")
+    try:
+        out = scenario.run_scenarios(inputs, req.scenarios, req.grid, req.mode, req.assets)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONResponse(content=out)
+
+
 # Compatibility route: serve the JSON at /data/dashboard.json
 @app.get("/data/dashboard.json")
 def get_dashboard_json_file():
@@ -0,0 +1,272 @@
+"""
+ALFRED vintages: every FRED observation with its realtime_start / realtime_end, stored per series under
+<DASHBOARD_CACHE_DIR>/alfred/<SERIES>.json. VintageSeries answers "value as known on day D" with
+binary searches; VintageStore.sync() asks for vintage dates from the last sync day on (at most every
+ALFRED_SYNC_MINUTES) and, when one is newer than the last vintage seen, re-downloads just the rows valid
+since then (closed vintages are never re-fetched).
+FRED_VINTAGES=0 disables the store; the live getters (providers.fred) read FRED directly unless
+FRED_VINTAGES=1 is set explicitly.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import requests
+
+from ..align import day_str, parse_day, today_day
+from ..io.write_json import write_json_atomic
+
+ALFRED_OBS = "https://api.stlouisfed.org/fred/series/observations"
+ALFRED_VINTAGE_DATES = "https://api.stlouisfed.org/fred/series/vintagedates"
+OPEN_END = parse_day("9999-12-31")
+REALTIME_ORIGIN = "1776-07-04"
+PAGE_LIMIT = 100000
+# Minimum time between two vintagedates checks of one series
+SYNC_MINUTES = int(os.environ.get("ALFRED_SYNC_MINUTES", "60"))
+
+Row = tuple[int, int, int, float]  # (observation day, realtime_start, realtime_end, value)
+
+
+def _get(url: str, params: dict[str, Any]) -> dict[str, Any] | None:
+    key = os.environ.get("FRED_API_KEY")
+    if not key:
+        return None
+    try:
+        r = requests.get(url, params={**params, "api_key": key, "file_type": "json"}, timeout=60)
+        r.raise_for_status()
+        return r.json()
+    except Exception:
+        return None
+
+
+def fetch_vintage_dates(series_id: str, realtime_start: int) -> list[int] | None:
+    """Vintage (revision) dates on or after realtime_start; None on failure."""
+    data = _get(ALFRED_VINTAGE_DATES, {"series_id": series_id, "realtime_start": day_str(realtime_start), "limit": 10000})
+    if data is None:
+        return None
+    return [parse_day(d) for d in data.get("vintage_dates", [])]
+
+
+def fetch_vintage_rows(series_id: str, observation_start: int, realtime_start: int | None = None) -> list[Row] | None:
+    """All (obs, realtime_start, realtime_end, value) rows whose realtime period reaches realtime_start."""
+    out: list[Row] = []
+    offset = 0
+    while True:
+        data = _get(ALFRED_OBS, {
+            "series_id": series_id,
+            "observation_start": day_str(observation_start),
+            "realtime_start": day_str(realtime_start) if realtime_start is not None else REALTIME_ORIGIN,
+            "realtime_end": "9999-12-31",
+            "sort_order": "asc",
+            "limit": PAGE_LIMIT,
+            "offset": offset,
+        })
+        if data is None:
+            return None
+        obs = data.get("observations", [])
+        for o in obs:
+            v = o.get("value")
+            if v in (".", None, ""):
+                continue
+            try:
+                out.append((parse_day(o["date"]), parse_day(o["realtime_start"]), parse_day(o["realtime_end"]), float(v)))
+            except (KeyError, TypeError, ValueError):
+                continue
+        offset += len(obs)
+        if not obs or offset >= int(data.get("count", 0)):
+            return out
+
+
+class VintageSeries:
+    """Rows sorted by (observation, realtime_start); realtime periods of one observation do not overlap."""
+
+    def __init__(self, rows: list[Row]) -> None:
+        arr = np.array(rows, dtype=float).reshape(-1, 4)
+        order = np.lexsort((arr[:, 1], arr[:, 0]))
+        arr = arr[order]
+        self.obs = arr[:, 0].astype(np.int64)
+        self.rt_start = arr[:, 1].astype(np.int64)
+        self.rt_end = arr[:, 2].astype(np.int64)
+        self.values = arr[:, 3]
+        n = len(self.obs)
+        self._g0 = np.flatnonzero(np.r_[True, self.obs[1:] != self.obs[:-1]]) if n else np.zeros(0, dtype=np.int64)
+        self._g1 = np.r_[self._g0[1:], n].astype(np.int64)
+        self._group_obs = self.obs[self._g0]
+        # Observation groups ordered by first release; running max = latest observation known by then
+        first = self.rt_start[self._g0]
+        by_release = np.argsort(first, kind="stable")
+        self._release_days = first[by_release]
+        self._latest_group = np.maximum.accumulate(by_release) if len(by_release) else by_release
+
+    def __len__(self) -> int:
+        return len(self.obs)
+
+    def rows(self) -> list[Row]:
+        return list(zip(self.obs.tolist(), self.rt_start.tolist(), self.rt_end.tolist(), self.values.tolist()))
+
+    def merge(self, rows: list[Row]) -> "VintageSeries":
+        """Upsert by (observation, realtime_start): re-fetched rows carry their updated realtime_end."""
+        merged = {(o, s): (e, v) for o, s, e, v in self.rows()}
+        merged.update({(o, s): (e, v) for o, s, e, v in rows})
+        return VintageSeries([(o, s, e, v) for (o, s), (e, v) in merged.items()])
+
+    def _value_in_group(self, g: int, day: int) -> float | None:
+        lo, hi = int(self._g0[g]), int(self._g1[g])
+        j = lo + int(np.searchsorted(self.rt_start[lo:hi], day, side="right")) - 1
+        if j < lo or self.rt_end[j] < day:
+            return None
+        return float(self.values[j])
+
+    def value_on(self, obs_day: int, day: int) -> float | None:
+        """Value of observation obs_day as known on `day` (None if not yet released)."""
+        g = int(np.searchsorted(self._group_obs, obs_day))
+        if g >= len(self._group_obs) or self._group_obs[g] != obs_day:
+            return None
+        return self._value_in_group(g, day)
+
+    def asof(self, day: int) -> tuple[int, float] | None:
+        """(observation day, value) of the latest observation known on `day`."""
+        k = int(np.searchsorted(self._release_days, day, side="right")) - 1
+        if k < 0:
+            return None
+        g = int(self._latest_group[k])
+        v = self._value_in_group(g, day)
+        return None if v is None else (int(self._group_obs[g]), v)
+
+    def snapshot(self, day: int | None = None, observation_start: int | None = None) -> list[dict[str, Any]]:
+        """The whole series as known on `day` (default: latest vintage), as {"date", "value"} rows."""
+        day = today_day() if day is None else day
+        m = (self.rt_start <= day) & (self.rt_end >= day)
+        if observation_start is not None:
+            m &= self.obs >= observation_start
+        return [{"date": int(d), "value": float(v)} for d, v in zip(self.obs[m], self.values[m])]
+
+    def first_release(self, since: int | None = None) -> list[dict[str, Any]]:
+        """One row per observation dated by its first release: {"date": release day, "obs", "value"}."""
+        g = self._g0
+        rows = [
+            {"date": int(r), "obs": int(o), "value": float(v)}
+            for r, o, v in zip(self.rt_start[g], self.obs[g], self.values[g])
+        ]
+        rows.sort(key=lambda r: (r["date"], r["obs"]))
+        return [r for r in rows if since is None or r["date"] >= since]
+
+    def real_time(self, transform: Callable[[list[dict[str, Any]]], list[dict[str, Any]]], since: int | None = None) -> list[dict[str, Any]]:
+        """
+        For every day a new observation was first released: transform(snapshot on that day) and keep
+        its latest row, dated by the release day. Derived series (YoY, z-scores) then only use
+        data available at the time.
+        """
+        out = []
+        for k, day in enumerate(self._release_days):
+            if since is not None and day < since:
+                continue
+            if k + 1 < len(self._release_days) and self._release_days[k + 1] == day:
+                continue  # several observations released together: one snapshot
+            rows = transform(self.snapshot(int(day)))
+            if rows:
+                out.append({"date": int(day), "obs": int(rows[-1]["date"]), "value": rows[-1]["value"]})
+        return out
+
+
+class VintageStore:
+    """
+    Per-series JSON files: {"series", "obsStart", "synced" (day), "syncedAt" (unix s), "lastVintage" (day),
+    "rows": [[obs, rt_start, rt_end, value], ...]}.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._loaded: dict[str, tuple[float, dict[str, Any], VintageSeries]] = {}
+
+    def _path(self, series_id: str) -> Path:
+        return self.root / f"{series_id}.json"
+
+    def _load(self, series_id: str) -> tuple[dict[str, Any], VintageSeries] | None:
+        path = self._path(series_id)
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        hit = self._loaded.get(series_id)
+        if hit and hit[0] == mtime:
+            return hit[1], hit[2]
+        try:
+            meta = json.loads(path.read_text(encoding="utf-8"))
+            series = VintageSeries([tuple(r) for r in meta.pop("rows")])
+        except (ValueError, KeyError, TypeError):
+            return None
+        self._loaded[series_id] = (mtime, meta, series)
+        return meta, series
+
+    def _save(self, series_id: str, meta: dict[str, Any], series: VintageSeries) -> None:
+        path = self._path(series_id)
+        write_json_atomic(path, {**meta, "rows": series.rows()})
+        self._loaded[series_id] = (path.stat().st_mtime, meta, series)
+
+    def series(self, series_id: str) -> VintageSeries | None:
+        hit = self._load(series_id)
+        return hit[1] if hit else None
+
+    def sync(self, series_id: str, observation_start: int) -> VintageSeries | None:
+        """
+        Bring the series up to date (at most every SYNC_MINUTES). Full download when the file is missing or
+        starts after observation_start; otherwise vintagedates from the last sync day (inclusive, so a
+        vintage published later that day is seen) decides whether the rows valid since then are
+        re-fetched. Returns the stored series (possibly stale) or None.
+        """
+        today = today_day()
+        now = time.time()
+        hit = self._load(series_id)
+        if hit is not None and hit[0].get("obsStart", OPEN_END) <= observation_start:
+            meta, series = hit
+            if now - meta.get("syncedAt", 0) < SYNC_MINUTES * 60:
+                return series
+            dates = fetch_vintage_dates(series_id, meta["synced"])
+            if dates is None:
+                return series
+            seen = meta.get("lastVintage", meta["synced"] - 1)
+            if any(d > seen for d in dates):
+                rows = fetch_vintage_rows(series_id, meta["obsStart"], meta["synced"])
+                if rows is None:
+                    return series
+                series = series.merge(rows)
+                seen = max(dates)
+            self._save(series_id, {**meta, "synced": today, "syncedAt": now, "lastVintage": seen}, series)
+            return series
+        rows = fetch_vintage_rows(series_id, observation_start)
+        if not rows:
+            return hit[1] if hit else None
+        series = VintageSeries(rows)
+        meta = {
+            "series": series_id, "obsStart": observation_start, "synced": today, "syncedAt": now,
+            "lastVintage": int(series.rt_start.max()),
+        }
+        self._save(series_id, meta, series)
+        return series
+
+
+_STORE: VintageStore | None = None
+
+
+def default_store() -> VintageStore | None:
+    """Store under DASHBOARD_CACHE_DIR/alfred; None when FRED_VINTAGES=0 or there is no FRED_API_KEY."""
+    global _STORE
+    if os.environ.get("FRED_VINTAGES", "1").strip().lower() in ("0", "false", "no") or not os.environ.get("FRED_API_KEY"):
+        return None
+    root = Path(os.getenv("DASHBOARD_CACHE_DIR", "./data")).resolve() / "alfred"
+    if _STORE is None or _STORE.root != root:
+        _STORE = VintageStore(root)
+    return _STORE
+
+
+def live_store() -> VintageStore | None:
+    """default_store() for the live getters: only with FRED_VINTAGES=1 set explicitly (plain FRED otherwise)."""
+    if os.environ.get("FRED_VINTAGES", "").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    return default_store()
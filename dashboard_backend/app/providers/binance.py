@@ -1,40 +1,94 @@
 """
-Binance public klines for BTC (no key). Base: data-api.binance.vision or api.binance.com.
+Binance public klines for BTC (no key). Base: data-api.binance.vision or api.binance.com;
+BINANCE_BASE_URL points it elsewhere (e.g. tools/binance_standin.py), which also disables the fallback.
+Daily rows carry "date" as an epoch day (UTC) taken straight from the kline open time; intraday klines
+(fetch_klines) stay as raw [open ms, open, high, low, close, volume] arrays.
 """
 from __future__ import annotations
 
 import os
-from datetime import datetime
 from typing import Any
 
+import numpy as np
 import requests
 
-BASE_URL = os.environ.get("BINANCE_BASE_URL", "https://data-api.binance.vision")
-URL = f"{BASE_URL.rstrip('/')}/api/v3/klines?symbol=BTCUSDT&interval=1d&limit=400"
+from ..align import day_from_ms
+
+DEFAULT_BASE_URL = "https://data-api.binance.vision"
+BASE_URL = os.environ.get("BINANCE_BASE_URL", DEFAULT_BASE_URL)
+FALLBACK_BASE_URL = "https://api.binance.com" if "BINANCE_BASE_URL" not in os.environ else None
+MAX_LIMIT = 1000
+INTERVAL_MS = {
+    "1m": 60_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "4h": 14_400_000, "1d": 86_400_000,
+}
+
+
+def _klines(base: str, params: dict[str, Any]) -> list[list[Any]]:
+    r = requests.get(f"{base.rstrip('/')}/api/v3/klines", params=params, timeout=15)
+    r.raise_for_status()
+    return r.json()
+
+
+def _daily_rows(data: list[list[Any]]) -> list[dict[str, Any]]:
+    out = []
+    for c in data:
+        ts, o, h, l, close, v = c[0], float(c[1]), float(c[2]), float(c[3]), float(c[4]), float(c[5])
+        out.append({"date": day_from_ms(ts), "open": o, "high": h, "low": l, "close": close, "volume": int(v)})
+    return sorted(out, key=lambda x: x["date"])
 
 
 def fetch_btc_klines() -> list[dict[str, Any]]:
-    try:
-        r = requests.get(URL, timeout=15)
-        r.raise_for_status()
-        data = r.json()
-        out = []
-        for c in data:
-            ts, o, h, l, close, v = c[0], float(c[1]), float(c[2]), float(c[3]), float(c[4]), float(c[5])
-            dt = datetime.utcfromtimestamp(ts / 1000)
-            out.append({"date": dt.strftime("%Y-%m-%d"), "open": o, "high": h, "low": l, "close": close, "volume": int(v)})
-        return sorted(out, key=lambda x: x["date"])
-    except Exception:
+    params = {"symbol": "BTCUSDT", "interval": "1d", "limit": 400}
+    for base in (BASE_URL, FALLBACK_BASE_URL):
+        if not base:
+            continue
         try:
-            fallback = "https://api.binance.com/api/v3/klines?symbol=BTCUSDT&interval=1d&limit=400"
-            r = requests.get(fallback, timeout=15)
-            r.raise_for_status()
-            data = r.json()
-            out = []
-            for c in data:
-                ts, o, h, l, close, v = c[0], float(c[1]), float(c[2]), float(c[3]), float(c[4]), float(c[5])
-                dt = datetime.utcfromtimestamp(ts / 1000)
-                out.append({"date": dt.strftime("%Y-%m-%d"), "open": o, "high": h, "low": l, "close": close, "volume": int(v)})
-            return sorted(out, key=lambda x: x["date"])
+            return _daily_rows(_klines(base, params))
         except Exception:
-            return []
+            continue
+    return []
+
+
+def fetch_klines(
+    symbol: str = "BTCUSDT",
+    interval: str = "1h",
+    start_ms: int | None = None,
+    limit: int = MAX_LIMIT,
+    max_pages: int = 20,
+) -> np.ndarray:
+    """
+    Klines with open time >= start_ms, paging forward with startTime while pages come back full.
+    Returns (N, 6) float [open ms, open, high, low, close, volume] sorted by open time; the last row is
+    usually the still-open candle. Each page tries BASE_URL, then FALLBACK_BASE_URL; when both fail the
+    rows collected so far are returned (empty (0, 6) if the first page fails).
+    """
+    rows: list[list[float]] = []
+    params: dict[str, Any] = {"symbol": symbol, "interval": interval, "limit": min(limit, MAX_LIMIT)}
+    bases = [b for b in (BASE_URL, FALLBACK_BASE_URL) if b]
+    for _ in range(max_pages):
+        if start_ms is not None:
+            params["startTime"] = int(start_ms)
+        page = None
+        for base in list(bases):
+            try:
+                page = _klines(base, params)
+            except Exception:
+                continue
+            bases.remove(base)
+            bases.insert(0, base)  # stay on the base that answered for the next pages
+            break
+        if page is None:
+            break
+        try:
+            rows.extend([float(c[0]), float(c[1]), float(c[2]), float(c[3]), float(c[4]), float(c[5])] for c in page)
+        except (IndexError, TypeError, ValueError):
+            break
+        if len(page) < params["limit"]:
+            break
+        start_ms = int(page[-1][0]) + 1
+    if not rows:
+        return np.zeros((0, 6))
+    arr = np.asarray(rows, dtype=float)
+    arr = arr[np.argsort(arr[:, 0], kind="stable")]
+    return arr[np.append(arr[1:, 0] != arr[:-1, 0], True)]
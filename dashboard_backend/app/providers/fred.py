@@ -3,13 +3,17 @@ FRED 宏观数据：HY, Real10Y, DXY, Core CPI YoY, PMI-like(AMTMNO).
 """
 from __future__ import annotations
 
-import math
 import os
 from datetime import datetime, timedelta
 from typing import Any
 
 import requests
 
+from ..align import lookback, parse_day, series_arrays, today_day
+from ..compute.percentile import PCT_YEARS
+from .alfred import default_store, live_store
+from ..rolling import pmi_like as pmi_like_series
+
 FRED_BASE = "https://api.stlouisfed.org/fred/series/observations"
 SERIES = {
     "HY": "BAMLH0A0HYM2",
@@ -20,6 +24,14 @@ SERIES = {
 }
 
 
+def _years_back(years: int) -> datetime:
+    return datetime.utcnow() - timedelta(days=365 * years + 30)
+
+
+def _day(dt: datetime) -> int:
+    return parse_day(dt.date().isoformat())
+
+
 def _api_key() -> str | None:
     return os.environ.get("FRED_API_KEY")
 
@@ -52,7 +64,7 @@ def fetch_fred_series(
             if v in (".", None, ""):
                 continue
             try:
-                out.append({"date": o["date"], "value": float(v)})
+                out.append({"date": parse_day(o["date"]), "value": float(v)})
             except (TypeError, ValueError):
                 continue
         return out
@@ -60,44 +72,55 @@ def fetch_fred_series(
         return []
 
 
+def _observations(series_id: str, start: datetime) -> list[dict[str, Any]]:
+    """Latest-vintage rows since start: through the ALFRED store (incremental sync) with FRED_VINTAGES=1, else FRED."""
+    store = live_store()
+    if store is not None:
+        series = store.sync(series_id, _day(start))
+        rows = series.snapshot(observation_start=_day(start)) if series is not None else []
+        if rows:
+            return rows
+    return fetch_fred_series(series_id, start=start)
+
+
 def _latest_and_changes(obs: list[dict], freq_days: int = 1) -> dict[str, Any]:
     if not obs:
         return {"value": None, "change7d": None, "change1m": None, "freshness_days": 999}
-    obs = sorted(obs, key=lambda x: x["date"])[-252:]
-    latest = obs[-1]
-    val = latest["value"]
-    dt = datetime.strptime(latest["date"], "%Y-%m-%d")
-    freshness = (datetime.utcnow() - dt.replace(tzinfo=None)).days
-    change7d = change1m = None
-    for o in reversed(obs[:-1]):
-        d = datetime.strptime(o["date"], "%Y-%m-%d")
-        days_ago = (dt - d).days
-        if change7d is None and days_ago >= 5:
-            change7d = val - o["value"] if o.get("value") is not None else None
-        if change1m is None and days_ago >= 28:
-            change1m = val - o["value"] if o.get("value") is not None else None
-        if change7d is not None and change1m is not None:
-            break
-    return {"value": val, "change7d": change7d, "change1m": change1m, "freshness_days": freshness, "observations": obs}
+    history = sorted(obs, key=lambda x: x["date"])
+    obs = history[-252:]
+    days, vals = series_arrays(obs, "value")
+    val = obs[-1]["value"]
+    freshness = today_day() - int(days[-1])
+    prev7d, prev1m = lookback(days, vals, (5, 28))
+    change7d = val - prev7d if prev7d is not None else None
+    change1m = val - prev1m if prev1m is not None else None
+    return {
+        "value": val,
+        "change7d": change7d,
+        "change1m": change1m,
+        "freshness_days": freshness,
+        "observations": obs,
+        "history": history,  # PCT_YEARS of rows for the empirical percentile
+    }
 
 
 def get_hy() -> dict[str, Any]:
-    obs = fetch_fred_series(SERIES["HY"])
+    obs = _observations(SERIES["HY"], _years_back(PCT_YEARS))
     return _latest_and_changes(obs)
 
 
 def get_real10y() -> dict[str, Any]:
-    obs = fetch_fred_series(SERIES["REAL10Y"])
+    obs = _observations(SERIES["REAL10Y"], _years_back(PCT_YEARS))
     return _latest_and_changes(obs)
 
 
 def get_dxy() -> dict[str, Any]:
-    obs = fetch_fred_series(SERIES["DXY"])
+    obs = _observations(SERIES["DXY"], _years_back(PCT_YEARS))
     return _latest_and_changes(obs)
 
 
 def get_core_cpi_yoy() -> dict[str, Any]:
-    obs = fetch_fred_series(SERIES["CORE_CPI"])
+    obs = _observations(SERIES["CORE_CPI"], _years_back(PCT_YEARS + 1))
     if not obs or len(obs) < 13:
         return {"value": None, "change7d": None, "change1m": None, "freshness_days": 999}
     obs = sorted(obs, key=lambda x: x["date"])
@@ -112,14 +135,21 @@ def get_core_cpi_yoy() -> dict[str, Any]:
     if not yoy or all(v is None for v in yoy):
         return {"value": None, "change7d": None, "change1m": None, "freshness_days": 999}
     last_val = next(v for v in reversed(yoy) if v is not None)
-    last_dt = datetime.strptime(dates[-1], "%Y-%m-%d")
-    freshness = (datetime.utcnow() - last_dt.replace(tzinfo=None)).days
+    freshness = today_day() - dates[-1]
+    rows = _yoy_rows(obs)
     change1m = None
     for i in range(len(yoy) - 2, -1, -1):
         if yoy[i] is not None:
             change1m = last_val - yoy[i]
             break
-    return {"value": round(last_val, 2), "change7d": None, "change1m": round(change1m, 4) if change1m is not None else None, "freshness_days": freshness}
+    return {
+        "value": round(last_val, 2),
+        "change7d": None,
+        "change1m": round(change1m, 4) if change1m is not None else None,
+        "freshness_days": freshness,
+        "observations": rows,
+        "history": rows,
+    }
 
 
 FRED_AMTMNO_CSV = "https://fred.stlouisfed.org/graph/fredgraph.csv?id=AMTMNO&cosd=1992-02-01"
@@ -143,7 +173,7 @@ def _fetch_amtmno_csv_fallback() -> list[dict[str, Any]]:
             if val_s in (".", "", "None"):
                 continue
             try:
-                out.append({"date": date_s, "value": float(val_s)})
+                out.append({"date": parse_day(date_s), "value": float(val_s)})
             except (TypeError, ValueError):
                 continue
         return out
@@ -151,38 +181,10 @@ def _fetch_amtmno_csv_fallback() -> list[dict[str, Any]]:
         return []
 
 
-def _zscore_clamp_adaptive(vals: list[float | None], min_window: int = 36, max_window: int = 120) -> list[float | None]:
-    """zscore_window = min(max_window, len(valid)-1), max(min_window, zscore_window). pmi = 50+5*z, clamp [35,65]."""
-    valid_count = sum(1 for v in vals if v is not None)
-    zscore_window = min(max_window, max(0, valid_count - 1))
-    zscore_window = max(min_window, zscore_window)
-    out = []
-    for i in range(len(vals)):
-        if i < zscore_window - 1:
-            out.append(None)
-            continue
-        w = vals[max(0, i - zscore_window + 1) : i + 1]
-        w = [x for x in w if x is not None]
-        if len(w) < min_window:
-            out.append(None)
-            continue
-        m = sum(w) / len(w)
-        var = sum((x - m) ** 2 for x in w) / len(w)
-        std = math.sqrt(var) if var > 0 else 1e-9
-        v = vals[i]
-        if v is None:
-            out.append(None)
-            continue
-        z = (v - m) / std if std else 0
-        pmi = 50 + 5 * z
-        pmi = max(35, min(65, pmi))
-        out.append(pmi)
-    return out
-
-
 def get_pmi_like() -> dict[str, Any]:
     """PMI-like from AMTMNO: API first, then CSV fallback. Adaptive window. Fallback value=50, freshness=999, reason PMI_FALLBACK."""
-    obs = fetch_fred_series(SERIES["AMTMNO"])
+    # YoY (12) + z-score window (up to 120) + PCT_YEARS of PMI-like rows for the percentile
+    obs = _observations(SERIES["AMTMNO"], _years_back(PCT_YEARS + 11))
     if not obs or len(obs) < 13:
         obs = _fetch_amtmno_csv_fallback()
     if not obs or len(obs) < 13:
@@ -198,16 +200,90 @@ def get_pmi_like() -> dict[str, Any]:
     valid = [x for x in orders_yoy if x is not None]
     if len(valid) < 37:
         return {"value": 50.0, "change7d": None, "change1m": None, "freshness_days": 999, "reason": "PMI_FALLBACK"}
-    pmi_like = _zscore_clamp_adaptive(orders_yoy, min_window=36, max_window=120)
+    pmi_like = pmi_like_series(orders_yoy, min_window=36, max_window=120)
     dates = [o["date"] for o in obs[12:]]
     last_val = pmi_like[-1] if pmi_like and pmi_like[-1] is not None else None
     if last_val is None:
         return {"value": 50.0, "change7d": None, "change1m": None, "freshness_days": 999, "reason": "PMI_FALLBACK"}
-    last_dt = datetime.strptime(dates[-1], "%Y-%m-%d")
-    freshness = (datetime.utcnow() - last_dt.replace(tzinfo=None)).days
+    freshness = today_day() - dates[-1]
+    rows = [{"date": d, "value": round(v, 2)} for d, v in zip(dates, pmi_like) if v is not None]
     change1m = None
     for i in range(len(pmi_like) - 2, -1, -1):
         if pmi_like[i] is not None:
             change1m = last_val - pmi_like[i]
             break
-    return {"value": round(last_val, 2), "change7d": None, "change1m": round(change1m, 4) if change1m is not None else None, "freshness_days": freshness}
+    return {
+        "value": round(last_val, 2),
+        "change7d": None,
+        "change1m": round(change1m, 4) if change1m is not None else None,
+        "freshness_days": freshness,
+        "observations": rows,
+        "history": rows,
+    }
+
+
+def _yoy_rows(obs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Monthly level rows -> YoY % rows (rounded like get_core_cpi_yoy)."""
+    obs = sorted(obs, key=lambda x: x["date"])
+    return [
+        {"date": obs[i]["date"], "value": round((obs[i]["value"] / obs[i - 12]["value"] - 1) * 100, 2)}
+        for i in range(12, len(obs))
+        if obs[i - 12]["value"]
+    ]
+
+
+def _pmi_like_rows(obs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """AMTMNO level rows -> PMI-like rows (same YoY + adaptive z-score as get_pmi_like)."""
+    obs = sorted(obs, key=lambda x: x["date"])
+    vals = [o["value"] for o in obs]
+    orders_yoy = [(vals[i] / vals[i - 12] - 1) * 100 if vals[i - 12] else None for i in range(12, len(vals))]
+    if sum(1 for x in orders_yoy if x is not None) < 37:
+        return []
+    pmi_like = pmi_like_series(orders_yoy, min_window=36, max_window=120)
+    return [{"date": o["date"], "value": round(v, 2)} for o, v in zip(obs[12:], pmi_like) if v is not None]
+
+
+def get_macro_history(years: int = 10) -> dict[str, list[dict[str, Any]]]:
+    """
+    Full observation history for backtests: {"HY", "REAL10Y", "DXY": daily levels, "CORE_CPI": YoY %,
+    "PMI": PMI-like}. Monthly series fetch 11 extra years: 12 months for YoY + up to 120 for the z-score.
+    Latest vintage, dated by reference period (the backtest approximates release lags).
+    """
+    start = _years_back(years)
+    warmup = _years_back(years + 11)
+    amtmno = _observations(SERIES["AMTMNO"], warmup)
+    if not amtmno or len(amtmno) < 13:
+        amtmno = _fetch_amtmno_csv_fallback()
+    return {
+        "HY": _observations(SERIES["HY"], start),
+        "REAL10Y": _observations(SERIES["REAL10Y"], start),
+        "DXY": _observations(SERIES["DXY"], start),
+        "CORE_CPI": _yoy_rows(_observations(SERIES["CORE_CPI"], warmup)),
+        "PMI": _pmi_like_rows(amtmno),
+    }
+
+
+def macro_history_pit(years: int = 10) -> dict[str, list[dict[str, Any]]] | None:
+    """
+    get_macro_history() as it was known at the time, from ALFRED vintages: daily series dated by first
+    release, CORE_CPI / PMI recomputed from the vintage available on each release day. Rows are
+    release-dated (use release_lag=False). None when the vintage store is unavailable.
+    """
+    store = default_store()
+    if store is None:
+        return None
+    start = _day(_years_back(years))
+    warmup = _day(_years_back(years + 11))
+    out: dict[str, list[dict[str, Any]]] = {}
+    for key in ("HY", "REAL10Y", "DXY"):
+        series = store.sync(SERIES[key], start)
+        if series is None:
+            return None
+        out[key] = series.first_release(since=start)
+    cpi = store.sync(SERIES["CORE_CPI"], warmup)
+    amtmno = store.sync(SERIES["AMTMNO"], warmup)
+    if cpi is None or amtmno is None:
+        return None
+    out["CORE_CPI"] = cpi.real_time(_yoy_rows, since=start)
+    out["PMI"] = amtmno.real_time(_pmi_like_rows, since=start)
+    return out
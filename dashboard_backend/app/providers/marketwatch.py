@@ -6,11 +6,12 @@ from __future__ import annotations
 
 import csv
 import re
-from datetime import datetime, timedelta
 from typing import Any
 
 import requests
 
+from ..align import parse_day, today_day
+
 # HK ticker -> MarketWatch symbol (no leading zero: 0700 -> 700)
 MW_HK_SYMBOLS = {"0700.HK": "700", "9988.HK": "9988"}
 BASE = "https://www.marketwatch.com/investing/stock/{symbol}/download-data?countrycode=hk"
@@ -47,18 +48,14 @@ def fetch_marketwatch_hk(ticker: str, days: int = 400) -> list[dict[str, Any]]:
                         c = float(str(close_val).replace(",", ""))
                     except (TypeError, ValueError):
                         continue
-                    if len(date_val) == 10 and date_val[4] == "-":
-                        date_str = date_val
-                    else:
-                        try:
-                            date_str = datetime.strptime(date_val[:10], "%Y-%m-%d").strftime("%Y-%m-%d")
-                        except ValueError:
-                            continue
-                    out.append({"date": date_str, "open": c, "high": c, "low": c, "close": c, "volume": 0})
+                    try:
+                        day = parse_day(date_val)
+                    except ValueError:
+                        continue
+                    out.append({"date": day, "open": c, "high": c, "low": c, "close": c, "volume": 0})
                 if out:
-                    end = datetime.utcnow()
-                    start_cut = end - timedelta(days=days)
-                    out = [x for x in out if x["date"] >= start_cut.strftime("%Y-%m-%d")]
+                    start_cut = today_day() - days
+                    out = [x for x in out if x["date"] >= start_cut]
                     return sorted(out, key=lambda x: x["date"])
         return []
     except Exception:
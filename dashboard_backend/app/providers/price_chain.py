@@ -5,14 +5,19 @@ Returns ohlcv map and dataStatus per ticker with: provider, last_obs_date, row_c
 from __future__ import annotations
 
 import os
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
+import numpy as np
+
 from . import binance as binance_prov
 from . import stooq as stooq_prov
 from . import marketwatch as mw_prov
 from . import twelvedata as td_prov
 from . import alphavantage as av_prov
+from ..align import index_days, today_day
+from ..universe import load_universe
 
 # Optional yfinance
 try:
@@ -20,10 +25,20 @@ try:
 except ImportError:
     yf = None
 
-ASSET_DEFS_TICKERS = [
-    "BTC-USD", "SMH", "TSLA", "9988.HK", "0700.HK",
-    "GC=F", "SI=F", "HG=F",
-]
+# yfinance batch download size, and worker threads for the per-ticker fallback chain (I/O bound)
+FETCH_CHUNK = int(os.environ.get("PRICE_FETCH_CHUNK", "50"))
+FETCH_WORKERS = int(os.environ.get("PRICE_FETCH_WORKERS", "8"))
+
+
+def price_plan() -> list[str]:
+    """Deduplicated fetch list from the universe: asset tickers, then benchmarks, then reference series."""
+    return load_universe().price_plan()
+
+
+def benchmark_tickers() -> dict[str, str]:
+    """benchmarkId -> ticker; fetched once per build however many assets share it."""
+    return dict(load_universe().benchmarks)
+
 
 # Ticker -> proxy symbol when we use proxy (GC=F->xauusd, SI=F->xagusd, HG=F->cper)
 PROXY_FOR: dict[str, str] = {"GC=F": "xauusd", "SI=F": "xagusd", "HG=F": "cper.us"}
@@ -43,35 +58,63 @@ TD_SYMBOLS = {
 }
 
 
+def _yf_start(end: datetime, days: int) -> datetime:
+    """At least two years back; longer for backtest-sized requests (`days` trading rows)."""
+    return min(end.replace(year=end.year - 2), end - timedelta(days=int(days * 1.5)))
+
+
+def _yf_rows(hist: Any, days: int) -> list[dict[str, Any]]:
+    if hist is None or hist.empty or len(hist) < 2 or "Close" not in hist.columns:
+        return []
+    days_idx = index_days(hist.index)
+    closes = hist["Close"].to_numpy(dtype=float)
+    volumes = hist["Volume"].fillna(0).to_numpy() if "Volume" in hist.columns else np.zeros(len(closes))
+    ok = ~np.isnan(closes)
+    out = [
+        {"date": int(d), "open": float(c), "high": float(c), "low": float(c), "close": float(c), "volume": int(v)}
+        for d, c, v in zip(days_idx[ok], closes[ok], volumes[ok])
+    ]
+    return sorted(out, key=lambda x: x["date"])[-days:] if out else []
+
+
 def _yf_fetch(ticker: str, days: int) -> list[dict[str, Any]]:
     if yf is None:
         return []
     try:
         end = datetime.utcnow()
-        start = end.replace(year=end.year - 2)
+        start = _yf_start(end, days)
         obj = yf.Ticker(ticker)
-        hist = obj.history(start=start, end=end, auto_adjust=True)
-        if hist is None or hist.empty or len(hist) < 2:
-            return []
-        hist = hist.reset_index()
-        col_date = "Date" if "Date" in hist.columns else "Datetime"
-        if col_date not in hist.columns:
-            return []
-        out = []
-        for _, row in hist.iterrows():
-            dt = row[col_date]
-            if hasattr(dt, "strftime"):
-                date_str = dt.strftime("%Y-%m-%d")
+        return _yf_rows(obj.history(start=start, end=end, auto_adjust=True), days)
+    except Exception:
+        return []
+
+
+def _yf_download(tickers: list[str], days: int) -> dict[str, list[dict[str, Any]]]:
+    """One yfinance request for a chunk of tickers; tickers missing from the response are left out."""
+    if yf is None or not tickers:
+        return {}
+    try:
+        end = datetime.utcnow()
+        start = _yf_start(end, days)
+        frame = yf.download(
+            tickers, start=start, end=end, auto_adjust=True, group_by="ticker", threads=True, progress=False,
+        )
+        if frame is None or frame.empty:
+            return {}
+        out = {}
+        top = set(frame.columns.get_level_values(0)) if frame.columns.nlevels > 1 else set()
+        for t in tickers:
+            if t in top:
+                rows = _yf_rows(frame[t].dropna(how="all"), days)
+            elif not top and len(tickers) == 1:
+                rows = _yf_rows(frame, days)
             else:
                 continue
-            try:
-                c = float(row.get("Close", 0))
-            except (TypeError, ValueError):
-                continue
-            out.append({"date": date_str, "open": c, "high": c, "low": c, "close": c, "volume": int(row.get("Volume", 0) or 0)})
-        return sorted(out, key=lambda x: x["date"])[-days:] if out else []
+            if rows and (rows[-1].get("close") or 0) != 0:
+                out[t] = rows
+        return out
     except Exception:
-        return []
+        return {}
 
 
 def _td_symbol(ticker: str) -> str:
@@ -85,12 +128,14 @@ def _stooq_mapped(ticker: str) -> str:
 def fetch_one_ticker(
     ticker: str,
     days: int = 400,
-) -> tuple[list[dict[str, Any]], str, str | None, int, str | None, str | None, bool, str | None]:
+    use_yf: bool = True,
+) -> tuple[list[dict[str, Any]], str, int | None, int, str | None, str | None, bool, str | None]:
     """
     Try providers in order. Return (series, provider, last_date, row_count, error_reason, mapped_symbol, is_proxy, proxy_for).
+    Series rows and last_date use epoch days (int). use_yf=False when a batch download already tried yfinance.
     """
     # 1) yfinance (price_adjusted=True)
-    if yf is not None:
+    if yf is not None and use_yf:
         try:
             s = _yf_fetch(ticker, days)
             if s and len(s) > 0 and (s[-1].get("close") or 0) != 0:
@@ -178,32 +223,45 @@ def fetch_one_ticker(
     return ([], "fallback", None, 0, "all_sources_failed", None, False, None)
 
 
-def fetch_all_prices(days: int = 400) -> tuple[dict[str, list[dict[str, Any]]], dict[str, dict[str, Any]]]:
+def _fetch_plan(plan: list[str], days: int) -> dict[str, tuple]:
+    """yfinance in chunks of FETCH_CHUNK, then the fallback chain for the misses on FETCH_WORKERS threads."""
+    results: dict[str, tuple] = {}
+    for i in range(0, len(plan), max(1, FETCH_CHUNK)):
+        for t, s in _yf_download(plan[i:i + FETCH_CHUNK], days).items():
+            results[t] = (s, "yfinance", s[-1]["date"], len(s), None, t, False, None)
+    missing = [t for t in plan if t not in results]
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, min(FETCH_WORKERS, len(missing)))) as pool:
+            outs = pool.map(lambda t: fetch_one_ticker(t, days=days, use_yf=False), missing)
+            results.update(zip(missing, outs))
+    return results
+
+
+def fetch_all_prices(
+    days: int = 400,
+    tickers: list[str] | None = None,
+) -> tuple[dict[str, list[dict[str, Any]]], dict[str, dict[str, Any]]]:
     """
-    Fetch prices for all dashboard tickers. Return (ohlcv_map, dataStatus_map).
+    Fetch prices for every ticker in price_plan() (assets, benchmarks, references), or `tickers`.
+    Return (ohlcv_map, dataStatus_map).
     dataStatus[ticker] includes: provider, freshness_days, ok, note, last_obs_date, row_count, error_reason,
     mapped_symbol, asof_ts, is_proxy, proxy_for, stale_policy, price_adjusted.
     """
     ohlcv: dict[str, list[dict[str, Any]]] = {}
     data_status: dict[str, dict[str, Any]] = {}
     asof_ts = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    plan = list(dict.fromkeys(tickers)) if tickers is not None else price_plan()
+    fetched = _fetch_plan(plan, days)
+    today = today_day()
 
-    for ticker in ASSET_DEFS_TICKERS:
-        out = fetch_one_ticker(ticker, days=days)
-        series, provider, last_date, row_count, error_reason, mapped_symbol, is_proxy, proxy_for = out
+    for ticker in plan:
+        series, provider, last_date, row_count, error_reason, mapped_symbol, is_proxy, proxy_for = fetched[ticker]
         if series:
             ohlcv[ticker] = series
         else:
             ohlcv[ticker] = []
 
-        if last_date:
-            try:
-                d = datetime.strptime(last_date, "%Y-%m-%d")
-                freshness_days = (datetime.utcnow() - d.replace(tzinfo=None)).days
-            except Exception:
-                freshness_days = 999
-        else:
-            freshness_days = 999
+        freshness_days = today - last_date if last_date is not None else 999
 
         ok = bool(series and len(series) > 0 and (series[-1].get("close") or 0) != 0)
         note = "stale/fallback" if provider == "fallback" or not series else None
@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 from typing import Any
 from urllib.request import Request, urlopen
 
+from ..align import parse_day
+
 BASE = "https://stooq.com/q/d/l/?s={ticker}&i=d&d1={d1}&d2={d2}"
 
 # Stooq symbol mapping: our ticker -> stooq symbol
@@ -41,14 +43,11 @@ def _parse_stooq_csv(text: str) -> list[dict[str, Any]]:
             c = float(close_val or 0)
         except (TypeError, ValueError):
             continue
-        if len(date_val) == 10 and date_val[4] == "-":
-            date_str = date_val
-        else:
-            try:
-                date_str = datetime.strptime(date_val[:10], "%Y-%m-%d").strftime("%Y-%m-%d")
-            except ValueError:
-                continue
-        out.append({"date": date_str, "open": c, "high": c, "low": c, "close": c, "volume": 0})
+        try:
+            day = parse_day(date_val)
+        except ValueError:
+            continue
+        out.append({"date": day, "open": c, "high": c, "low": c, "close": c, "volume": 0})
     return sorted(out, key=lambda x: x["date"]) if out else []
 
 
@@ -9,6 +9,8 @@ from typing import Any
 
 import requests
 
+from ..align import parse_day
+
 BASE = "https://api.twelvedata.com/time_series"
 
 
@@ -36,12 +38,12 @@ def fetch_twelvedata(symbol: str, days: int = 400) -> list[dict[str, Any]]:
         vals = data.get("values") or []
         out = []
         for v in vals:
-            dt = v.get("datetime", "")[:10]
             try:
+                day = parse_day(v.get("datetime", ""))
                 c = float(v.get("close", 0))
             except (TypeError, ValueError):
                 continue
-            out.append({"date": dt, "open": c, "high": c, "low": c, "close": c, "volume": 0})
+            out.append({"date": day, "open": c, "high": c, "low": c, "close": c, "volume": 0})
         return sorted(out, key=lambda x: x["date"]) if out else []
     except Exception:
         return []
@@ -0,0 +1,70 @@
+"""
+Rolling mean / std / z-score over observation windows in O(n) (prefix sums of value, value^2 and
+valid count), missing values (None / NaN) skipped. Shared by app.providers.fred and src.providers.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+
+# PMI-like = 50 + 5 * z(orders YoY), clamped
+PMI_CENTER = 50.0
+PMI_SCALE = 5.0
+PMI_CLAMP = (35.0, 65.0)
+
+
+def as_float_array(vals: Iterable[float | None] | np.ndarray) -> np.ndarray:
+    if isinstance(vals, np.ndarray):
+        return vals.astype(float)
+    return np.array([np.nan if v is None else v for v in vals], dtype=float)
+
+
+def rolling_mean_std(vals: Iterable[float | None] | np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (mean, population std, valid count) of the valid values among positions [i - window + 1, i].
+    Values are centered on their overall mean before summing so the variance keeps its precision.
+    """
+    x = as_float_array(vals)
+    n = len(x)
+    ok = ~np.isnan(x)
+    center = float(x[ok].mean()) if ok.any() else 0.0
+    d = np.where(ok, x - center, 0.0)
+    c0 = np.concatenate([[0], np.cumsum(ok)])
+    c1 = np.concatenate([[0.0], np.cumsum(d)])
+    c2 = np.concatenate([[0.0], np.cumsum(d * d)])
+    hi = np.arange(1, n + 1)
+    lo = np.maximum(hi - window, 0)
+    count = c0[hi] - c0[lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_d = (c1[hi] - c1[lo]) / count
+        var = np.maximum((c2[hi] - c2[lo]) / count - mean_d * mean_d, 0.0)
+    return mean_d + center, np.sqrt(var), count
+
+
+def rolling_zscore(vals: Iterable[float | None] | np.ndarray, window: int, min_count: int | None = None) -> np.ndarray:
+    """
+    z of each value against its trailing `window` positions; NaN for missing values, for positions
+    before a full window, or with fewer than min_count (default: window) valid values.
+    """
+    x = as_float_array(vals)
+    mean, std, count = rolling_mean_std(x, window)
+    min_count = window if min_count is None else min_count
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (x - mean) / np.where(std > 0, std, 1e-9)
+    bad = np.isnan(x) | (count < min_count) | (np.arange(len(x)) < window - 1)
+    return np.where(bad, np.nan, z)
+
+
+def adaptive_window(valid_count: int, min_window: int, max_window: int) -> int:
+    """min(max_window, valid - 1), at least min_window."""
+    return max(min_window, min(max_window, max(0, valid_count - 1)))
+
+
+def pmi_like(orders_yoy: Iterable[float | None] | np.ndarray, min_window: int = 36, max_window: int = 120) -> list[float | None]:
+    """Orders YoY % -> PMI-like (50 + 5z, clamped [35, 65]) on an adaptive window; None where undefined."""
+    x = as_float_array(orders_yoy)
+    window = adaptive_window(int(np.sum(~np.isnan(x))), min_window, max_window)
+    z = rolling_zscore(x, window, min_count=min_window)
+    out = np.clip(PMI_CENTER + PMI_SCALE * z, *PMI_CLAMP)
+    return [None if np.isnan(v) else float(v) for v in out]
@@ -21,3 +21,16 @@ class DashboardPayload(BaseModel):
     weeklyKondratieff: Optional[Dict[str, Any]] = None
     technicalData: Optional[Dict[str, Any]] = None
     priceHistory: Optional[Dict[str, Any]] = None
+
+
+class ScenarioRequest(BaseModel):
+    """What-if request for /api/scenario.
+
+    mode "shift" adds the values to the last build's macro inputs, "set" replaces them.
+    scenarios: explicit rows ({"HY": 1.0, "PMI": -3, ...}); grid: field -> values, Cartesian product.
+    """
+
+    mode: str = "shift"
+    scenarios: List[Dict[str, float]] = []
+    grid: Dict[str, List[float]] = {}
+    assets: bool = True
@@ -0,0 +1,106 @@
+"""
+Asset universe: one config file (universe.json, override with UNIVERSE_PATH) drives price fetching,
+features and signals for both the backend job and tools/generate_dashboard_json.py.
+
+    {"benchmarks": {benchmarkId: ticker}, "references": [ticker, ...],
+     "kondratieff": {chain role: ticker}?,
+     "assets": [{"id", "name", "ticker", "assetType", "currency", "benchmarkId"?, "baseMaxWeight"}, ...]}
+
+kondratieff roles (compute.kondratieff): base, sox, nvda, utility, copper, energy; missing roles keep the
+defaults in DEFAULT_CHAIN. Fetched tickers fall in market groups (crypto, hk, futures, us) that are
+scheduled and refreshed separately (jobs.planner, compute.sections).
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+DEFAULT_UNIVERSE_PATH = Path(__file__).resolve().with_name("universe.json")
+REQUIRED_FIELDS = ("id", "name", "ticker", "assetType", "currency", "baseMaxWeight")
+DEFAULT_CHAIN = {"base": "SPY", "sox": "SMH", "nvda": "NVDA", "utility": "XLU", "copper": "HG=F", "energy": "USO"}
+MARKET_GROUPS = ("crypto", "hk", "futures", "us")
+
+
+def market_of(ticker: str, asset_type: str | None = None) -> str:
+    """Market group of a ticker: crypto, hk, futures or us."""
+    if asset_type == "crypto" or ticker.endswith(("-USD", "USDT")):
+        return "crypto"
+    if asset_type == "hk_equity" or ticker.endswith(".HK"):
+        return "hk"
+    if ticker.endswith("=F"):
+        return "futures"
+    return "us"
+
+
+@dataclass(frozen=True)
+class Universe:
+    assets: tuple[dict[str, Any], ...]
+    benchmarks: dict[str, str]
+    references: tuple[str, ...]
+    chain: dict[str, str] = field(default_factory=lambda: dict(DEFAULT_CHAIN))
+
+    @property
+    def asset_tickers(self) -> list[str]:
+        return [a["ticker"] for a in self.assets]
+
+    @property
+    def benchmark_of(self) -> dict[str, str]:
+        return {a["id"]: a["benchmarkId"] for a in self.assets if a.get("benchmarkId")}
+
+    def price_plan(self) -> list[str]:
+        """Deduplicated fetch list: asset tickers, then benchmarks, then reference series, then the Kondratieff chain."""
+        return list(dict.fromkeys([*self.asset_tickers, *self.benchmarks.values(), *self.references, *self.chain.values()]))
+
+    @property
+    def groups(self) -> dict[str, list[str]]:
+        """{market group: tickers of the price plan}, groups without tickers left out."""
+        types = {a["ticker"]: a.get("assetType") for a in self.assets}
+        out: dict[str, list[str]] = {}
+        for t in self.price_plan():
+            out.setdefault(market_of(t, types.get(t)), []).append(t)
+        return out
+
+
+def universe_path() -> Path:
+    return Path(os.environ.get("UNIVERSE_PATH") or DEFAULT_UNIVERSE_PATH).resolve()
+
+
+def parse_universe(doc: dict[str, Any]) -> Universe:
+    """Validate a universe document; raises ValueError on missing fields or duplicate ids."""
+    assets = doc.get("assets") or []
+    seen: set[str] = set()
+    for a in assets:
+        missing = [k for k in REQUIRED_FIELDS if a.get(k) is None]
+        if missing:
+            raise ValueError(f"universe asset {a.get('id')!r} missing {missing}")
+        if a["id"] in seen:
+            raise ValueError(f"duplicate universe asset id {a['id']!r}")
+        seen.add(a["id"])
+    benchmarks = dict(doc.get("benchmarks") or {})
+    unknown = {a["benchmarkId"] for a in assets if a.get("benchmarkId")} - set(benchmarks)
+    if unknown:
+        raise ValueError(f"benchmarkId without ticker: {sorted(unknown)}")
+    return Universe(
+        assets=tuple(dict(a) for a in assets),
+        benchmarks=benchmarks,
+        references=tuple(doc.get("references") or ()),
+        chain={**DEFAULT_CHAIN, **(doc.get("kondratieff") or {})},
+    )
+
+
+_CACHE: dict[tuple[str, float], Universe] = {}
+
+
+def load_universe(path: Path | None = None) -> Universe:
+    """Parsed universe; re-read only when the file changes (scheduler jobs pick up edits without restart)."""
+    p = Path(path).resolve() if path else universe_path()
+    key = (str(p), p.stat().st_mtime)
+    hit = _CACHE.get(key)
+    if hit is None:
+        hit = parse_universe(json.loads(p.read_text(encoding="utf-8")))
+        _CACHE.clear()
+        _CACHE[key] = hit
+    return hit
@@ -0,0 +1,35 @@
+"""Shared fixtures: `app` importable from dashboard_backend/, synthetic daily series."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+BACKEND = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND))
+
+
+def daily_rows(n: int, seed: int = 0, start_day: int = 19000, gaps: bool = True) -> list[dict[str, Any]]:
+    """n weekday OHLCV rows (epoch days) of a random walk; gaps drops a few days like a real feed."""
+    rng = np.random.default_rng(seed)
+    days = np.arange(start_day, start_day + n * 2)
+    days = days[(days + 3) % 7 < 5][:n]
+    if gaps:
+        days = np.delete(days, rng.choice(len(days), size=len(days) // 40, replace=False))
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, len(days))))
+    open_ = close * np.exp(rng.normal(0, 0.005, len(days)))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, len(days)))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, len(days)))
+    vol = rng.integers(1_000, 100_000, len(days))
+    return [
+        {"date": int(d), "open": float(o), "high": float(h), "low": float(l), "close": float(c), "volume": int(v)}
+        for d, o, h, l, c, v in zip(days, open_, high, low, close, vol)
+    ]
+
+
+@pytest.fixture
+def rows_factory():
+    return daily_rows
@@ -0,0 +1,46 @@
+import pytest
+
+from app.providers import alfred
+
+
+@pytest.fixture
+def vintages(monkeypatch):
+    """Stubbed ALFRED endpoints: set .dates / .rows; .calls records (endpoint, realtime_start)."""
+    class Feed:
+        dates: list = []
+        rows: list = []
+        calls: list = []
+
+    feed = Feed()
+    monkeypatch.setattr(alfred, "fetch_vintage_dates", lambda sid, rs: (feed.calls.append(("dates", rs)), list(feed.dates))[1])
+    monkeypatch.setattr(alfred, "fetch_vintage_rows", lambda sid, obs, rs=None: (feed.calls.append(("rows", rs)), list(feed.rows))[1])
+    return feed
+
+
+def test_sync_sees_same_day_vintage_once(tmp_path, monkeypatch, vintages):
+    today = alfred.today_day()
+    store = alfred.VintageStore(tmp_path)
+    vintages.rows = [(today - 5, today - 4, alfred.OPEN_END, 1.0)]
+    store.sync("X", today - 10)
+
+    store.sync("X", today - 10)
+    assert vintages.calls == [("rows", None)]  # within ALFRED_SYNC_MINUTES
+    monkeypatch.setattr(alfred, "SYNC_MINUTES", 0)
+
+    vintages.dates = [today]
+    vintages.rows = [(today - 5, today - 4, today - 1, 1.0), (today - 5, today, alfred.OPEN_END, 2.0)]
+    series = store.sync("X", today - 10)
+    assert vintages.calls[1:] == [("dates", today), ("rows", today)]
+    assert series.asof(today) == (today - 5, 2.0)
+
+    store.sync("X", today - 10)
+    assert vintages.calls[3:] == [("dates", today)]
+
+
+def test_live_getters_need_explicit_opt_in(monkeypatch):
+    monkeypatch.setenv("FRED_API_KEY", "k")
+    monkeypatch.delenv("FRED_VINTAGES", raising=False)
+    assert alfred.default_store() is not None
+    assert alfred.live_store() is None
+    monkeypatch.setenv("FRED_VINTAGES", "1")
+    assert alfred.live_store() is not None
@@ -0,0 +1,30 @@
+import pytest
+
+from app.compute.features import compute_all, compute_batch
+
+
+def _same(a, b):
+    assert a.keys() == b.keys()
+    for k in a:
+        if a[k] is None or b[k] is None:
+            assert a[k] is None and b[k] is None, k
+        else:
+            assert a[k] == pytest.approx(b[k], rel=1e-9, abs=1e-9), k
+
+
+def test_compute_batch_matches_compute_all(rows_factory):
+    universe = [rows_factory(n, seed=i) for i, n in enumerate((400, 260, 120, 70, 25, 3, 1))] + [[]]
+    for series, got in zip(universe, compute_batch(universe)):
+        _same(got, compute_all(series))
+
+
+def test_compute_batch_zero_and_missing_closes(rows_factory):
+    rows = rows_factory(90, seed=7)
+    rows[40]["close"] = 0.0
+    rows[41]["close"] = None
+    [got] = compute_batch([rows])
+    _same(got, compute_all(rows))
+
+
+def test_compute_batch_empty():
+    assert compute_batch([]) == []
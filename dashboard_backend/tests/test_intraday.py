@@ -0,0 +1,110 @@
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from conftest import BACKEND
+from app.compute import intraday
+from app.compute.intraday import KlineRing
+from app.providers import binance
+
+sys.path.insert(0, str(BACKEND.parent / "tools"))
+import binance_standin  # noqa: E402
+
+MIN = 60_000
+
+
+def _klines(opens):
+    opens = np.asarray(opens, dtype=float)
+    return np.column_stack([opens, opens / MIN, opens / MIN + 1, opens / MIN - 1, opens / MIN + 0.5, np.ones(len(opens))])
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    """The klines stand-in on a free local port, set as the only Binance base."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), binance_standin.Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(binance, "BASE_URL", url)
+    monkeypatch.setattr(binance, "FALLBACK_BASE_URL", None)
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+def test_ring_append_overwrite_and_ignore_older():
+    ring = KlineRing(capacity=5, interval="1m")
+    assert ring.append(_klines([0, MIN, 2 * MIN])) == 3
+    revised = _klines([2 * MIN])
+    revised[0, 4] = 99.0
+    assert ring.append(np.vstack([_klines([0, MIN]), revised, _klines([3 * MIN])])) == 2
+    v = ring.view()
+    np.testing.assert_array_equal(v[:, 0], [0, MIN, 2 * MIN, 3 * MIN])
+    assert v[2, 4] == 99.0
+    assert ring.last_open_ms == 3 * MIN
+
+
+def test_ring_wraps_and_keeps_newest():
+    ring = KlineRing(capacity=4, interval="1m")
+    ring.append(_klines(np.arange(3) * MIN))
+    ring.append(_klines(np.arange(3, 6) * MIN))
+    assert len(ring) == 4 and ring.start != 0
+    np.testing.assert_array_equal(ring.view()[:, 0], np.arange(2, 6) * MIN)
+    assert ring.append(_klines(np.arange(0, 20) * MIN)) == 1 + 4  # overwrite 5, then only the newest 4 of 6..19
+    np.testing.assert_array_equal(ring.view()[:, 0], np.arange(16, 20) * MIN)
+
+
+def test_ring_save_load_roundtrip(tmp_path):
+    ring = KlineRing(capacity=3, interval="1m")
+    ring.append(_klines(np.arange(5) * MIN))
+    path = tmp_path / "ring.json"
+    ring.save(path)
+    np.testing.assert_array_equal(KlineRing.load(path, capacity=3, interval="1m").view(), ring.view())
+    assert len(KlineRing.load(path, capacity=3, interval="5m")) == 0
+
+
+def test_fetch_klines_pages_against_standin(standin):
+    now = int(time.time() * 1000) // MIN * MIN
+    k = binance.fetch_klines("BTCUSDT", "1m", start_ms=now - 2499 * MIN)
+    assert len(k) >= 2500  # three pages (1000 + 1000 + rest), plus a candle opened meanwhile
+    assert np.all(np.diff(k[:, 0]) == MIN)
+    assert k[0, 0] == now - 2499 * MIN
+    ref = binance_standin.klines("1m", int(k[0, 0]), int(k[999, 0]), 1000, int(time.time() * 1000))
+    np.testing.assert_allclose(k[:1000, :6], np.asarray([r[:6] for r in ref], dtype=float)[:, :6])
+
+
+def test_fetch_klines_keeps_pages_before_a_failure(standin, monkeypatch):
+    real, calls = binance._klines, []
+
+    def flaky(base, params):
+        calls.append(base)
+        if len(calls) > 2:
+            raise OSError("connection reset")
+        return real(base, params)
+
+    monkeypatch.setattr(binance, "_klines", flaky)
+    now = int(time.time() * 1000)
+    k = binance.fetch_klines("BTCUSDT", "1m", start_ms=now - 2500 * MIN)
+    assert len(k) == 2000
+
+
+def test_fetch_klines_falls_back(standin, monkeypatch):
+    monkeypatch.setattr(binance, "BASE_URL", "http://127.0.0.1:9")
+    monkeypatch.setattr(binance, "FALLBACK_BASE_URL", standin)
+    k = binance.fetch_klines("BTCUSDT", "1h", limit=24)
+    assert len(k) == 24
+    monkeypatch.setattr(binance, "FALLBACK_BASE_URL", None)
+    assert binance.fetch_klines("BTCUSDT", "1h", limit=24).shape == (0, 6)
+
+
+def test_fetch_new_fills_then_extends_ring(standin):
+    ring = KlineRing(capacity=1500, interval="1m")
+    assert intraday.fetch_new(ring) >= 1500
+    assert len(ring) == 1500
+    last = ring.last_open_ms
+    assert intraday.fetch_new(ring) >= 1  # the still-open candle is rewritten
+    assert ring.last_open_ms >= last
+    assert np.all(np.diff(ring.view()[:, 0]) == MIN)
@@ -0,0 +1,31 @@
+from app.compute.percentile import MacroRanks
+
+
+def _rows(n, revise=None):
+    rows = [{"date": 19000 + i, "value": float((i * 37) % 11)} for i in range(n)]
+    if revise is not None:
+        rows[revise]["value"] = 99.0
+    return rows
+
+
+def test_new_rows_are_pushed_incrementally():
+    ranks = MacroRanks()
+    first = ranks.update("HY", _rows(300))
+    assert ranks.update("HY", _rows(360)) is first
+    assert len(first) == 360
+    assert first.sorted_values() == MacroRanks().update("HY", _rows(360)).sorted_values()
+
+
+def test_revised_earlier_row_rebuilds():
+    ranks = MacroRanks()
+    first = ranks.update("HY", _rows(300))
+    rebuilt = ranks.update("HY", _rows(320, revise=50))
+    assert rebuilt is not first
+    assert rebuilt.sorted_values() == MacroRanks().update("HY", _rows(320, revise=50)).sorted_values()
+
+
+def test_revised_last_row_replaces_in_place():
+    ranks = MacroRanks()
+    first = ranks.update("HY", _rows(300))
+    assert ranks.update("HY", _rows(300, revise=299)) is first
+    assert 99.0 in first.sorted_values()
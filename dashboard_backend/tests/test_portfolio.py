@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from app.compute.portfolio import RollingCov
+
+
+def _panel(t, n, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = np.arange(20000, 20000 + t, dtype=np.int64)
+    rets = rng.normal(0, 0.01, (t, n)) @ rng.normal(0, 1, (n, n)) * 0.5
+    rets[rng.random((t, n)) < 0.05] = np.nan
+    return dates, rets
+
+
+def _fresh(dates, rets, ids, window):
+    cov = RollingCov(window)
+    cov.update(dates, rets, ids)
+    return cov
+
+
+def _assert_same(inc, fresh):
+    c1, s1, n1 = inc.covariance()
+    c2, s2, n2 = fresh.covariance()
+    np.testing.assert_allclose(c1, c2, rtol=1e-9, atol=1e-15)
+    assert s1 == pytest.approx(s2, rel=1e-9)
+    np.testing.assert_array_equal(n1, n2)
+
+
+def test_incremental_matches_fresh_build():
+    dates, rets = _panel(400, 5)
+    ids = tuple("abcde")
+    inc = RollingCov(window=120)
+    inc.update(dates[:200], rets[:200], ids)
+    for end in (201, 205, 260, 400):
+        added = inc.update(dates[:end], rets[:end], ids)
+        assert added <= end - 200
+        _assert_same(inc, _fresh(dates[:end], rets[:end], ids, 120))
+
+
+def test_revised_row_is_replaced():
+    dates, rets = _panel(300, 4, seed=3)
+    ids = tuple("abcd")
+    inc = RollingCov(window=100)
+    inc.update(dates, rets, ids)
+    revised = rets.copy()
+    revised[-30, 1] = 0.05
+    revised[-10, 2] = np.nan
+    assert inc.update(dates, revised, ids) == 2
+    _assert_same(inc, _fresh(dates, revised, ids, 100))
+
+
+def test_new_columns_reset():
+    dates, rets = _panel(150, 3, seed=5)
+    inc = RollingCov(window=60)
+    inc.update(dates, rets[:, :2], ("a", "b"))
+    inc.update(dates, rets, ("a", "b", "c"))
+    _assert_same(inc, _fresh(dates, rets, ("a", "b", "c"), 60))
+
+
+def test_short_history_not_diluted():
+    dates, rets = _panel(252, 3, seed=9)
+    rets[:, 2] = np.nan
+    rets[-90:, 2] = np.random.default_rng(1).normal(0, 0.01, 90)
+    cov, _, counts = _fresh(dates, rets, ("a", "b", "c"), 252).covariance()
+    assert counts[2] == 90
+    assert cov[2, 2] == pytest.approx(np.mean(rets[-90:, 2] ** 2))
+    assert cov[0, 0] == pytest.approx(np.nanmean(rets[:, 0] ** 2))
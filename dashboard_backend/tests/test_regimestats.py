@@ -0,0 +1,62 @@
+import numpy as np
+
+from app.compute.regimestats import RegimeStats
+
+
+def _history(n, seed=1):
+    rng = np.random.default_rng(seed)
+    days = np.arange(19000, 19000 + n)
+    letters, r = [], "A"
+    for _ in days:
+        if rng.random() < 0.05:
+            r = "ABCD"[rng.integers(4)]
+        letters.append(r)
+    prices = {"x": [{"date": int(d), "close": 100 + 5 * np.sin(d / 7) + 0.01 * d} for d in days]}
+    return days, letters, prices
+
+
+def test_sliding_window_appends_tail():
+    days, letters, prices = _history(400)
+    full = RegimeStats()
+    full.update(days, letters, prices)
+    inc = RegimeStats()
+    inc.update(days[:300], letters[:300], prices)
+    assert inc.update(days[50:], letters[50:], prices) == 100
+    assert inc.summary() == full.summary()
+
+
+def test_changed_overlap_rebuilds():
+    days, letters, prices = _history(400)
+    inc = RegimeStats()
+    inc.update(days[:300], letters[:300], prices)
+    revised = list(letters[50:])
+    revised[10] = "D" if revised[10] != "D" else "A"
+    inc.update(days[50:], revised, prices)
+    fresh = RegimeStats()
+    fresh.update(days[50:], revised, prices)
+    assert inc.summary() == fresh.summary()
+
+
+def test_readjusted_prices_and_new_assets_match_fresh_build():
+    days, letters, prices = _history(400)
+    unadjusted = {"x": [{**r, "close": r["close"] / 10} for r in prices["x"][:300]]}
+    inc = RegimeStats()
+    inc.update(days[:300], letters[:300], unadjusted)
+    later = {"x": prices["x"], "y": prices["x"]}
+    inc.update(days, letters, later)
+    fresh = RegimeStats()
+    fresh.update(days, letters, later)
+    assert inc.summary() == fresh.summary()
+
+
+def test_provisional_close_and_bounded_storage():
+    days, letters, prices = _history(400)
+    inc = RegimeStats()
+    inc.update(days, letters, prices)
+    hist = inc.fwd["x"][21].hist.shape
+    live = {"x": [*prices["x"][:-1], {**prices["x"][-1], "close": prices["x"][-1]["close"] * 1.03}]}
+    inc.update(days, letters, live)  # today's close moved: no rebuild, no return ends on it
+    fresh = RegimeStats()
+    fresh.update(days, letters, live)
+    assert inc.summary() == fresh.summary()
+    assert inc.fwd["x"][21].hist.shape == hist
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from app.compute.resample import Bars, merge_bars, ohlcv_arrays, resample
+
+FIELDS = ("period", "day", "open", "high", "low", "close", "volume")
+
+
+def _assert_bars(a: Bars, b: Bars):
+    assert len(a) == len(b)
+    for f in FIELDS:
+        np.testing.assert_allclose(getattr(a, f), getattr(b, f), rtol=1e-12, err_msg=f)
+
+
+@pytest.mark.parametrize("freq", ["W", "M"])
+@pytest.mark.parametrize("step", [1, 3, 7])
+def test_sliding_window_matches_full_resample(rows_factory, freq, step):
+    days, vals = ohlcv_arrays(rows_factory(700, seed=11))
+    window = 250
+    bars = resample(days[:window], vals[:window], freq)
+    for end in range(window + step, len(days) + 1, step):
+        lo = end - window
+        bars, n = merge_bars(bars, days[lo:end], vals[lo:end], freq)
+        assert n <= 2 + step // 5
+        _assert_bars(bars, resample(days[:end], vals[:end], freq))
+
+
+@pytest.mark.parametrize("freq", ["W", "M"])
+def test_revised_close_rebuilds_from_window(rows_factory, freq):
+    days, vals = ohlcv_arrays(rows_factory(400, seed=4))
+    bars = resample(days[:300], vals[:300], freq)
+    revised = vals.copy()
+    j = int(np.searchsorted(days, bars.day[-2]))
+    revised[j, 3] *= 1.05
+    merged, n = merge_bars(bars, days[100:310], revised[100:310], freq)
+    _assert_bars(merged, resample(days[100:310], revised[100:310], freq))
+    assert n == len(merged)
+
+
+def test_empty_window_keeps_cache(rows_factory):
+    days, vals = ohlcv_arrays(rows_factory(60, seed=2))
+    bars = resample(days, vals, "W")
+    merged, n = merge_bars(bars, days[:0], vals[:0], "W")
+    assert merged is bars and n == 0
@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.rolling import pmi_like, rolling_zscore
+
+
+def _zscore_clamp_adaptive(vals, min_window=36, max_window=120):
+    """The per-window loop pmi_like replaced (providers.fred before the shared kernel)."""
+    valid_count = sum(1 for v in vals if v is not None)
+    zscore_window = max(min_window, min(max_window, max(0, valid_count - 1)))
+    out = []
+    for i in range(len(vals)):
+        if i < zscore_window - 1:
+            out.append(None)
+            continue
+        w = [x for x in vals[max(0, i - zscore_window + 1): i + 1] if x is not None]
+        if len(w) < min_window:
+            out.append(None)
+            continue
+        m = sum(w) / len(w)
+        var = sum((x - m) ** 2 for x in w) / len(w)
+        std = math.sqrt(var) if var > 0 else 1e-9
+        v = vals[i]
+        if v is None:
+            out.append(None)
+            continue
+        out.append(max(35, min(65, 50 + 5 * (v - m) / std)))
+    return out
+
+
+def _orders_yoy(n, seed, missing=()):
+    rng = np.random.default_rng(seed)
+    vals = list(np.cumsum(rng.normal(0, 1.5, n)) + 3.0)
+    return [None if i in missing else float(v) for i, v in enumerate(vals)]
+
+
+@pytest.mark.parametrize("n,missing", [(300, ()), (150, (3, 50, 51, 140)), (60, (10,)), (36, ()), (20, ())])
+def test_pmi_like_matches_loop(n, missing):
+    vals = _orders_yoy(n, seed=n, missing=missing)
+    new, old = pmi_like(vals), _zscore_clamp_adaptive(vals)
+    assert [v is None for v in new] == [v is None for v in old]
+    assert [v for v in new if v is not None] == pytest.approx([v for v in old if v is not None], abs=1e-9)
+
+
+def test_rolling_zscore_matches_window_loop():
+    x = np.array(_orders_yoy(200, seed=1, missing=(5, 77)), dtype=float)
+    window = 30
+    z = rolling_zscore(x, window, min_count=25)
+    for i in range(len(x)):
+        w = x[max(0, i - window + 1): i + 1]
+        w = w[~np.isnan(w)]
+        if np.isnan(x[i]) or i < window - 1 or len(w) < 25:
+            assert np.isnan(z[i])
+        else:
+            assert z[i] == pytest.approx((x[i] - w.mean()) / w.std(), abs=1e-9)
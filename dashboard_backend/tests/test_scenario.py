@@ -0,0 +1,97 @@
+from bisect import bisect_right
+
+import numpy as np
+import pytest
+
+from app.compute.builder import _action, _catalyst_light, _regime_mult, _risk_mult
+from app.compute.params import DEFAULT_PARAMS
+from app.compute.regime import regime
+from app.compute.scenario import PCT_FIELDS, ScenarioInputs, run_scenarios
+from app.compute.scoring import risk_score
+
+MACROS = [
+    {"HY": 3.2, "HY_chg": -0.4, "REAL10Y": 1.9, "REAL10Y_chg": -0.3, "DXY": 121.0, "DXY_chg": -1.5, "PMI": 51.0, "CORE_CPI": 3.1},
+    {"HY": 6.5, "HY_chg": 0.8, "REAL10Y": 2.4, "REAL10Y_chg": 0.2, "DXY": 126.0, "DXY_chg": 2.0, "PMI": 44.0, "CORE_CPI": 4.2},
+    {"HY": 5.1, "HY_chg": -0.6, "REAL10Y": 0.4, "REAL10Y_chg": -0.5, "DXY": 101.0, "DXY_chg": -2.5, "PMI": None, "CORE_CPI": 2.0},
+    {"HY": 2.6, "HY_chg": None, "REAL10Y": None, "REAL10Y_chg": None, "DXY": 95.0, "DXY_chg": None, "PMI": 56.0, "CORE_CPI": None},
+]
+
+
+def _inputs(macro, with_windows=True):
+    rng = np.random.default_rng(0)
+    centers = {"HY": 4.0, "REAL10Y": 1.5, "DXY": 115.0, "PMI": 50.0, "CORE_CPI": 3.0}
+    windows = {f: sorted(rng.normal(centers[f], centers[f] * 0.2, 300).tolist()) if with_windows else [] for f in PCT_FIELDS}
+    return ScenarioInputs(
+        generated_at="2026-01-02T00:00:00Z",
+        macro=macro,
+        windows=windows,
+        asset_ids=["a", "b", "c", "d"],
+        base=[20.0, 10.0, 5.0, 15.0],
+        trend=["green", "red", "yellow", "green"],
+        risk=["green", "yellow", "green", "red"],
+        row_count=[300, 300, 10, 300],
+        vol_pct=[30.0, 75.0, None, 95.0],
+    )
+
+
+def _scalar(inputs):
+    """The per-build scalar path (builder): percentiles -> risk_score -> regime -> lights -> weights / actions."""
+    m, p = inputs.macro, DEFAULT_PARAMS
+
+    def block(f, chg=None):
+        w, v = inputs.windows.get(f) or [], m.get(f)
+        pct = bisect_right(w, v) / len(w) * 100 if w and v is not None else None
+        return {"value": v, "change1m": m.get(chg) if chg else None, "percentile": pct}
+
+    hy, real, dxy = block("HY", "HY_chg"), block("REAL10Y", "REAL10Y_chg"), block("DXY", "DXY_chg")
+    pmi, cpi = block("PMI"), block("CORE_CPI")
+    score, confidence, _ = risk_score(hy, real, dxy, pmi, cpi)
+    letter = regime(hy, real, pmi, cpi, dxy, score, p)[0]
+    catalyst = _catalyst_light(letter, m.get("REAL10Y"), m.get("DXY_chg"), p)
+    assets = {}
+    for aid, base, trend, risk, rows, vol_pct in zip(
+        inputs.asset_ids, inputs.base, inputs.trend, inputs.risk, inputs.row_count, inputs.vol_pct
+    ):
+        if rows < p.min_history:
+            trend = risk = "yellow"
+        suggested = round(min(base, base * _regime_mult(letter, p) * _risk_mult(vol_pct, p)), 2)
+        assets[aid] = (suggested, _action(trend, risk, catalyst, suggested, 0))
+    return score, confidence, letter, catalyst, assets
+
+
+@pytest.mark.parametrize("macro", MACROS)
+@pytest.mark.parametrize("with_windows", [True, False])
+def test_baseline_matches_scalar_path(macro, with_windows):
+    inputs = _inputs(macro, with_windows)
+    out = run_scenarios(inputs)
+    score, confidence, letter, catalyst, assets = _scalar(inputs)
+    assert out["count"] == 1
+    assert out["riskScore"][0] == pytest.approx(score)
+    assert out["riskScoreConfidence"][0] == pytest.approx(confidence)
+    assert out["regime"][0] == letter
+    assert out["catalystLight"][0] == catalyst
+    for aid, (suggested, action) in assets.items():
+        assert out["assets"][aid]["suggestedMaxWeight"][0] == pytest.approx(suggested)
+        assert out["assets"][aid]["action"][0] == action
+
+
+def test_shift_matches_scalar_path_on_shifted_inputs():
+    inputs = _inputs(MACROS[0])
+    out = run_scenarios(inputs, grid={"HY": [0.0, 2.5], "REAL10Y": [-1.0, 1.0]})
+    assert out["count"] == 4
+    k = 0
+    for d_hy in (0.0, 2.5):
+        for d_real in (-1.0, 1.0):
+            m = dict(inputs.macro)
+            m["HY"] += d_hy
+            m["HY_chg"] += d_hy
+            m["REAL10Y"] += d_real
+            m["REAL10Y_chg"] += d_real
+            score, _, letter, catalyst, _ = _scalar(_inputs(m))
+            assert (out["riskScore"][k], out["regime"][k], out["catalystLight"][k]) == (pytest.approx(score), letter, catalyst)
+            k += 1
+
+
+def test_empty_grid_values_rejected():
+    with pytest.raises(ValueError, match="non-empty"):
+        run_scenarios(_inputs(MACROS[0]), grid={"HY": []})
@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+import pytest
+
+from app.compute import builder
+from app.compute.resample import BarCache
+from app.compute.sections import RETRY_MINUTES, SectionInputs
+from app.universe import load_universe
+
+GOOD = {"value": 4.0, "change7d": 0.1, "change1m": -0.2, "freshness_days": 1, "observations": [], "history": []}
+
+
+@pytest.fixture
+def store(monkeypatch):
+    s = SectionInputs()
+    monkeypatch.setattr(builder, "SECTION_INPUTS", s)
+    monkeypatch.setattr(builder, "BAR_CACHE", BarCache())
+    return s
+
+
+def _fred(monkeypatch, hy):
+    for name in ("get_real10y", "get_dxy", "get_core_cpi_yoy", "get_pmi_like"):
+        monkeypatch.setattr(builder.fred_prov, name, lambda: dict(GOOD))
+    monkeypatch.setattr(builder.fred_prov, "get_hy", lambda: dict(hy))
+
+
+def _prices(monkeypatch, rows_factory, down=(), calls=None):
+    def fetch(tickers=None):
+        plan = tickers if tickers is not None else load_universe().price_plan()
+        if calls is not None:
+            calls.append(plan)
+        ohlcv, status = {}, {}
+        for i, t in enumerate(plan):
+            rows = [] if t in down else rows_factory(300, seed=i)
+            ohlcv[t] = rows
+            status[t] = {"ok": bool(rows), "provider": "test" if rows else "fallback", "row_count": len(rows)}
+        return ohlcv, status
+
+    monkeypatch.setattr(builder, "_fetch_prices_and_status", fetch)
+
+
+def test_failed_fetches_keep_last_good_inputs(store, monkeypatch, rows_factory):
+    groups = load_universe().groups
+    us = groups["us"][0]
+    _fred(monkeypatch, {**GOOD, "value": 3.3})
+    _prices(monkeypatch, rows_factory)
+    assert builder.fetch_sections(["macro", *groups]) == []
+    first = dict(store.refreshed)
+    rows = store.ohlcv[us]
+
+    _fred(monkeypatch, {"value": None, "change7d": None, "change1m": None, "freshness_days": 999})
+    _prices(monkeypatch, rows_factory, down={us})
+    failed = builder.fetch_sections(["macro", *groups])
+    assert failed == ["macro", "us"]
+    assert store.macro["HY"]["value"] == 3.3
+    assert store.ohlcv[us] is rows and store.status[us]["ok"]
+    assert all(store.refreshed[s] > first[s] for s in ["macro", *groups])
+    assert set(store.failed) == {"macro", "us"}
+    assert list(store.failed["us"]) == [us] and list(store.failed["macro"]) == ["HY"]
+
+
+def test_failed_tickers_retry_alone_with_backoff(store, monkeypatch, rows_factory):
+    groups = load_universe().groups
+    us = groups["us"][0]
+    calls = []
+    _fred(monkeypatch, GOOD)
+    _prices(monkeypatch, rows_factory, down={us}, calls=calls)
+    assert builder.fetch_sections(["macro", *groups]) == ["us"]
+    attempts, at = store.failed["us"][us]
+    assert attempts == 1 and store.next_retry() == at
+    assert store.retry_due(at - timedelta(seconds=1)) == {}
+
+    # Still down: only the failed ticker is refetched and its backoff doubles
+    assert builder.retry_failed(at) == []
+    assert calls[-1] == [us]
+    attempts, nxt = store.failed["us"][us]
+    assert attempts == 2 and nxt - at == timedelta(minutes=2 * RETRY_MINUTES)
+
+    _prices(monkeypatch, rows_factory, calls=calls)
+    assert builder.retry_failed(nxt) == ["us"]
+    assert calls[-1] == [us] and store.status[us]["ok"] and store.ohlcv[us]
+    assert store.failed == {} and store.next_retry() is None
+
+
+def test_first_fetch_failure_uses_fallbacks(store, monkeypatch, rows_factory):
+    _fred(monkeypatch, {"value": None})
+    _prices(monkeypatch, rows_factory, down=set(load_universe().groups["hk"]))
+    assert builder.fetch_sections(["macro", "hk"]) == ["hk", "macro"]
+    assert store.macro["HY"] == builder.FALLBACK_MACRO["HY"]
+    assert not any(store.status[t]["ok"] for t in load_universe().groups["hk"])
+    assert sorted(store.failed["hk"]) == sorted(load_universe().groups["hk"])
+
+
+def test_intraday_refresh_touches_only_its_assets(store, monkeypatch, rows_factory):
+    _fred(monkeypatch, GOOD)
+    _prices(monkeypatch, rows_factory)
+    builder.fetch_sections(["macro", *load_universe().groups])
+    payload = builder.merge_sections(None, ["macro", *load_universe().groups, "weekly"])
+    btc = next(a for a in payload["assets"] if a["ticker"] == "BTC-USD")["id"]
+    rows = rows_factory(300, seed=99)
+
+    out = builder.refresh_intraday(payload, {"BTC-USD": rows})
+    changed = {k for k in out if out[k] != payload.get(k)}
+    assert changed <= {"generatedAt", "sections", "assets", "assetSignals", "technicalData"}
+    assert [a["id"] for a in out["assets"] if a not in payload["assets"]] == [btc]
+    assert [k for k in out["technicalData"] if out["technicalData"][k] != payload["technicalData"][k]] == [btc]
+    assert "btc" in out["sections"]
+
+    full = builder.merge_sections(payload, ["crypto"])
+    assert next(a for a in out["assets"] if a["id"] == btc) == next(a for a in full["assets"] if a["id"] == btc)
@@ -0,0 +1,20 @@
+from app.compute.simulation import MIN_ROWS, simulate_allocation
+
+
+def test_short_history_asset_is_excluded(rows_factory):
+    series = {
+        "old": rows_factory(600, seed=1),
+        "other": rows_factory(600, seed=2),
+        "new": rows_factory(30, seed=3, start_day=19000 + 800),
+    }
+    weights = {"old": 0.4, "other": 0.3, "new": 0.2}
+    base = simulate_allocation({k: series[k] for k in ("old", "other")}, weights, n_paths=200, seed=7)
+    out = simulate_allocation(series, weights, n_paths=200, seed=7)
+    assert out["excluded"] == ["new"]
+    assert out["historyDays"] == base["historyDays"] >= MIN_ROWS
+    assert out["horizons"] == base["horizons"]
+    assert out["grossWeight"] == base["grossWeight"]
+
+
+def test_nothing_long_enough():
+    assert simulate_allocation({"a": []}, {"a": 0.5}, n_paths=10, seed=1) == {}
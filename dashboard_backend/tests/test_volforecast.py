@@ -0,0 +1,20 @@
+import warnings
+
+import numpy as np
+
+from app.compute.volforecast import VolForecaster
+
+
+def test_flat_series_gets_no_forecast_or_params(rows_factory):
+    closes = {
+        "live": np.array([r["close"] for r in rows_factory(400, seed=4)]),
+        "flat": np.full(400, 25.0),
+    }
+    vf = VolForecaster()
+    vf.params["flat"] = [0.05, 0.9]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        out = vf.forecast(closes)
+    assert set(out) == {"live"}
+    assert set(vf.params) == {"live"}
+    assert np.isfinite(out["live"]["garchVolAnn"]) and out["live"]["garchVolAnn"] > 0
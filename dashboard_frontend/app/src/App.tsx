@@ -13,6 +13,7 @@ function App() {
     refresh,
     assets,
     dailySignal,
+    regimeStats,
     assetSignals,
     macroSwitches,
     weeklyKondratieff,
@@ -30,6 +31,7 @@ function App() {
         return (
           <DailyOverview
             dailySignal={dailySignal}
+            regimeStats={regimeStats}
             macroSwitches={macroSwitches}
             assets={assets}
             assetSignals={assetSignals}
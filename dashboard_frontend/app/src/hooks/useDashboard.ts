@@ -165,6 +165,7 @@ export function useDashboard() {
     refresh,
     assets: data.assets,
     dailySignal: data.dailySignal,
+    regimeStats: data.regimeStats,
     assetSignals: data.assetSignals,
     macroSwitches: data.macroSwitches,
     weeklyKondratieff: data.weeklyKondratieff,
@@ -5,7 +5,7 @@ import { RegimeBadge } from '@/components/ui/custom/RegimeBadge';
 import { RiskScore } from '@/components/ui/custom/RiskScore';
 import { ActionBadge } from '@/components/ui/custom/ActionBadge';
 import { cn } from '@/lib/utils';
-import type { Asset, AssetSignal, DailySignal, MacroSwitch } from '@/types';
+import type { Asset, AssetSignal, DailySignal, MacroSwitch, RegimeStats } from '@/types';
 import { 
   TrendingUp, 
   TrendingDown, 
@@ -19,6 +19,7 @@ import {
 
 interface DailyOverviewProps {
   dailySignal: DailySignal;
+  regimeStats?: RegimeStats;
   macroSwitches: MacroSwitch[];
   assets: Asset[];
   assetSignals: AssetSignal[];
@@ -40,6 +41,7 @@ const switchIcons: Record<string, React.ElementType> = {
 
 export function DailyOverview({ 
   dailySignal, 
+  regimeStats,
   macroSwitches, 
   assets, 
   assetSignals,
@@ -55,6 +57,17 @@ export function DailyOverview({
             {/* Regime & Risk Score */}
             <div className="lg:col-span-1 flex flex-col items-center justify-center border-r border-slate-200">
               <RegimeBadge regime={dailySignal.regime} size="lg" className="mb-4" />
+              {regimeStats?.current && (
+                <div className="mb-4 text-xs text-slate-500 text-center space-y-1">
+                  <p>
+                    已持续 {regimeStats.current.spellDays} 天
+                    {regimeStats.current.expectedDays != null && ` · 平均 ${regimeStats.current.expectedDays.toFixed(0)} 天`}
+                  </p>
+                  <p>
+                    次日维持 {((regimeStats.current.next[regimeStats.current.regime] ?? 0) * 100).toFixed(1)}%
+                  </p>
+                </div>
+              )}
               <RiskScore score={dailySignal.riskScore} size="md" />
             </div>
 
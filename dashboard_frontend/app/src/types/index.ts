@@ -41,6 +41,7 @@ export interface AssetSignal {
   riskLight: LightStatus;
   catalystLight: LightStatus;
   suggestedMaxWeight: number;
+  volTargetMaxWeight?: number;
   action: ActionType;
   reasonCodes: string[];
   notes: string;
@@ -61,6 +62,11 @@ export interface AssetTechnicalData {
   correlationDXY: number;
   correlationRealRate: number;
   correlationSPX: number;
+  ewmaVolAnn?: number;
+  ewmaVolPercentile1y?: number;
+  garchVolAnn?: number;
+  garchVolPercentile1y?: number;
+  garchParams?: { alpha: number; beta: number };
 }
 
 export interface DailySignal {
@@ -88,6 +94,127 @@ export interface MacroSwitch {
   frequency: 'D' | 'W' | 'M';
 }
 
+export interface RegimeTransition {
+  date: string;
+  from: RegimeType;
+  to: RegimeType;
+}
+
+export interface RegimeHistory {
+  dates: string[];
+  riskScore: number[];
+  riskScoreConfidence: number[];
+  regime: RegimeType[];
+  transitions: RegimeTransition[];
+}
+
+export interface RegimeForwardStats {
+  n: number;
+  mean: number;
+  std: number;
+  hitRate: number;
+  p10: number;
+  p50: number;
+  p90: number;
+}
+
+export interface RegimeStats {
+  since: string;
+  asOf: string;
+  days: number;
+  regimes: RegimeType[];
+  transitionCounts: number[][];
+  transitionMatrix: (number | null)[][];
+  dwell: Record<string, { days: number; spells: number; meanSpellDays: number | null; expectedDays: number | null }>;
+  current: {
+    regime: RegimeType;
+    spellDays: number;
+    expectedDays: number | null;
+    next: Record<string, number | null>;
+  };
+  forwardReturns: {
+    horizons: number[];
+    assets: Record<string, Record<string, Partial<Record<RegimeType, RegimeForwardStats>>>>;
+  };
+}
+
+export interface PortfolioRiskAsset {
+  vol: number | null;
+  marginalRisk: number | null;
+  riskContribution: number | null;
+  volTargetMaxWeight: number;
+}
+
+export interface PortfolioRisk {
+  asOf: string;
+  window: number;
+  assetsUsed: number;
+  shrinkage: number;
+  portfolioVol: number;
+  targetVol: number;
+  scale: number;
+  grossWeight: number;
+  assets: Record<string, PortfolioRiskAsset>;
+}
+
+export interface SimulationHorizon {
+  days: number;
+  maxDrawdown: { p50: number; p90: number; p95: number; p99: number };
+  probDrawdownOver10: number;
+  return: { p5: number; p50: number; p95: number };
+  var95: number;
+  var99: number;
+  cvar95: number | null;
+}
+
+export interface IntradayStatus {
+  interval: string;
+  bars: number;
+  capacity: number;
+  lastOpen: string | null;
+  firstDay: string | null;
+  assets: string[];
+}
+
+export interface RiskSimulation {
+  asOf: string;
+  paths: number;
+  blockDays: number;
+  historyDays: number;
+  seed: number | null;
+  grossWeight: number;
+  /** Weighted assets left out for too little history */
+  excluded?: string[];
+  horizons: Record<string, SimulationHorizon>;
+}
+
+export interface RiskSensitivity {
+  step: number;
+  perStep: number;
+  perUnit: number;
+}
+
+export interface RegimeThreshold {
+  rule: string;
+  input: string;
+  op: '<' | '>' | '>=';
+  value: number | null;
+  threshold: number;
+  distance: number | null;
+  met: boolean;
+}
+
+export interface RiskAttribution {
+  riskScore: number;
+  regime: RegimeType;
+  components: { credit: number; liquidity: number; growth: number; inflation: number };
+  sensitivities: Record<string, RiskSensitivity>;
+  mostSensitive: string | null;
+  thresholds: RegimeThreshold[];
+  nearestThreshold: string | null;
+  regimeFlip: Record<string, { shift: number; steps: number; to: RegimeType } | null>;
+}
+
 export interface PriceData {
   date: string;
   open: number;
@@ -101,6 +228,7 @@ export interface WeeklyKondratieff {
   date: string;
   aiDiffusionIndex: number;
   constraintIndex: number;
+  weekEnding?: string | null;
   phase: 'spring' | 'winter' | 'transition';
   strategy: string;
   components: {
@@ -110,6 +238,13 @@ export interface WeeklyKondratieff {
     copperMomentum: number;
     energyPrice: number;
   };
+  chainInputMissing?: string | null;
+  missingInputs?: string[];
+  history?: {
+    dates: string[];
+    aiDiffusionIndex: (number | null)[];
+    constraintIndex: (number | null)[];
+  };
 }
 
 export interface PortfolioPosition {
@@ -140,4 +275,11 @@ export interface DashboardPayload {
   weeklyKondratieff?: WeeklyKondratieff;
   technicalData?: Record<string, AssetTechnicalData>;
   priceHistory?: Record<string, PriceData[]>;
+  regimeHistory?: RegimeHistory;
+  riskAttribution?: RiskAttribution;
+  regimeStats?: RegimeStats;
+  portfolioRisk?: PortfolioRisk | Record<string, never>;
+  riskSimulation?: RiskSimulation | Record<string, never> | null;
+  intraday?: IntradayStatus;
+  sections?: Record<string, string>;
 }
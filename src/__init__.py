@@ -1 +1,8 @@
 # Data pipeline for dashboard JSON generation
+# Shared compute engines live in the backend package (dashboard_backend/app); make `app` importable.
+import sys
+from pathlib import Path
+
+_BACKEND_DIR = str(Path(__file__).resolve().parents[1] / "dashboard_backend")
+if _BACKEND_DIR not in sys.path:
+    sys.path.append(_BACKEND_DIR)
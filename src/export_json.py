@@ -7,22 +7,17 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any
 
+from app.align import day_str
+from app.universe import load_universe
+
 from . import features
 from . import regime as regime_module
 from . import scoring
 from .providers.yfinance_provider import latest_price_and_returns
 
-# Asset definitions: id, name, ticker, assetType, currency, benchmarkId, baseMaxWeight
-ASSET_DEFS = [
-    {"id": "BTC", "name": "Bitcoin", "ticker": "BTC-USD", "assetType": "crypto", "currency": "USD", "benchmarkId": "QQQ", "baseMaxWeight": 0.25},
-    {"id": "AI_BASKET", "name": "AI Basket", "ticker": "SMH", "assetType": "equity", "currency": "USD", "benchmarkId": "SPY", "baseMaxWeight": 0.40},
-    {"id": "TSLA", "name": "Tesla", "ticker": "TSLA", "assetType": "equity", "currency": "USD", "benchmarkId": "SPY", "baseMaxWeight": 0.15},
-    {"id": "BABA", "name": "Alibaba", "ticker": "9988.HK", "assetType": "hk_equity", "currency": "HKD", "benchmarkId": "HSTECH", "baseMaxWeight": 0.15},
-    {"id": "TENCENT", "name": "Tencent", "ticker": "0700.HK", "assetType": "hk_equity", "currency": "HKD", "benchmarkId": "HSTECH", "baseMaxWeight": 0.15},
-    {"id": "XAU", "name": "Gold", "ticker": "GC=F", "assetType": "metal", "currency": "USD", "baseMaxWeight": 0.20},
-    {"id": "XAG", "name": "Silver", "ticker": "SI=F", "assetType": "metal", "currency": "USD", "baseMaxWeight": 0.08},
-    {"id": "HG", "name": "Copper", "ticker": "HG=F", "assetType": "future", "currency": "USD", "baseMaxWeight": 0.15},
-]
+# Asset definitions (id, name, ticker, assetType, currency, benchmarkId, baseMaxWeight) come from the
+# shared universe config: dashboard_backend/app/universe.json, or UNIVERSE_PATH
+ASSET_DEFS = load_universe().assets
 
 TICKER_TO_ID = {d["ticker"]: d["id"] for d in ASSET_DEFS}
 
@@ -300,8 +295,8 @@ def build_payload(
             "freshness_days": st.get("freshness_days", 999),
             "ok": st.get("ok", False),
             "note": st.get("note"),
-            "last_date": st.get("last_date"),
-            "last_obs_date": st.get("last_obs_date") or st.get("last_date"),
+            "last_date": day_str(st.get("last_date")),
+            "last_obs_date": day_str(st.get("last_obs_date") or st.get("last_date")),
             "row_count": st.get("row_count", 0),
             "error_reason": st.get("error_reason"),
             "mapped_symbol": st.get("mapped_symbol"),
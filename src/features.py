@@ -6,9 +6,11 @@ from __future__ import annotations
 import math
 from typing import Any
 
+from app.compute.resample import period_return, resample_rows
 
-def _closes(series: list[dict[str, Any]]) -> list[tuple[str, float]]:
-    """(date, close) sorted by date ascending."""
+
+def _closes(series: list[dict[str, Any]]) -> list[tuple[int, float]]:
+    """(epoch day, close) sorted by date ascending."""
     out = []
     for r in series:
         c = r.get("close")
@@ -39,12 +41,9 @@ def ma200(series: list[dict[str, Any]]) -> float | None:
 
 
 def mom12w(series: list[dict[str, Any]]) -> float | None:
-    """12-week (≈84 trading days) momentum: (close_now / close_12w_ago - 1) * 100."""
-    pts = _closes(series)
-    n = min(84, len(pts) - 1)
-    if n < 1 or len(pts) < n + 1:
-        return None
-    return (pts[-1][1] / pts[-(n + 1)][1] - 1) * 100
+    """12-week momentum on weekly bars: (close_now / close 12 weekly bars ago - 1) * 100 (fewer bars if short)."""
+    bars = resample_rows(series, "W")
+    return period_return(bars, min(12, len(bars) - 1)) if len(bars) > 1 else None
 
 
 def vol_annualized(series: list[dict[str, Any]], window: int = 20) -> float | None:
@@ -128,7 +127,7 @@ def compute_all(
     else:
         out["volPercentile1y"] = 50.0
         out["ddPercentile1y"] = 50.0
-    # Placeholder for correlations (need benchmark series)
+    # Defaults; the pipeline fills RS / correlations via app.compute.relstrength / correlation when series exist
     out["rsToBenchmark"] = 1.0
     out["correlationDXY"] = 0.0
     out["correlationRealRate"] = 0.0
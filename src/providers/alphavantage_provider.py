@@ -5,11 +5,12 @@ TIME_SERIES_DAILY for stocks/ETF; use only when other providers fail to save quo
 from __future__ import annotations
 
 import os
-from datetime import datetime, timedelta
 from typing import Any
 
 import requests
 
+from app.align import parse_day, today_day
+
 BASE = "https://www.alphavantage.co/query"
 
 AV_SYMBOLS = {
@@ -40,16 +41,17 @@ def fetch_alphavantage(symbol: str, days: int = 400) -> list[dict[str, Any]]:
         series = data.get("Time Series (Daily)") or data.get("time_series_daily")
         if not series:
             return []
-        cutoff = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d")
+        cutoff = today_day() - days
         out = []
         for date_str, v in series.items():
-            if date_str < cutoff:
-                continue
             try:
+                day = parse_day(date_str)
                 c = float(v.get("4. close") or v.get("close", 0))
             except (TypeError, ValueError):
                 continue
-            out.append({"date": date_str, "open": c, "high": c, "low": c, "close": c, "volume": 0})
+            if day < cutoff:
+                continue
+            out.append({"date": day, "open": c, "high": c, "low": c, "close": c, "volume": 0})
         return sorted(out, key=lambda x: x["date"])[-days:] if out else []
     except Exception:
         return []
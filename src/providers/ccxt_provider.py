@@ -4,9 +4,10 @@ Pipeline runs without ccxt; if installed, can be used for higher-frequency BTC.
 """
 from __future__ import annotations
 
-from datetime import datetime, timedelta
 from typing import Any
 
+from app.align import day_from_ms
+
 try:
     import ccxt
 except ImportError:
@@ -16,22 +17,23 @@ except ImportError:
 def fetch_btc_ohlcv(
     timeframe: str = "1d",
     limit: int = 400,
+    since_ms: int | None = None,
 ) -> list[dict[str, Any]]:
     """
-    Fetch BTC OHLCV via ccxt (e.g. binance).
-    Returns [ {"date": "YYYY-MM-DD", "open", "high", "low", "close", "volume"}, ... ].
+    Fetch BTC OHLCV via ccxt (e.g. binance); since_ms = first open time (ms) for incremental pulls.
+    Returns [ {"date": epoch day (int, UTC), "ts": open time ms, "open", "high", "low", "close", "volume"}, ... ].
     """
     if ccxt is None:
         return []
     try:
         exchange = ccxt.binance({"enableRateLimit": True})
-        ohlcv = exchange.fetch_ohlcv("BTC/USDT", timeframe=timeframe, limit=limit)
+        ohlcv = exchange.fetch_ohlcv("BTC/USDT", timeframe=timeframe, since=since_ms, limit=limit)
         out = []
         for candle in ohlcv:
             ts, o, h, l, c, v = candle[0], candle[1], candle[2], candle[3], candle[4], candle[5]
-            dt = datetime.utcfromtimestamp(ts / 1000)
             out.append({
-                "date": dt.strftime("%Y-%m-%d"),
+                "date": day_from_ms(ts),
+                "ts": int(ts),
                 "open": float(o),
                 "high": float(h),
                 "low": float(l),
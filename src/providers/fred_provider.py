@@ -10,6 +10,9 @@ from typing import Any
 
 import requests
 
+from app.align import lookback, parse_day, series_arrays, today_day
+from app.rolling import pmi_like as pmi_like_series
+
 FRED_BASE = "https://api.stlouisfed.org/fred/series/observations"
 
 # Default series IDs (configurable)
@@ -30,7 +33,7 @@ def fetch_fred_series(
 ) -> list[dict[str, Any]]:
     """
     Fetch observations for a FRED series.
-    Returns list of {"date": "YYYY-MM-DD", "value": float}.
+    Returns list of {"date": epoch day (int), "value": float}.
     """
     key = api_key or os.environ.get("FRED_API_KEY")
     if not key:
@@ -56,7 +59,7 @@ def fetch_fred_series(
             if v in (".", None, ""):
                 continue
             try:
-                out.append({"date": o["date"], "value": float(v)})
+                out.append({"date": parse_day(o["date"]), "value": float(v)})
             except (TypeError, ValueError):
                 continue
         return out
@@ -72,22 +75,12 @@ def get_latest_and_changes(series_id: str) -> dict[str, Any]:
     if not obs:
         return {"value": None, "change7d": None, "change1m": None, "freshness_days": 999}
     obs = obs[-252:]  # last year of data
-    latest = obs[-1]
-    val = latest["value"]
-    date_latest = datetime.strptime(latest["date"], "%Y-%m-%d")
-    freshness_days = (datetime.utcnow() - date_latest.replace(tzinfo=None)).days
-
-    change7d = None
-    change1m = None
-    for i, o in enumerate(reversed(obs[:-1])):
-        d = datetime.strptime(o["date"], "%Y-%m-%d")
-        days_ago = (date_latest - d).days
-        if change7d is None and days_ago >= 5:
-            change7d = val - o["value"] if o["value"] else None
-        if change1m is None and days_ago >= 28:
-            change1m = val - o["value"] if o["value"] else None
-        if change7d is not None and change1m is not None:
-            break
+    days, vals = series_arrays(obs, "value")
+    val = obs[-1]["value"]
+    freshness_days = today_day() - int(days[-1])
+    prev7d, prev1m = lookback(days, vals, (5, 28))
+    change7d = val - prev7d if prev7d else None
+    change1m = val - prev1m if prev1m else None
 
     return {
         "value": val,
@@ -116,8 +109,7 @@ def get_core_cpi_yoy(api_key: str | None = None) -> dict[str, Any]:
     if not yoy_dates or all(v is None for v in yoy):
         return {"value": None, "change7d": None, "change1m": None, "freshness_days": 999}
     last_val = next(v for v in reversed(yoy) if v is not None)
-    last_dt = datetime.strptime(yoy_dates[-1], "%Y-%m-%d")
-    freshness_days = (datetime.utcnow() - last_dt.replace(tzinfo=None)).days
+    freshness_days = today_day() - yoy_dates[-1]
     change1m = None
     for i in range(len(yoy) - 2, -1, -1):
         if yoy[i] is not None and last_val is not None:
@@ -146,7 +138,7 @@ def _fetch_amtmno_csv_fallback() -> list[dict[str, Any]]:
             if val_s in (".", "", "None"):
                 continue
             try:
-                out.append({"date": date_s, "value": float(val_s)})
+                out.append({"date": parse_day(date_s), "value": float(val_s)})
             except (TypeError, ValueError):
                 continue
         return out
@@ -154,35 +146,6 @@ def _fetch_amtmno_csv_fallback() -> list[dict[str, Any]]:
         return []
 
 
-def _pmi_zscore_adaptive(orders_yoy: list[float | None], min_window: int = 36, max_window: int = 120) -> list[float | None]:
-    """zscore_window = min(120, len(valid)-1), max(36, zscore_window). pmi_like = 50+5*zscore, clamp [35,65]."""
-    import math
-    valid_count = sum(1 for x in orders_yoy if x is not None)
-    zscore_window = min(max_window, max(0, valid_count - 1))
-    zscore_window = max(min_window, zscore_window)
-    out = []
-    for i in range(len(orders_yoy)):
-        if i < zscore_window - 1:
-            out.append(None)
-            continue
-        w = [x for x in orders_yoy[max(0, i - zscore_window + 1) : i + 1] if x is not None]
-        if len(w) < min_window:
-            out.append(None)
-            continue
-        v = orders_yoy[i]
-        if v is None:
-            out.append(None)
-            continue
-        m = sum(w) / len(w)
-        var = sum((x - m) ** 2 for x in w) / len(w)
-        std = math.sqrt(var) if var > 0 else 1e-9
-        z = (v - m) / std if std else 0
-        pmi = 50 + 5 * z
-        pmi = max(35, min(65, pmi))
-        out.append(pmi)
-    return out
-
-
 def get_pmi_from_amtmno(api_key: str | None = None) -> dict[str, Any]:
     """PMI-like from AMTMNO: API first, then FRED CSV fallback. orders_yoy = (s/s.shift(12)-1)*100; adaptive zscore; clamp [35,65]. If still no data: value=50, freshness=999, reason PMI_FALLBACK."""
     obs = fetch_fred_series("AMTMNO", api_key=api_key)
@@ -201,13 +164,12 @@ def get_pmi_from_amtmno(api_key: str | None = None) -> dict[str, Any]:
     valid_count = sum(1 for x in orders_yoy if x is not None)
     if valid_count < 37:
         return {"value": 50.0, "change7d": None, "change1m": None, "freshness_days": 999, "reason": "PMI_FALLBACK"}
-    pmi_like = _pmi_zscore_adaptive(orders_yoy, min_window=36, max_window=120)
+    pmi_like = pmi_like_series(orders_yoy, min_window=36, max_window=120)
     dates = [o["date"] for o in obs[12:]]
     last_val = pmi_like[-1] if pmi_like and pmi_like[-1] is not None else None
     if last_val is None:
         return {"value": 50.0, "change7d": None, "change1m": None, "freshness_days": 999, "reason": "PMI_FALLBACK"}
-    last_dt = datetime.strptime(dates[-1], "%Y-%m-%d")
-    freshness_days = (datetime.utcnow() - last_dt.replace(tzinfo=None)).days
+    freshness_days = today_day() - dates[-1]
     change1m = None
     for i in range(len(pmi_like) - 2, -1, -1):
         if pmi_like[i] is not None:
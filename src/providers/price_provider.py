@@ -7,12 +7,16 @@ from __future__ import annotations
 import csv
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from urllib.request import Request, urlopen
 
 import requests
 
+from app.align import day_from_ms, parse_day, today_day
+from app.universe import load_universe
+
 from .yfinance_provider import fetch_ohlcv
 from .alphavantage_provider import fetch_alphavantage as _fetch_alphavantage
 from .alphavantage_provider import AV_SYMBOLS as AV_SYMBOLS_MAP
@@ -51,14 +55,14 @@ TD_SYMBOLS = {
     "GC=F": "XAU/USD", "SI=F": "XAG/USD", "HG=F": "CPER", "BTC-USD": "BTC/USD",
 }
 
-DASHBOARD_TICKERS = [
-    "BTC-USD", "SMH", "TSLA", "9988.HK", "0700.HK",
-    "GC=F", "SI=F", "HG=F",
-]
+_UNIVERSE = load_universe()
+# benchmarkId (ASSET_DEFS) -> ticker, fetched once even when several assets share a benchmark
+BENCHMARK_TICKERS: dict[str, str] = dict(_UNIVERSE.benchmarks)
 
+DASHBOARD_TICKERS = _UNIVERSE.asset_tickers
 
-def _date_str(d: datetime) -> str:
-    return d.strftime("%Y-%m-%d")
+# Worker threads for the per-ticker provider chain (network bound)
+FETCH_WORKERS = int(os.environ.get("PRICE_FETCH_WORKERS", "8"))
 
 
 def _fetch_binance_btc() -> list[dict[str, Any]]:
@@ -77,8 +81,7 @@ def _fetch_binance_btc() -> list[dict[str, Any]]:
     out = []
     for c in data:
         ts, o, h, l, close, v = c[0], float(c[1]), float(c[2]), float(c[3]), float(c[4]), float(c[5])
-        dt = datetime.utcfromtimestamp(ts / 1000)
-        out.append({"date": _date_str(dt), "open": o, "high": h, "low": l, "close": close, "volume": int(v)})
+        out.append({"date": day_from_ms(ts), "open": o, "high": h, "low": l, "close": close, "volume": int(v)})
     return sorted(out, key=lambda x: x["date"])
 
 
@@ -104,14 +107,11 @@ def _fetch_stooq(ticker: str, days: int = 400) -> list[dict[str, Any]]:
                 c = float(row.get("Close", 0) or row.get("close", 0))
             except (TypeError, ValueError):
                 continue
-            if len(date_val) == 10 and date_val[4] == "-":
-                date_str = date_val
-            else:
-                try:
-                    date_str = datetime.strptime(date_val[:10], "%Y-%m-%d").strftime("%Y-%m-%d")
-                except ValueError:
-                    continue
-            out.append({"date": date_str, "open": c, "high": c, "low": c, "close": c, "volume": 0})
+            try:
+                day = parse_day(date_val)
+            except ValueError:
+                continue
+            out.append({"date": day, "open": c, "high": c, "low": c, "close": c, "volume": 0})
         return sorted(out, key=lambda x: x["date"]) if out else []
     except Exception:
         return []
@@ -146,12 +146,12 @@ def _fetch_marketwatch_hk(ticker: str, days: int = 400) -> list[dict[str, Any]]:
                     except (TypeError, ValueError):
                         continue
                     try:
-                        date_str = datetime.strptime(date_val[:10], "%Y-%m-%d").strftime("%Y-%m-%d")
+                        day = parse_day(date_val)
                     except ValueError:
                         continue
-                    out.append({"date": date_str, "open": c, "high": c, "low": c, "close": c, "volume": 0})
+                    out.append({"date": day, "open": c, "high": c, "low": c, "close": c, "volume": 0})
                 if out:
-                    start_cut = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d")
+                    start_cut = today_day() - days
                     out = [x for x in out if x["date"] >= start_cut]
                     return sorted(out, key=lambda x: x["date"])
         return []
@@ -174,12 +174,12 @@ def _fetch_twelvedata(ticker: str, days: int = 400) -> list[dict[str, Any]]:
         vals = data.get("values") or []
         out = []
         for v in vals:
-            dt = (v.get("datetime") or "")[:10]
             try:
+                day = parse_day(v.get("datetime") or "")
                 c = float(v.get("close", 0))
             except (TypeError, ValueError):
                 continue
-            out.append({"date": dt, "open": c, "high": c, "low": c, "close": c, "volume": 0})
+            out.append({"date": day, "open": c, "high": c, "low": c, "close": c, "volume": 0})
         return sorted(out, key=lambda x: x["date"]) if out else []
     except Exception:
         return []
@@ -189,8 +189,8 @@ def _stooq_mapped(ticker: str) -> str:
     return STOOQ_SYMBOLS.get(ticker, ticker.lower().replace(".", "-") + ".us" if "." not in ticker else ticker.replace(".", "-") + ".hk")
 
 
-def _fetch_one_ticker(ticker: str, days: int) -> tuple[list[dict[str, Any]], str, str | None, int, str | None, str | None, bool, str | None]:
-    """Return (series, provider, last_date, row_count, error_reason, mapped_symbol, is_proxy, proxy_for)."""
+def _fetch_one_ticker(ticker: str, days: int) -> tuple[list[dict[str, Any]], str, int | None, int, str | None, str | None, bool, str | None]:
+    """Return (series, provider, last_date, row_count, error_reason, mapped_symbol, is_proxy, proxy_for); dates are epoch days."""
     # 1) yfinance (price_adjusted=True)
     try:
         ohlcv = fetch_ohlcv(tickers=[ticker], days=days)
@@ -282,19 +282,14 @@ def download_price_map(
     data_status: dict[str, dict[str, Any]] = {}
     asof_ts = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    for ticker in DASHBOARD_TICKERS:
-        out = _fetch_one_ticker(ticker, days=days)
+    with ThreadPoolExecutor(max_workers=max(1, min(FETCH_WORKERS, len(DASHBOARD_TICKERS)))) as pool:
+        fetched = list(pool.map(lambda t: _fetch_one_ticker(t, days=days), DASHBOARD_TICKERS))
+
+    for ticker, out in zip(DASHBOARD_TICKERS, fetched):
         series, provider, last_date, row_count, error_reason, mapped_symbol, is_proxy, proxy_for = out
         ohlcv[ticker] = series if series else []
 
-        if last_date:
-            try:
-                d = datetime.strptime(last_date, "%Y-%m-%d")
-                freshness_days = (datetime.utcnow() - d.replace(tzinfo=None)).days
-            except Exception:
-                freshness_days = 999
-        else:
-            freshness_days = 999
+        freshness_days = today_day() - last_date if last_date is not None else 999
 
         ok = bool(series and len(series) > 0 and (series[-1].get("close") or 0) != 0)
         note = "stale/fallback" if provider == "fallback" or not series else None
@@ -319,9 +314,10 @@ def download_price_map(
             "price_adjusted": provider == "yfinance",
         }
 
-    # DXY proxy and commodity fallbacks for weekly chain
-    for t in ["DX-Y.NYB", "GLD", "SLV", "CPER", "USO"]:
-        if t not in ohlcv:
-            ohlcv[t] = fetch_ohlcv(tickers=[t], days=days).get(t) or []
+    # DXY proxy, benchmarks and reference series (SPY: correlationSPX) and commodity fallbacks for weekly chain
+    extras = [t for t in dict.fromkeys(["DX-Y.NYB", *BENCHMARK_TICKERS.values(), *_UNIVERSE.references, *_UNIVERSE.chain.values(), "GLD", "SLV", "CPER", "USO"]) if t not in ohlcv]
+    extra_ohlcv = fetch_ohlcv(tickers=extras, days=days) if extras else {}
+    for t in extras:
+        ohlcv[t] = extra_ohlcv.get(t) or []
 
     return ohlcv, data_status
@@ -74,11 +74,39 @@ def daily_narrative(daily: dict, assets: list[dict], signals: list[dict]) -> str
     return f"象限 {regime}，RiskScore {risk}。驱动：{top}。动作：{action}。"
 
 
-def render_daily(daily: dict, macros: list[dict], macro_status: dict, assets: list[dict], signals: list[dict]) -> None:
+def render_regime_stats(stats: dict) -> None:
+    cur = stats.get("current") or {}
+    regimes = stats.get("regimes") or []
+    st.caption(
+        f"已持续 {cur.get('spellDays', '-')} 天，平均 {fmt_num(cur.get('expectedDays'), 0)} 天；"
+        f"统计区间 {stats.get('since', '-')} ~ {stats.get('asOf', '-')}"
+    )
+    import pandas as pd
+
+    matrix = pd.DataFrame(stats.get("transitionMatrix") or [], index=regimes, columns=regimes)
+    st.write("**Regime 日转移概率**（行=今日，列=次日）")
+    st.dataframe(matrix.style.format("{:.1%}", na_rep="-"), use_container_width=True)
+    fwd = (stats.get("forwardReturns") or {}).get("assets") or {}
+    horizons = (stats.get("forwardReturns") or {}).get("horizons") or []
+    if fwd and horizons:
+        h = str(horizons[0])
+        rows = []
+        for aid, by_h in fwd.items():
+            s = (by_h.get(h) or {}).get(cur.get("regime")) or {}
+            rows.append({"资产": aid, "样本": s.get("n"), f"{h}日均值%": s.get("mean"), "胜率%": s.get("hitRate"), "P10%": s.get("p10"), "P90%": s.get("p90")})
+        st.write(f"**当前 Regime {cur.get('regime', '-')} 下 {h} 日远期收益**")
+        st.dataframe(pd.DataFrame(rows), use_container_width=True)
+
+
+def render_daily(daily: dict, macros: list[dict], macro_status: dict, assets: list[dict], signals: list[dict], regime_stats: dict | None = None) -> None:
     st.header("今日总览")
     c1, c2, c3, c4 = st.columns(4)
     c1.metric("日期", daily.get("date", "-"))
     c2.metric("Regime", daily.get("regime", "-"))
+    cur = (regime_stats or {}).get("current") or {}
+    if cur:
+        stay = (cur.get("next") or {}).get(cur.get("regime"))
+        c2.caption(f"已持续 {cur.get('spellDays', '-')} 天 · 次日维持 {stay:.1%}" if stay is not None else f"已持续 {cur.get('spellDays', '-')} 天")
     c3.metric("RiskScore", daily.get("riskScore", "-"))
     c4.metric("组合动作", daily.get("portfolioAction", "-"))
 
@@ -88,6 +116,10 @@ def render_daily(daily: dict, macros: list[dict], macro_status: dict, assets: li
         st.info(daily.get("commentSummary"))
     st.caption(daily.get("dataAsOf", ""))
 
+    if regime_stats:
+        with st.expander("Regime 统计"):
+            render_regime_stats(regime_stats)
+
     st.subheader("宏观四开关")
     if macros:
         cols = st.columns(min(len(macros), 5))
@@ -282,7 +314,7 @@ def main() -> None:
 
     page = st.sidebar.radio("视图", ["今日总览", "资产详情", "Weekly 康波"])
     if page == "今日总览":
-        render_daily(daily, macros, macro_status, assets, signals)
+        render_daily(daily, macros, macro_status, assets, signals, data.get("regimeStats"))
     elif page == "资产详情":
         render_asset_detail(assets, signals, tech, price_history)
     else:
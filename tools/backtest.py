@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Replay the signal rules over history (app.compute.backtest) and write metrics + equity curves.
+Usage: python tools/backtest.py [--years 10] [--output data/backtest.json]
+Universe: dashboard_backend/app/universe.json (or UNIVERSE_PATH). Needs FRED_API_KEY for macro history.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "dashboard_backend"))
+
+from dotenv import load_dotenv
+load_dotenv(REPO_ROOT / ".env")
+load_dotenv(REPO_ROOT / ".env.local")
+
+from app.compute.backtest import run_backtest
+from app.io.write_json import write_json_atomic
+from app.providers.fred import get_macro_history, macro_history_pit
+from app.providers.price_chain import fetch_all_prices
+from app.universe import load_universe
+
+DEFAULT_OUTPUT = REPO_ROOT / "data" / "backtest.json"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Backtest dashboard signal rules")
+    ap.add_argument("--years", type=int, default=10, help="History length in years")
+    ap.add_argument("--point-in-time", action="store_true", help="Macro as known at the time (ALFRED vintages)")
+    ap.add_argument("--output", "-o", type=Path, default=DEFAULT_OUTPUT, help="Output JSON path")
+    ap.add_argument("--curve-step", type=int, default=5, help="Sample equity curves every N days")
+    args = ap.parse_args()
+
+    def log(msg: str) -> None:
+        print(msg, file=sys.stderr, flush=True)
+
+    universe = load_universe()
+    log(f"拉取 FRED 历史 ({args.years}y)...")
+    macro = macro_history_pit(args.years) if args.point_in_time else None
+    release_lag = macro is None
+    if args.point_in_time and macro is None:
+        log("ALFRED vintage 不可用 (FRED_API_KEY / FRED_VINTAGES)，改用最新 vintage + 发布滞后近似")
+    macro = macro or get_macro_history(args.years)
+    log(f"拉取行情历史 ({len(universe.assets)} assets)...")
+    ohlcv, _ = fetch_all_prices(days=args.years * 252 + 300, tickers=universe.asset_tickers)
+
+    t0 = time.perf_counter()
+    result = run_backtest(universe.assets, ohlcv, macro, release_lag=release_lag)
+    summary = result.summary(curve_step=args.curve_step)
+    log(f"回测完成: {summary['days']} 天, {time.perf_counter() - t0:.2f}s")
+
+    write_json_atomic(args.output.resolve(), summary, indent=2)
+    log(f"完成: {args.output.resolve()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Binance klines endpoint (GET /api/v3/klines), for testing the intraday BTC job offline.
+Candles are a deterministic random walk keyed by open time, so repeated / overlapping requests agree;
+the still-open candle drifts with the wall clock (its close / high / low / volume move until it closes).
+
+Usage: python tools/binance_standin.py [--port 8765]
+Then: BINANCE_BASE_URL=http://127.0.0.1:8765 BTC_INTRADAY=1 uvicorn app.main:app
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+INTERVAL_MS = {
+    "1m": 60_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "4h": 14_400_000, "1d": 86_400_000,
+}
+MAX_LIMIT = 1000
+BASE_PRICE = 60_000.0
+
+
+def _noise(k: int, salt: int = 0) -> float:
+    """Deterministic value in [-1, 1) for integer k."""
+    x = (k * 2654435761 + salt * 40503) & 0xFFFFFFFF
+    x ^= x >> 13
+    x = (x * 1274126177) & 0xFFFFFFFF
+    x ^= x >> 16
+    return x / 2**31 - 1.0
+
+
+def _price(minute: int) -> float:
+    """Minute-level path: slow cycle plus hashed wiggle (no state, so any minute is computable directly)."""
+    return BASE_PRICE * math.exp(0.15 * math.sin(minute / 40_000) + 0.02 * math.sin(minute / 1_500) + 0.002 * _noise(minute))
+
+
+def kline(open_ms: int, step: int, now_ms: int) -> list:
+    """One kline in Binance's layout; minutes after now_ms are not yet traded."""
+    first = open_ms // 60_000
+    last = min(open_ms + step, now_ms + 1) // 60_000
+    last = max(last, first + 1)
+    stride = max((last - first) // 60, 1)  # sample at most ~60 points per candle
+    px = [_price(m) for m in range(first, last, stride)] + [_price(last - 1)]
+    vol = sum(abs(_noise(m, 1)) for m in range(first, last, stride)) * 10 * stride
+    close_ms = open_ms + step - 1
+    return [
+        open_ms, f"{px[0]:.2f}", f"{max(px):.2f}", f"{min(px):.2f}", f"{px[-1]:.2f}", f"{vol:.5f}",
+        close_ms, f"{vol * px[-1]:.2f}", int(vol * 7), "0", "0", "0",
+    ]
+
+
+def klines(interval: str, start_ms: int | None, end_ms: int | None, limit: int, now_ms: int) -> list[list]:
+    step = INTERVAL_MS[interval]
+    cur = now_ms // step * step
+    end = cur if end_ms is None else min(cur, end_ms // step * step)
+    if start_ms is None:
+        first = end - (limit - 1) * step
+    else:
+        first = -(-start_ms // step) * step  # first candle opening at or after startTime
+    opens = range(first, end + 1, step)[:limit]
+    return [kline(o, step, now_ms) for o in opens]
+
+
+class Handler(BaseHTTPRequestHandler):
+    def _send(self, code: int, body: object) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:  # noqa: N802
+        url = urlparse(self.path)
+        if url.path != "/api/v3/klines":
+            return self._send(404, {"code": -1, "msg": "not found"})
+        q = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        interval = q.get("interval", "")
+        if not q.get("symbol") or interval not in INTERVAL_MS:
+            return self._send(400, {"code": -1120, "msg": "Invalid interval."})
+        try:
+            limit = min(max(int(q.get("limit", 500)), 1), MAX_LIMIT)
+            start = int(q["startTime"]) if "startTime" in q else None
+            end = int(q["endTime"]) if "endTime" in q else None
+        except ValueError:
+            return self._send(400, {"code": -1100, "msg": "Illegal characters found in parameter."})
+        self._send(200, klines(interval, start, end, limit, int(time.time() * 1000)))
+
+    def log_message(self, fmt: str, *args: object) -> None:
+        pass
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Binance klines stand-in")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    args = ap.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"Serving /api/v3/klines on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
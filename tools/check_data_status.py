@@ -47,7 +47,7 @@ def main() -> int:
         err = st.get("error_reason")
         note = st.get("note")
         price = (assets.get(ticker) or {}).get("price")
-        if not ok or price is None:
+        if not ok or (ticker in assets and price is None):
             missing.append(("行情", ticker, provider, row_count, err or note or "无数据"))
         else:
             ok_list.append(("行情", ticker, provider, row_count))
@@ -31,9 +31,15 @@ from src.providers.fred_provider import (
 )
 from src.providers.yfinance_provider import fetch_ohlcv
 from src.providers.pmi_provider import get_pmi
-from src.providers.price_provider import download_price_map
+from src.providers.price_provider import BENCHMARK_TICKERS, download_price_map
 from src.export_json import build_payload, ASSET_DEFS
 from src import features
+from app.align import lookback, series_arrays
+from app.compute.correlation import asset_correlations
+from app.compute.kondratieff import weekly_chain
+from app.compute.relstrength import relative_strength
+from app.compute.resample import BAR_CACHE
+from app.universe import load_universe
 
 
 DEFAULT_OUTPUT = REPO_ROOT / "dashboard_frontend" / "app" / "public" / "data" / "dashboard.json"
@@ -84,20 +90,14 @@ def main() -> int:
 
     # DXY fallback from yfinance if FRED had no value
     if dxy.get("price") is None:
-        dxy_series = ohlcv.get("DX-Y.NYB") or []
-        if dxy_series:
-            dxy_series = sorted(dxy_series, key=lambda x: x["date"])
-            dxy["price"] = dxy_series[-1]["close"]
-            for r in reversed(dxy_series[:-1]):
-                days_ago = __date_diff(dxy_series[-1]["date"], r["date"])
-                pct = (dxy["price"] - r["close"]) / r["close"] * 100 if r["close"] else None
-                if pct is not None:
-                    if dxy.get("change7d") is None and days_ago >= 5:
-                        dxy["change7d"] = pct
-                    if dxy.get("change30d") is None and days_ago >= 25:
-                        dxy["change30d"] = pct
-                if dxy.get("change7d") is not None and dxy.get("change30d") is not None:
-                    break
+        dxy_days, dxy_closes = series_arrays(ohlcv.get("DX-Y.NYB") or [], "close")
+        if len(dxy_days):
+            dxy["price"] = float(dxy_closes[-1])
+            prev7d, prev30d = lookback(dxy_days, dxy_closes, (5, 25))
+            if dxy.get("change7d") is None and prev7d:
+                dxy["change7d"] = (dxy["price"] - prev7d) / prev7d * 100
+            if dxy.get("change30d") is None and prev30d:
+                dxy["change30d"] = (dxy["price"] - prev30d) / prev30d * 100
         dxy.setdefault("freshness_days", 1 if dxy.get("price") else 999)
 
     # 2) PMI: FRED AMTMNO → PMI-like (API then CSV fallback); adaptive window; fallback 50 + PMI_FALLBACK
@@ -122,8 +122,29 @@ def main() -> int:
         tech["assetId"] = aid
         tech_by_id[aid] = tech
 
-    # 4) Weekly Kondratieff: COPPER=CPER, OIL=USO
-    weekly_components = __compute_weekly_chain(ohlcv)
+    # 3b) Rolling correlations vs DXY / real rate / SPX (DXY: FRED, else DX-Y.NYB)
+    dxy_obs = dxy.get("observations") or ohlcv.get("DX-Y.NYB") or []
+    corr_by_id = asset_correlations(
+        {d["id"]: ohlcv.get(d["ticker"]) or [] for d in ASSET_DEFS},
+        {"DXY": dxy_obs, "REAL10Y": real10y.get("observations") or [], "SPX": ohlcv.get("SPY") or []},
+    )
+    for aid, corr in corr_by_id.items():
+        if aid in tech_by_id:
+            tech_by_id[aid].update(corr)
+
+    # 3c) Relative strength vs benchmarkId (each benchmark fetched/aligned once)
+    rs_by_id = relative_strength(
+        {d["id"]: ohlcv.get(d["ticker"]) or [] for d in ASSET_DEFS},
+        {d["id"]: d["benchmarkId"] for d in ASSET_DEFS if d.get("benchmarkId")},
+        {bid: ohlcv.get(t) or [] for bid, t in BENCHMARK_TICKERS.items()},
+    )
+    for aid, rs in rs_by_id.items():
+        if aid in tech_by_id:
+            tech_by_id[aid].update(rs)
+
+    # 4) Weekly Kondratieff: chain ratios / momentum from weekly bars (copper falls back to CPER)
+    BAR_CACHE.update_all(ohlcv)
+    weekly_components = {k: v for k, v in weekly_chain(load_universe().chain)["components"].items() if v is not None}
 
     # 5) Build payload (dataStatus + no 0 for missing price)
     log("生成 dashboard 数据...")
@@ -152,31 +173,6 @@ def main() -> int:
     return 0
 
 
-def __date_diff(end: str, start: str) -> int:
-    from datetime import datetime
-    e = datetime.strptime(end, "%Y-%m-%d")
-    s = datetime.strptime(start, "%Y-%m-%d")
-    return (e - s).days
-
-
-def __compute_weekly_chain(ohlcv: dict) -> dict:
-    """WEEKLY_TICKERS: COPPER=CPER, OIL=USO. Returns components.copperMomentum, energyPrice."""
-    copper_series = ohlcv.get("CPER") or ohlcv.get("HG=F") or []
-    oil_series = ohlcv.get("USO") or []
-    copper_series = sorted(copper_series, key=lambda x: x["date"]) if copper_series else []
-    oil_series = sorted(oil_series, key=lambda x: x["date"]) if oil_series else []
-    copper_momentum = 0.0
-    energy_price = 0.0
-    if len(copper_series) >= 25:
-        cur = copper_series[-1]["close"]
-        prev = copper_series[-25]["close"]
-        if prev and prev != 0:
-            copper_momentum = round((cur / prev - 1) * 100, 4)
-    if oil_series:
-        energy_price = round(oil_series[-1]["close"], 2)
-    return {"copperMomentum": copper_momentum, "energyPrice": energy_price}
-
-
 if __name__ == "__main__":
     try:
         sys.exit(main())
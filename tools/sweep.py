@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Sweep rule thresholds (app.compute.params.RuleParams) through the backtest and write a ranked report.
+Usage:
+  python tools/sweep.py [--years 10] [--samples 200 | --grid] [--space space.json] [--rank-by sharpe]
+space.json: {"field": [values...]} for grid/sample choices, or {"field": [lo, hi], ...} with --ranges
+for uniform sampling. Default space: app.compute.sweep.DEFAULT_SPACE.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "dashboard_backend"))
+
+from dotenv import load_dotenv
+load_dotenv(REPO_ROOT / ".env")
+load_dotenv(REPO_ROOT / ".env.local")
+
+from app.compute.backtest import prepare_backtest
+from app.compute.sweep import DEFAULT_SPACE, RANK_KEYS, param_grid, param_samples, run_sweep
+from app.io.write_json import write_json_atomic
+from app.providers.fred import get_macro_history, macro_history_pit
+from app.providers.price_chain import fetch_all_prices
+from app.universe import load_universe
+
+DEFAULT_OUTPUT = REPO_ROOT / "data" / "sweep.json"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Parameter sweep over rule thresholds")
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--point-in-time", action="store_true", help="Macro as known at the time (ALFRED vintages)")
+    ap.add_argument("--space", type=Path, help="JSON search space (default: DEFAULT_SPACE)")
+    ap.add_argument("--ranges", action="store_true", help="Treat [lo, hi] lists in --space as uniform ranges")
+    ap.add_argument("--grid", action="store_true", help="Full grid instead of random samples")
+    ap.add_argument("--samples", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default FEATURE_WORKERS)")
+    ap.add_argument("--rank-by", choices=RANK_KEYS, default="sharpe")
+    ap.add_argument("--top", type=int, default=50)
+    ap.add_argument("--output", "-o", type=Path, default=DEFAULT_OUTPUT)
+    args = ap.parse_args()
+
+    def log(msg: str) -> None:
+        print(msg, file=sys.stderr, flush=True)
+
+    space = json.loads(args.space.read_text(encoding="utf-8")) if args.space else DEFAULT_SPACE
+    if args.ranges:
+        space = {k: tuple(v) for k, v in space.items()}
+    params = param_grid(space) if args.grid else param_samples(space, args.samples, args.seed)
+
+    universe = load_universe()
+    log(f"拉取历史数据 ({args.years}y, {len(universe.assets)} assets)...")
+    macro = macro_history_pit(args.years) if args.point_in_time else None
+    release_lag = macro is None
+    if args.point_in_time and macro is None:
+        log("ALFRED vintage 不可用 (FRED_API_KEY / FRED_VINTAGES)，改用最新 vintage + 发布滞后近似")
+    macro = macro or get_macro_history(args.years)
+    ohlcv, _ = fetch_all_prices(days=args.years * 252 + 300, tickers=universe.asset_tickers)
+    data = prepare_backtest(universe.assets, ohlcv, macro, release_lag=release_lag)
+
+    t0 = time.perf_counter()
+    report = run_sweep(data, params, workers=args.workers, rank_by=args.rank_by, top=args.top)
+    log(f"评估 {report['evaluated']} 组参数, {time.perf_counter() - t0:.1f}s")
+
+    write_json_atomic(args.output.resolve(), report, indent=2)
+    log(f"完成: {args.output.resolve()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
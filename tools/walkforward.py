@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Walk-forward over rule thresholds: choose RuleParams on a rolling training window, apply to the next month.
+Usage:
+  python tools/walkforward.py [--years 10] [--train-months 36] [--test-months 1] [--samples 200 | --grid]
+Candidates come from the same search space as tools/sweep.py (--space / --ranges).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "dashboard_backend"))
+
+from dotenv import load_dotenv
+load_dotenv(REPO_ROOT / ".env")
+load_dotenv(REPO_ROOT / ".env.local")
+
+from app.compute.backtest import prepare_backtest
+from app.compute.sweep import DEFAULT_SPACE, param_grid, param_samples
+from app.compute.walkforward import OBJECTIVES, TEST_MONTHS, TRAIN_MONTHS, walk_forward
+from app.io.write_json import write_json_atomic
+from app.providers.fred import get_macro_history, macro_history_pit
+from app.providers.price_chain import fetch_all_prices
+from app.universe import load_universe
+
+DEFAULT_OUTPUT = REPO_ROOT / "data" / "walkforward.json"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Walk-forward parameter selection")
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--point-in-time", action="store_true", help="Macro as known at the time (ALFRED vintages)")
+    ap.add_argument("--train-months", type=int, default=TRAIN_MONTHS)
+    ap.add_argument("--test-months", type=int, default=TEST_MONTHS)
+    ap.add_argument("--objective", choices=OBJECTIVES, default="sharpe")
+    ap.add_argument("--space", type=Path, help="JSON search space (default: DEFAULT_SPACE)")
+    ap.add_argument("--ranges", action="store_true", help="Treat [lo, hi] lists in --space as uniform ranges")
+    ap.add_argument("--grid", action="store_true", help="Full grid instead of random samples")
+    ap.add_argument("--samples", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default FEATURE_WORKERS)")
+    ap.add_argument("--output", "-o", type=Path, default=DEFAULT_OUTPUT)
+    args = ap.parse_args()
+
+    def log(msg: str) -> None:
+        print(msg, file=sys.stderr, flush=True)
+
+    space = json.loads(args.space.read_text(encoding="utf-8")) if args.space else DEFAULT_SPACE
+    if args.ranges:
+        space = {k: tuple(v) for k, v in space.items()}
+    params = param_grid(space) if args.grid else param_samples(space, args.samples, args.seed)
+
+    universe = load_universe()
+    log(f"拉取历史数据 ({args.years}y, {len(universe.assets)} assets)...")
+    macro = macro_history_pit(args.years) if args.point_in_time else None
+    release_lag = macro is None
+    if args.point_in_time and macro is None:
+        log("ALFRED vintage 不可用 (FRED_API_KEY / FRED_VINTAGES)，改用最新 vintage + 发布滞后近似")
+    macro = macro or get_macro_history(args.years)
+    ohlcv, _ = fetch_all_prices(days=args.years * 252 + 300, tickers=universe.asset_tickers)
+    data = prepare_backtest(universe.assets, ohlcv, macro, release_lag=release_lag)
+
+    t0 = time.perf_counter()
+    report = walk_forward(
+        data, params, train_months=args.train_months, test_months=args.test_months,
+        objective=args.objective, workers=args.workers,
+    )
+    log(f"{report['candidates']} 组参数, {len(report['folds'])} 个窗口, {time.perf_counter() - t0:.1f}s")
+
+    write_json_atomic(args.output.resolve(), report, indent=2)
+    log(f"完成: {args.output.resolve()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())